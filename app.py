@@ -7,14 +7,32 @@ import os
 # =========================================================
 # Quantum modules (keep as we built)
 # =========================================================
-from quantum.data_loader import load_road_data
+from quantum.data_loader import load_road_data, road_data_version
 from quantum.feature_engineering import engineer_context_features
-from quantum.impact_scoring import compute_impact_scores
-from quantum.qubo import build_qubo
-from quantum.qaoa_solver import build_qaoa_circuit, run_qaoa_and_extract_solution
+from quantum.impact_scoring import ImpactScorer
+from quantum.road_set import RoadSet
+from quantum.qubo import build_qubo, KnapsackQubo
+from quantum.solvers import MAX_EXACT_ROADS, SOLVERS, race_solvers, optimality_gap
+from quantum.decomposition import solve_decomposed
+from quantum.qaoa_solver import sweep_qaoa_parameters, qaoa_grid
 from quantum.plan_builder import generate_recovery_plan
 from visualization.map_view import visualize_gaza_dashboard
 
+# =========================================================
+# Planning modules (zone model + Top-K planner)
+# =========================================================
+from planning.zone_model import load_zone_data, build_city_model
+from planning.planner import DEF_COL, compute_metrics, plan_variant_weights
+from planning.exact_planner import PLAN_ENGINES
+from planning.variants import named_variants, parse_variants, sample_variants, evaluate_variants, variants_table
+from planning.pareto import PARETO_OBJECTIVES, explore_pareto_front, pareto_front
+from planning.uncertainty import DEFAULT_UNCERTAINTY, uncertainty_context, simulate_scenarios, summarize_scenarios
+
+# =========================================================
+# Instrumentation (per-stage timing / memory spans)
+# =========================================================
+from instrumentation.spans import RunProfile
+
 
 # =========================================================
 # Streamlit compatibility helpers (fix use_container_width error)
@@ -32,6 +50,18 @@ def show_image_if_exists(path, caption=None):
         st_image_compat(path, caption=caption)
 
 
+def show_timing_breakdown(timings, profile_stats=""):
+    """Per-stage wall time (and traced peak memory) of the last run (RunProfile.to_frame)."""
+    with st.expander("⏱️ Timing breakdown", expanded=False):
+        if timings.empty:
+            st.info("No stages recorded.")
+            return
+        st.dataframe(timings, use_container_width=True)
+        st.bar_chart(timings.set_index("stage")["wall_s"])
+        if profile_stats:
+            st.code(profile_stats, language="text")
+
+
 # =========================================================
 # Page + Theme (KEEP OLD UI STYLE)
 # =========================================================
@@ -41,6 +71,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Optional columnar road inventory (Parquet / Arrow / .npy directory)
+ROAD_DATA_PATH = os.environ.get("PHOENIX_ROAD_DATA") or None
+
 # Top hero image (keep)
 show_image_if_exists("assets/hero_gaza.png")
 
@@ -126,54 +159,14 @@ st.divider()
 # ------------------- (OLD PART) CITY / ZONES MODEL -------------------
 # =========================================================
 
-# Gaza Zones (approx realistic)
-zones_data = [
-    ["Gaza City",      650000, 85, 5, 0.55],
-    ["North Gaza",     350000, 80, 4, 0.60],
-    ["Jabalia Camp",   120000, 90, 2, 0.70],
-    ["Deir al-Balah",  300000, 70, 3, 0.45],
-    ["Nuseirat Camp",   90000, 88, 2, 0.65],
-    ["Khan Younis",    430000, 75, 4, 0.50],
-    ["Rafah",          280000, 65, 3, 0.40],
-    ["Bureij Camp",     75000, 85, 2, 0.60],
-]
-df_city = pd.DataFrame(zones_data, columns=["Zone", "Population", "DamagePct", "ServiceAvail", "DisplacedRatio"])
-
-# Planning Assumptions (per-capita targets)
-TARGETS = {
-    "HospitalsPer100k": 1.0,
-    "SchoolsPer50k": 4.0,
-    "HousingUnitsPerPerson": 1/5
-}
-
-BASE_COUNTS = {
-    "Gaza City":     {"Hospitals": 6, "Schools": 55, "HousingUnits": 110000, "RoadIndex": 0.55},
-    "North Gaza":    {"Hospitals": 3, "Schools": 28, "HousingUnits": 55000,  "RoadIndex": 0.50},
-    "Jabalia Camp":  {"Hospitals": 1, "Schools": 12, "HousingUnits": 18000,  "RoadIndex": 0.40},
-    "Deir al-Balah": {"Hospitals": 2, "Schools": 24, "HousingUnits": 52000,  "RoadIndex": 0.52},
-    "Nuseirat Camp": {"Hospitals": 1, "Schools": 10, "HousingUnits": 15000,  "RoadIndex": 0.42},
-    "Khan Younis":   {"Hospitals": 4, "Schools": 36, "HousingUnits": 72000,  "RoadIndex": 0.54},
-    "Rafah":         {"Hospitals": 2, "Schools": 22, "HousingUnits": 47000,  "RoadIndex": 0.50},
-    "Bureij Camp":   {"Hospitals": 1, "Schools": 8,  "HousingUnits": 12000,  "RoadIndex": 0.40},
-}
-
-df_city["Hospitals_Base"] = df_city["Zone"].map(lambda z: BASE_COUNTS[z]["Hospitals"])
-df_city["Schools_Base"] = df_city["Zone"].map(lambda z: BASE_COUNTS[z]["Schools"])
-df_city["HousingUnits_Base"] = df_city["Zone"].map(lambda z: BASE_COUNTS[z]["HousingUnits"])
-df_city["RoadIndex_Base"] = df_city["Zone"].map(lambda z: BASE_COUNTS[z]["RoadIndex"])
-
-df_city["Hospitals_Target"] = np.ceil((df_city["Population"]/100000) * TARGETS["HospitalsPer100k"]).astype(int)
-df_city["Schools_Target"] = np.ceil((df_city["Population"]/50000) * TARGETS["SchoolsPer50k"]).astype(int)
-df_city["HousingUnits_Target"] = np.ceil(df_city["Population"] * TARGETS["HousingUnitsPerPerson"]).astype(int)
+# The zone model does not depend on any sidebar control, so it is built
+# once and shared across reruns and sessions
+@st.cache_data(show_spinner=False)
+def load_city_model():
+    return build_city_model(load_zone_data())
 
-df_city["Hospitals_Shortage_Pre"] = (df_city["Hospitals_Target"] - df_city["Hospitals_Base"]).clip(lower=0)
-df_city["Schools_Shortage_Pre"] = (df_city["Schools_Target"] - df_city["Schools_Base"]).clip(lower=0)
-df_city["Housing_Shortage_Pre"] = (df_city["HousingUnits_Target"] - df_city["HousingUnits_Base"]).clip(lower=0)
 
-damage_factor = (df_city["DamagePct"]/100.0)
-df_city["Hospitals_Shortage"] = (df_city["Hospitals_Shortage_Pre"] + np.ceil(df_city["Hospitals_Base"] * damage_factor * 0.6)).astype(int)
-df_city["Schools_Shortage"]   = (df_city["Schools_Shortage_Pre"]   + np.ceil(df_city["Schools_Base"]   * damage_factor * 0.5)).astype(int)
-df_city["Housing_Shortage"]   = (df_city["Housing_Shortage_Pre"]   + np.ceil(df_city["HousingUnits_Base"] * damage_factor * 0.35)).astype(int)
+df_city = load_city_model()
 
 # Sidebar Controls (KEEP + add Quantum knobs without breaking old)
 with st.sidebar:
@@ -184,6 +177,29 @@ with st.sidebar:
 
     st.subheader("Top-K Plans")
     k_plans = st.slider("How many plans to generate?", 2, 3, 3, 1)
+    n_sampled = st.slider("Extra random strategies (Dirichlet weights)", 0, 200, 0, 10)
+    variant_seed = st.number_input("Strategy sampling seed", 0, 10_000, 0, 1)
+    custom_weights = st.text_area(
+        "Custom strategies (impact, speed, fair per line)",
+        value="",
+        placeholder="0.6, 0.1, 0.3"
+    )
+    plan_engine = st.selectbox(
+        "Planning Engine",
+        PLAN_ENGINES,
+        format_func=lambda e: {"greedy": "Greedy (fast)", "exact": "Exact (MILP, reports greedy gap)"}[e]
+    )
+    pareto_evals = st.slider("Pareto explorer budget (plan runs)", 15, 300, 120, 15)
+
+    st.subheader("Uncertainty (Monte Carlo)")
+    mc_scenarios = st.slider("Scenarios", 100, 10_000, 1000, 100)
+    mc_scale = st.slider("Input uncertainty (× default σ)", 0.0, 3.0, 1.0, 0.25)
+    mc_plan = st.selectbox(
+        "Strategy to stress-test",
+        ["Plan A — Max Impact", "Plan B — Balanced", "Plan C — Fairness First"],
+        index=1
+    )
+    mc_roads = st.checkbox("Include road selection (QUBO per scenario)", value=True)
 
     st.subheader("Include Project Types")
     project_types = st.multiselect(
@@ -214,6 +230,17 @@ with st.sidebar:
 )
     q_gamma = st.slider("QAOA γ", 0.0, 3.0, 0.8, 0.05)
     q_beta = st.slider("QAOA β", 0.0, 3.0, 0.7, 0.05)
+    q_depth = st.slider("QAOA Depth (p layers)", 1, 5, 1, 1)
+    q_autotune = st.checkbox("Auto-tune γ/β (exact statevector)", value=False)
+    q_solvers = st.multiselect(
+        "Road Solver Backends (best energy wins)",
+        list(SOLVERS),
+        default=["qaoa"]
+    )
+    q_gap = st.checkbox("Report optimality gap vs exact", value=True)
+    q_decompose = st.checkbox("Decompose by zone (city-scale inventories)", value=False)
+    q_part_size = st.slider("Max roads per sub-problem", 4, 30, 20, 1)
+    q_sweep_res = st.slider("γ/β Sweep Grid (points per axis)", 3, 15, 7, 1)
 
     st.subheader("Road Impact Weights")
     q_weights = {
@@ -226,257 +253,172 @@ with st.sidebar:
     st.subheader("Run")
     run = st.button("🚀 Generate AI Insights + Top-K Plans")
     run_quantum = st.button("⚛️ Run Quantum Roads (QAOA)")
+    run_sweep = st.button("🗺️ Sweep QAOA γ/β Landscape")
+    run_pareto = st.button("🧭 Explore Pareto Front (strategy weights)")
+    run_mc = st.button("🎲 Run Monte Carlo Uncertainty")
 
-# =========================
-# AI-like scoring (Explainable) + deficits per project (KEEP)
-# =========================
-df_city["PopW"] = df_city["Population"] / df_city["Population"].max()
-df_city["DamageW"] = df_city["DamagePct"] / 100.0
-df_city["ServiceGap"] = 1.0 - (df_city["ServiceAvail"] / 5.0)
-
-df_city["NeedScore"] = (0.40*df_city["DamageW"] + 0.28*df_city["PopW"] + 0.12*df_city["ServiceGap"] + 0.20*df_city["DisplacedRatio"]).clip(0,1)
-
-def norm_series(s):
-    mx = max(1.0, float(s.max()))
-    return (s / mx).clip(0,1)
-
-df_city["HospShortW"] = norm_series(df_city["Hospitals_Shortage"])
-df_city["SchoolShortW"] = norm_series(df_city["Schools_Shortage"])
-df_city["HouseShortW"] = norm_series(df_city["Housing_Shortage"])
-
-df_city["HousingDef"]  = (0.35*df_city["DamageW"] + 0.30*df_city["DisplacedRatio"] + 0.20*df_city["PopW"] + 0.15*df_city["HouseShortW"]).clip(0,1)
-df_city["HospitalDef"] = (0.40*df_city["DamageW"] + 0.25*df_city["ServiceGap"] + 0.15*df_city["PopW"] + 0.20*df_city["HospShortW"]).clip(0,1)
-df_city["SchoolDef"]   = (0.25*df_city["DamageW"] + 0.25*df_city["PopW"] + 0.25*df_city["DisplacedRatio"] + 0.25*df_city["SchoolShortW"]).clip(0,1)
-df_city["InfraDef"]    = (0.55*df_city["DamageW"] + 0.45*df_city["ServiceGap"]).clip(0,1)
-df_city["RoadDef"]     = (0.55*df_city["DamageW"] + 0.35*df_city["ServiceGap"] + 0.10*(1-df_city["RoadIndex_Base"])).clip(0,1)
-df_city["WaterSanDef"] = (0.55*df_city["DamageW"] + 0.45*df_city["ServiceGap"]).clip(0,1)
-df_city["PowerDef"]    = (0.65*df_city["DamageW"] + 0.35*df_city["ServiceGap"]).clip(0,1)
-df_city["PublicDef"]   = (0.20*df_city["DamageW"] + 0.40*df_city["PopW"] + 0.40*df_city["DisplacedRatio"]).clip(0,1)
-
-DEF_COL = {
-    "Housing": "HousingDef",
-    "Hospitals": "HospitalDef",
-    "Schools": "SchoolDef",
-    "Infrastructure": "InfraDef",
-    "Roads": "RoadDef",
-    "Water & Sanitation": "WaterSanDef",
-    "Power Grid": "PowerDef",
-    "Public Spaces": "PublicDef",
-}
-
-PROJECT_META = {
-    "Housing": {"unit_cost": 18, "unit_time": 10},
-    "Hospitals": {"unit_cost": 40, "unit_time": 16},
-    "Schools": {"unit_cost": 22, "unit_time": 12},
-    "Infrastructure": {"unit_cost": 30, "unit_time": 14},
-    "Roads": {"unit_cost": 16, "unit_time": 10},
-    "Water & Sanitation": {"unit_cost": 22, "unit_time": 12},
-    "Power Grid": {"unit_cost": 32, "unit_time": 14},
-    "Public Spaces": {"unit_cost": 10, "unit_time": 8},
-}
-
-# =========================
-# Quantum-inspired planner (Top-K variants) (KEEP)
-# =========================
-def plan_variant_weights(name: str):
-    if name == "Plan A — Max Impact":
-        return {"w_impact": 0.70, "w_speed": 0.15, "w_fair": 0.15}
-    if name == "Plan C — Fairness First":
-        return {"w_impact": 0.45, "w_speed": 0.10, "w_fair": 0.45}
-    return {"w_impact": 0.55, "w_speed": 0.15, "w_fair": 0.30}
-
-def generate_plan(df_in: pd.DataFrame, types: list, total_budget_m: int, horizon_m: int, weights: dict):
-    dfp = df_in.copy()
-    wI, wS, wF = weights["w_impact"], weights["w_speed"], weights["w_fair"]
-
-    PHASE_ALLOWED = {
-        0: {"Housing", "Hospitals", "Water & Sanitation"},
-        1: {"Housing", "Hospitals", "Schools", "Roads", "Infrastructure", "Water & Sanitation"},
-        2: {"Schools", "Roads", "Infrastructure", "Power Grid", "Public Spaces", "Water & Sanitation"}
-    }
+    st.subheader("Diagnostics")
+    capture_profile = st.checkbox("Capture cProfile for runs", value=False)
+    trace_memory = st.checkbox("Trace peak memory per stage (slows runs)", value=False)
 
-    phase_split = [0.45, 0.35, 0.20]
-    phase_names = ["Phase 1 — Emergency Recovery", "Phase 2 — Core Services", "Phase 3 — Long-Term Urban Recovery"]
-
-    MIN_ZONE_COVERAGE_RATIO = [0.65, 0.85, 1.00]
-    MAX_ACTIONS_PER_ZONE_PER_PHASE = [2, 2, 2]
-    MAX_REPEAT_SAME_TYPE_IN_ZONE_TOTAL = 1
-    ZONE_REPEAT_PENALTY = 0.22
-    DIMINISHING_RETURNS = 0.35
-
-    zone_total_count = {z: 0 for z in dfp["Zone"].tolist()}
-    zone_phase_count = {z: 0 for z in dfp["Zone"].tolist()}
-    zone_type_used_total = set()
-
-    candidates = []
-    for _, row in dfp.iterrows():
-        zone = row["Zone"]
-        need = float(row["NeedScore"])
-        popw = float(row["PopW"])
-
-        for t in types:
-            if t not in DEF_COL:
-                continue
-            deficit = float(row[DEF_COL[t]])
-
-            meta = PROJECT_META[t]
-            cost, ttime = meta["unit_cost"], meta["unit_time"]
-
-            impact = need * deficit * (0.55 + 0.45 * popw)
-            speed = 1.0 / max(1.0, ttime)
-            base_score = (wI * impact) + (wS * speed)
-
-            candidates.append([base_score, impact, speed, zone, t, cost, ttime, deficit, need])
-
-    candidates.sort(key=lambda x: x[0], reverse=True)
-
-    phases = []
-    for p_idx, p_ratio in enumerate(phase_split):
-        allowed_types = PHASE_ALLOWED[p_idx].intersection(set(types))
-        phase_budget = int(total_budget_m * p_ratio)
-        phase_time = int(horizon_m * p_ratio)
-        local_budget = phase_budget
-
-        for z in zone_phase_count:
-            zone_phase_count[z] = 0
-
-        picks = []
-        covered = set()
-        target_cover = int(np.ceil(len(dfp) * MIN_ZONE_COVERAGE_RATIO[p_idx]))
-
-        def try_pick(pass_mode="coverage"):
-            nonlocal local_budget, picks, covered
-
-            for base_score, impact, speed, zone, t, cost, ttime, deficit, need in candidates:
-                if local_budget <= 0:
-                    break
-                if t not in allowed_types:
-                    continue
-                if cost > local_budget:
-                    continue
-                if ttime > phase_time + 8:
-                    continue
-
-                if (zone, t) in zone_type_used_total and MAX_REPEAT_SAME_TYPE_IN_ZONE_TOTAL <= 1:
-                    continue
-
-                if zone_phase_count[zone] >= MAX_ACTIONS_PER_ZONE_PER_PHASE[p_idx]:
-                    continue
-
-                if pass_mode == "coverage" and zone in covered:
-                    continue
-
-                if p_idx == 0 and deficit < 0.35:
-                    continue
-
-                fairness_boost = wF * (1.0 / (1 + zone_total_count[zone]))
-                repeat_penalty = ZONE_REPEAT_PENALTY * zone_total_count[zone]
-                dim_penalty = DIMINISHING_RETURNS * max(0, zone_total_count[zone] - 1)
-
-                final_score = base_score + fairness_boost - repeat_penalty - dim_penalty
-
-                picks.append({
-                    "Plan": "",
-                    "Phase": phase_names[p_idx],
-                    "Zone": zone,
-                    "ProjectType": t,
-                    "EstCost_M$": cost,
-                    "EstTime_wks": ttime,
-                    "NeedScore": round(need, 3),
-                    "Deficit": round(deficit, 3),
-                    "ImpactScore": round(impact, 4),
-                    "SpeedScore": round(speed, 4),
-                    "FairnessBoost": round(fairness_boost, 4),
-                    "ZonePenalty": round(repeat_penalty + dim_penalty, 4),
-                    "FinalScore": round(final_score, 4),
-                })
-
-                covered.add(zone)
-                zone_total_count[zone] += 1
-                zone_phase_count[zone] += 1
-                zone_type_used_total.add((zone, t))
-                local_budget -= cost
-
-                if pass_mode == "coverage" and len(covered) >= target_cover:
-                    break
-
-        try_pick("coverage")
-        try_pick("fill")
-
-        phases.append({
-            "name": phase_names[p_idx],
-            "budget": phase_budget,
-            "time": phase_time,
-            "actions": picks,
-            "remaining": local_budget
-        })
-
-    plan_df = pd.DataFrame([a for ph in phases for a in ph["actions"]])
-    return phases, plan_df
-
-def compute_metrics(plan_df: pd.DataFrame, total_budget_m: int):
-    if plan_df.empty:
-        return {
-            "TotalImpact": 0.0,
-            "ZonesCovered": 0,
-            "TotalCost": 0,
-            "BudgetUsedPct": 0.0,
-            "FairnessIndex": 0.0,
-            "AvgTime": 0.0,
-        }
-    total_impact = float(plan_df["ImpactScore"].sum())
-    zones_covered = int(plan_df["Zone"].nunique())
-    total_cost = int(plan_df["EstCost_M$"].sum())
-    budget_used_pct = 100.0 * total_cost / max(1, total_budget_m)
-
-    counts = plan_df["Zone"].value_counts().values
-    if len(counts) <= 1:
-        fairness = 1.0
-    else:
-        fairness = float(1.0 - (np.std(counts) / max(1e-9, np.mean(counts))))
-        fairness = float(np.clip(fairness, 0, 1))
-
-    avg_time = float(plan_df["EstTime_wks"].mean())
-    return {
-        "TotalImpact": round(total_impact, 4),
-        "ZonesCovered": zones_covered,
-        "TotalCost": total_cost,
-        "BudgetUsedPct": round(budget_used_pct, 1),
-        "FairnessIndex": round(fairness, 3),
-        "AvgTime": round(avg_time, 2),
-    }
+# JSON span logs are also appended here when set
+PERF_LOG_PATH = os.environ.get("PHOENIX_PERF_LOG") or None
 
 # =========================================================
 # ------------------- (NEW PART) QUANTUM ROADS QAOA -------------------
 # =========================================================
-def run_quantum_roads_pipeline(q_budget, q_lambda, q_gamma, q_beta, q_weights):
-    # Stage 1-3 (same as quantum pipeline)
-    df_roads = load_road_data()
-    df_roads = engineer_context_features(df_roads)
-    df_roads = compute_impact_scores(df_roads, q_weights)
-
-    # Stage 4 QUBO
-    Q = build_qubo(df_roads, q_budget, q_lambda)
-
-    # Stage 5 QAOA
-    qc, gamma, beta = build_qaoa_circuit(Q)
-    best_bit, best_energy, counts = run_qaoa_and_extract_solution(
-        qc=qc,
-        gamma=gamma,
-        beta=beta,
-        params={"gamma": q_gamma, "beta": q_beta},
-        Q=Q
-    )
+@st.cache_resource(show_spinner=False)
+def _road_inventory(path, version):
+    roads = RoadSet.from_dataframe(load_road_data(path, categorical=True))
+    roads = engineer_context_features(roads, inplace=False)
+    return roads, ImpactScorer.from_dataframe(roads)
+
+
+def load_road_inventory():
+    """
+    Feature-engineered RoadSet and its ImpactScorer, built once per road
+    source version (path + mtime) and shared across reruns, so a run only
+    pays for scorer.score(weights). Callers get a shallow copy and may
+    add or replace columns freely.
+    """
+    roads, scorer = _road_inventory(ROAD_DATA_PATH, road_data_version(ROAD_DATA_PATH))
+    return roads.copy(deep=False), scorer
+
+def run_quantum_roads_pipeline(q_budget, q_lambda, q_gamma, q_beta, q_weights, autotune=False, depth=1,
+                               solvers=("qaoa",), report_gap=True, decompose=False, part_size=20,
+                               capture_profile=False, trace_memory=False):
+    # Every stage runs inside one RunProfile span (timing, + peak memory when traced)
+    with RunProfile("quantum_roads", trace_memory=trace_memory, profile=capture_profile,
+                    log_path=PERF_LOG_PATH) as profile:
+        # Stage 1-3 (same as quantum pipeline, on a compact RoadSet)
+        # Load + features + normalization are cached per inventory; only the weights are applied here
+        with profile.span("load + features"):
+            roads, scorer = load_road_inventory()
+        with profile.span("scoring"):
+            roads["impact"] = scorer.score(q_weights)
+
+        # Stage 4 QUBO (low-rank; QAOA exports the dense Q itself)
+        with profile.span("qubo"):
+            Q = KnapsackQubo.from_dataframe(roads, q_budget, q_lambda)
+
+        # Stage 5 Solve (QAOA and/or classical backends, raced)
+        solvers = list(solvers or ["qaoa"])
+        options = {"qaoa": {
+            "params": {"gamma": q_gamma, "beta": q_beta},
+            "p": depth,
+            "autotune": autotune,
+        }}
+
+        # transpile / simulate spans are recorded from inside the QAOA backend
+        with profile.span("solve"):
+            if decompose:
+                # Per-zone sub-QUBOs with the first backend, stitched under the total budget
+                results = [solve_decomposed(
+                    roads, q_budget, q_lambda,
+                    by="zone",
+                    max_size=part_size,
+                    solver=solvers[0],
+                    solver_options=options.get(solvers[0], {})
+                )]
+                # Exact reference only fits small inventories; above that optimality_gap stays None
+                if report_gap and len(Q) <= MAX_EXACT_ROADS:
+                    exact = race_solvers(Q, ["exact"], reference=False)[0]
+                    exact["reference"] = True
+                    for r in results + [exact]:
+                        r["optimality_gap"] = optimality_gap(r["energy"], exact["energy"])
+                    # Exact is only the reference here; the plan uses the decomposed result
+                    results = results + [exact]
+            else:
+                results = race_solvers(Q, solvers, options=options, reference=report_gap)
+
+        # The exact reference only supplies optimality_gap; the plan comes from a requested solver
+        best = next(r for r in results if not r.get("reference"))
+        qaoa = next((r for r in results if r["solver"] == "qaoa"), None)
+
+        # Stage 6 Plan
+        with profile.span("plan"):
+            roads, summary = generate_recovery_plan(roads, best["bitstring"])
+        summary["solver"] = best["solver"]
+
+        # Stage 7 Map
+        with profile.span("map"):
+            gaza_map = visualize_gaza_dashboard(roads)
+
+        run_info = {
+            "params": qaoa["params"] if qaoa else {},
+            "solver_table": pd.DataFrame([
+                {k: r.get(k) for k in ["solver", "energy", "optimality_gap", "total_impact", "total_cost", "feasible", "time_s"]}
+                for r in results
+            ]),
+            "qaoa_gap": qaoa.get("optimality_gap") if qaoa else None,
+        }
+
+    # DataFrame only at the UI boundary (tables / session state)
+    df_roads = roads.to_dataframe()
+
+    run_info["timings"] = profile.to_frame()
+    run_info["profile_stats"] = profile.profile_stats()
 
-    # Stage 6 Plan
-    df_roads, summary = generate_recovery_plan(df_roads, best_bit)
+    counts = qaoa["counts"] if qaoa else best["counts"]
+    return df_roads, summary, gaza_map, best["energy"], counts, run_info
 
-    # Stage 7 Map
-    gaza_map = visualize_gaza_dashboard(df_roads)
+def run_quantum_sweep(q_budget, q_lambda, q_weights, resolution):
+    roads, scorer = load_road_inventory()
+    roads["impact"] = scorer.score(q_weights)
 
-    return df_roads, summary, gaza_map, best_energy, counts
+    Q = build_qubo(roads, q_budget, q_lambda)
+
+    # One batched Aer job for the whole grid
+    axis = np.linspace(0.0, 3.0, resolution)
+    return sweep_qaoa_parameters(
+        Q,
+        qaoa_grid(axis, axis),
+        costs=np.asarray(roads["final_cost"], dtype=float),
+        budget=q_budget
+    )
 
 # Keep results in session (so it doesn't disappear when switching tabs)
+if "q_sweep" not in st.session_state:
+    st.session_state.q_sweep = None
+
+if run_sweep:
+    with st.spinner("🗺️ Sweeping γ/β landscape..."):
+        st.session_state.q_sweep = run_quantum_sweep(q_budget, q_lambda, q_weights, q_sweep_res)
+
+if "pareto_df" not in st.session_state:
+    st.session_state.pareto_df = None
+
+if run_pareto:
+    with st.spinner("🧭 Exploring strategy weight space..."):
+        st.session_state.pareto_df = explore_pareto_front(
+            df_city, project_types, total_budget, horizon_months,
+            engine=plan_engine, max_evals=pareto_evals
+        )
+
+if "mc_report" not in st.session_state:
+    st.session_state.mc_report = None
+
+if run_mc:
+    mc_road_set = None
+    if mc_roads:
+        mc_road_set, _scorer = load_road_inventory()
+
+    mc_ctx = uncertainty_context(
+        load_zone_data(), project_types, total_budget, horizon_months, plan_variant_weights(mc_plan),
+        roads=mc_road_set, road_weights=q_weights, road_budget=q_budget, road_lambda=q_lambda,
+        uncertainty={k: v * mc_scale for k, v in DEFAULT_UNCERTAINTY.items()}
+    )
+
+    mc_chunks = []
+    mc_progress = st.progress(0.0, text="🎲 Simulating scenarios...")
+    for chunk in simulate_scenarios(mc_ctx, mc_scenarios, seed=int(variant_seed)):
+        mc_chunks.append(chunk)
+        done = sum(c["size"] for c in mc_chunks)
+        mc_progress.progress(done / mc_scenarios, text=f"🎲 Simulated {done:,}/{mc_scenarios:,} scenarios")
+    mc_progress.empty()
+
+    st.session_state.mc_report = dict(summarize_scenarios(mc_ctx, mc_chunks), plan=mc_plan)
+
 if "qaoa_ready" not in st.session_state:
     st.session_state.qaoa_ready = False
     st.session_state.df_roads = None
@@ -484,15 +426,24 @@ if "qaoa_ready" not in st.session_state:
     st.session_state.q_map = None
     st.session_state.q_energy = None
     st.session_state.q_counts = None
+    st.session_state.q_run_info = None
 
 if run_quantum:
     with st.spinner("⚛️ Running QAOA for Roads..."):
-        df_roads, q_summary, q_map, q_energy, q_counts = run_quantum_roads_pipeline(
+        df_roads, q_summary, q_map, q_energy, q_counts, q_run_info = run_quantum_roads_pipeline(
             q_budget=q_budget,
             q_lambda=q_lambda,
             q_gamma=q_gamma,
             q_beta=q_beta,
-            q_weights=q_weights
+            q_weights=q_weights,
+            autotune=q_autotune,
+            depth=q_depth,
+            solvers=q_solvers,
+            report_gap=q_gap,
+            decompose=q_decompose,
+            part_size=q_part_size,
+            capture_profile=capture_profile,
+            trace_memory=trace_memory
         )
     st.session_state.qaoa_ready = True
     st.session_state.df_roads = df_roads
@@ -500,6 +451,7 @@ if run_quantum:
     st.session_state.q_map = q_map
     st.session_state.q_energy = q_energy
     st.session_state.q_counts = q_counts
+    st.session_state.q_run_info = q_run_info
 
 # =========================================================
 # Tabs (KEEP + add Quantum tab)
@@ -576,24 +528,43 @@ with tab3:
     else:
         st.markdown("<div class='card'><b>Top-K Recovery Plans</b><br><span class='small-muted'>We generate multiple strategies so decision-makers can choose under uncertainty.</span></div>", unsafe_allow_html=True)
 
-        plan_names = ["Plan A — Max Impact", "Plan B — Balanced", "Plan C — Fairness First"][:k_plans]
+        try:
+            variants = (
+                named_variants(["Plan A — Max Impact", "Plan B — Balanced", "Plan C — Fairness First"][:k_plans])
+                + parse_variants(custom_weights)
+                + sample_variants(n_sampled, seed=int(variant_seed))
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        plan_names = [name for name, _w in variants]
         plans = {}
-        metrics_rows = []
-
-        for pname in plan_names:
-            w = plan_variant_weights(pname)
-            phases, plan_df = generate_plan(df_city, project_types, total_budget, horizon_months, w)
-            if not plan_df.empty:
-                plan_df["Plan"] = pname
-            plans[pname] = {"phases": phases, "df": plan_df, "weights": w}
-            m = compute_metrics(plan_df, total_budget)
-            m["Plan"] = pname
-            m["Weights"] = f"I:{w['w_impact']:.2f}  S:{w['w_speed']:.2f}  F:{w['w_fair']:.2f}"
-            metrics_rows.append(m)
-
-        metrics_df = pd.DataFrame(metrics_rows)[["Plan","Weights","TotalImpact","ZonesCovered","TotalCost","BudgetUsedPct","FairnessIndex","AvgTime"]]
+        results = []
+
+        metric_cols = ["Plan","Weights","TotalImpact","ZonesCovered","TotalCost","BudgetUsedPct","FairnessIndex","AvgTime"]
+        if plan_engine == "exact":
+            metric_cols += ["Engine", "Objective", "GreedyGapPct"]
+
         st.subheader("Plan Comparison (Key Metrics)")
-        st.dataframe(metrics_df)
+        table_slot = st.empty()
+        progress = st.progress(0.0)
+
+        # Plans stream into the table as pool workers finish them
+        with RunProfile("top_k_plans", trace_memory=trace_memory, profile=capture_profile,
+                        log_path=PERF_LOG_PATH) as topk_profile:
+            with topk_profile.span(f"{len(variants)} variants: {plan_engine} plan + metrics"):
+                for r in evaluate_variants(df_city, project_types, total_budget, horizon_months, variants, engine=plan_engine):
+                    plans[r["name"]] = {"phases": r["phases"], "df": r["df"], "weights": r["weights"]}
+                    results.append(r)
+                    table_slot.dataframe(variants_table(results)[metric_cols])
+                    progress.progress(len(results) / len(variants))
+
+        progress.empty()
+        metrics_df = variants_table(results)[metric_cols]
+        table_slot.dataframe(metrics_df)
+
+        show_timing_breakdown(topk_profile.to_frame(), topk_profile.profile_stats())
 
         st.divider()
 
@@ -661,6 +632,73 @@ with tab3:
             mime="text/csv"
         )
 
+    # -------------------------
+    # Pareto front over strategy weights
+    # -------------------------
+    if st.session_state.pareto_df is not None:
+        import altair as alt
+
+        pareto_df = st.session_state.pareto_df
+        st.divider()
+        st.subheader("🧭 Strategy Trade-offs (Pareto Front)")
+        st.caption(
+            f"{len(pareto_df)} weight combinations evaluated, "
+            f"{int(pareto_df['pareto'].sum())} non-dominated. Better = "
+            + ", ".join(f"{c} {'↑' if s == 'max' else '↓'}" for c, s in PARETO_OBJECTIVES.items())
+        )
+
+        objective_cols = list(PARETO_OBJECTIVES)
+        ax1, ax2 = st.columns(2)
+        x_metric = ax1.selectbox("X axis", objective_cols, index=0)
+        y_metric = ax2.selectbox("Y axis", objective_cols, index=1)
+
+        scatter = alt.Chart(pareto_df).mark_circle(size=70).encode(
+            x=alt.X(f"{x_metric}:Q", scale=alt.Scale(zero=False)),
+            y=alt.Y(f"{y_metric}:Q", scale=alt.Scale(zero=False)),
+            color=alt.Color("pareto:N", title="Pareto-optimal"),
+            tooltip=["w_impact", "w_speed", "w_fair"] + objective_cols + ["round"]
+        ).interactive()
+        st.altair_chart(scatter, use_container_width=True)
+
+        st.dataframe(
+            pareto_front(pareto_df)[["w_impact", "w_speed", "w_fair"] + objective_cols + ["ZonesCovered", "TotalCost"]].round(3),
+            use_container_width=True
+        )
+
+    # -------------------------
+    # Monte Carlo robustness of one strategy
+    # -------------------------
+    if st.session_state.mc_report is not None:
+        import altair as alt
+
+        mc = st.session_state.mc_report
+        st.divider()
+        st.subheader(f"🎲 Plan Robustness — {mc['plan']}")
+        st.caption(
+            f"{mc['n_scenarios']:,} scenarios with perturbed zone data, project costs / times and road inputs. "
+            f"Frequency = share of scenarios that fund the action; intervals are central {int(mc['ci'] * 100)}%."
+        )
+
+        st.markdown("#### Metric confidence intervals")
+        st.dataframe(mc["metrics"], use_container_width=True)
+
+        actions = mc["actions"]
+        if not actions.empty:
+            st.markdown("#### Action stability")
+            bars = alt.Chart(actions.head(25).assign(Action=actions["Zone"] + " · " + actions["ProjectType"])).mark_bar().encode(
+                x=alt.X("Frequency:Q", scale=alt.Scale(domain=[0, 1])),
+                y=alt.Y("Action:N", sort="-x", title=None),
+                color=alt.Color("InNominal:N", title="In nominal plan"),
+                tooltip=["Zone", "ProjectType", "Frequency", "StdErr", "NominalPhase"]
+            )
+            st.altair_chart(bars, use_container_width=True)
+            st.dataframe(actions, use_container_width=True, height=280)
+
+        if mc["roads"] is not None:
+            st.markdown("#### Road selection stability")
+            st.caption(f"Road QUBO solved per scenario with `{mc['road_solver']}` (minimum QUBO energy).")
+            st.dataframe(mc["roads"], use_container_width=True)
+
 # ---- Tab 4 (KEEP)
 with tab4:
     st.subheader("Project Visuals")
@@ -706,6 +744,8 @@ with tab5:
         q_summary  = st.session_state.q_summary
         q_map      = st.session_state.q_map
         q_energy   = st.session_state.q_energy
+        q_run_info = st.session_state.q_run_info
+        q_params   = q_run_info["params"]
 
         # -------------------------
         # KPIs
@@ -728,13 +768,36 @@ with tab5:
         )
 
         c3.markdown(
-            f"<div class='kpi'>QAOA Energy<br>"
+            f"<div class='kpi'>Best Energy ({q_summary['solver']})<br>"
             f"<h2 style='color:var(--warn);margin:0;'>"
             f"{q_energy:.3f}"
             f"</h2></div>",
             unsafe_allow_html=True
         )
 
+        if q_run_info["qaoa_gap"] is not None:
+            st.markdown(
+                f"<div class='card'><b>QAOA optimality gap vs exact:</b> "
+                f"{100 * q_run_info['qaoa_gap']:.2f}%</div>",
+                unsafe_allow_html=True
+            )
+
+        st.subheader("🏁 Solver Comparison")
+        st.dataframe(q_run_info["solver_table"], use_container_width=True)
+
+        show_timing_breakdown(q_run_info["timings"], q_run_info["profile_stats"])
+
+        if "expected_energy" in q_params:
+            st.markdown(
+                f"<div class='card'>"
+                f"<b>Auto-tuned angles (exact statevector)</b><br>"
+                f"<span class='small-muted'>p={q_params['p']}, "
+                f"γ={np.round(q_params['gamma'], 3).tolist()}, β={np.round(q_params['beta'], 3).tolist()}, "
+                f"⟨E⟩={q_params['expected_energy']:.3f} after {q_params['nfev']} evaluations</span>"
+                f"</div>",
+                unsafe_allow_html=True
+            )
+
         st.divider()
 
         # -------------------------
@@ -785,4 +848,27 @@ with tab5:
             "</ul>"
             "</div>",
             unsafe_allow_html=True
-        )
\ No newline at end of file
+        )
+
+    # -------------------------
+    # γ/β Landscape (batched sweep)
+    # -------------------------
+    if st.session_state.q_sweep is not None:
+        import altair as alt
+
+        sweep_df = st.session_state.q_sweep
+        st.subheader("🗺️ QAOA γ/β Landscape")
+
+        heat = alt.Chart(sweep_df).mark_rect().encode(
+            x=alt.X("gamma:O", title="γ", axis=alt.Axis(format=".2f")),
+            y=alt.Y("beta:O", title="β", axis=alt.Axis(format=".2f")),
+            color=alt.Color("expected_energy:Q", title="⟨E⟩", scale=alt.Scale(scheme="viridis")),
+            tooltip=["gamma", "beta", "expected_energy", "best_energy", "feasible_rate"]
+        )
+        st.altair_chart(heat, use_container_width=True)
+
+        st.dataframe(
+            sweep_df.sort_values("expected_energy"),
+            use_container_width=True,
+            height=280
+        )
@@ -0,0 +1,53 @@
+# benchmarks/__main__.py
+
+import argparse
+import sys
+
+from benchmarks.harness import compare_results, load_results, run_benchmarks, save_results
+from benchmarks.stages import QUICK_SIZES, STAGES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark every Phoenix pipeline stage across a size sweep."
+    )
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help="comma-separated stages (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller size sweep")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json", help="results JSON path")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown / memory growth that counts as a regression")
+    args = parser.parse_args(argv)
+
+    names = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in names if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages {unknown}; choose from {list(STAGES)}")
+
+    records = run_benchmarks(
+        {name: STAGES[name] for name in names},
+        sizes=QUICK_SIZES if args.quick else None,
+        repeat=args.repeat,
+        seed=args.seed
+    )
+    save_results(records, args.out)
+    print(f"Saved {len(records)} results to {args.out}")
+
+    if args.baseline:
+        regressions = compare_results(records, load_results(args.baseline), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} n={r['size']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} (x{r['ratio']})")
+        if regressions:
+            return 1
+        print("No regressions vs baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
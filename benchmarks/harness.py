@@ -0,0 +1,117 @@
+# benchmarks/harness.py
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+
+def measure(fn, repeat=3):
+    """
+    Time fn() `repeat` times and record its peak traced memory once.
+
+    Returns:
+        dict with time_min_s, time_median_s, peak_mem_mb and the last result
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "time_min_s": times[0],
+        "time_median_s": times[len(times) // 2],
+        "peak_mem_mb": peak / 2**20,
+        "result": result,
+    }
+
+
+def run_benchmarks(stages, sizes=None, repeat=3, seed=0, log=print):
+    """
+    Run every stage across its size sweep.
+
+    stages maps a stage name to a setup(size, seed) callable returning
+    (fn, quality) — fn is the timed call, quality(result) returns a dict
+    of solution-quality numbers (energy, optimality gap, ...).
+    Returns:
+        list of records (one per stage / size)
+    """
+    records = []
+    for name, (default_sizes, setup) in stages.items():
+        for size in (sizes or {}).get(name, default_sizes):
+            fn, quality = setup(size, seed)
+            m = measure(fn, repeat=repeat)
+
+            record = {
+                "stage": name,
+                "size": size,
+                "time_min_s": round(m["time_min_s"], 6),
+                "time_median_s": round(m["time_median_s"], 6),
+                "peak_mem_mb": round(m["peak_mem_mb"], 3),
+            }
+            record.update(quality(m["result"]) if quality else {})
+            records.append(record)
+
+            if log:
+                log(f"{name:>26} n={size:<7} {record['time_median_s'] * 1e3:10.2f} ms {record['peak_mem_mb']:9.2f} MB")
+
+    return records
+
+
+def save_results(records, path):
+    payload = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "records": records,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)["records"]
+
+
+def compare_results(current, baseline, threshold=0.25,
+                    metrics=("time_median_s", "peak_mem_mb")):
+    """
+    Flag stage/size pairs where a metric grew by more than threshold
+    (relative) vs the baseline run.
+    """
+    base = {(r["stage"], r["size"]): r for r in baseline}
+
+    regressions = []
+    for r in current:
+        b = base.get((r["stage"], r["size"]))
+        if b is None:
+            continue
+        for metric in metrics:
+            old, new = b.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                regressions.append({
+                    "stage": r["stage"],
+                    "size": r["size"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": round(ratio, 3),
+                })
+    return regressions
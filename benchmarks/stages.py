@@ -0,0 +1,213 @@
+# benchmarks/stages.py
+
+import numpy as np
+
+from planning.planner import DEF_COL, compute_metrics, generate_plan
+from planning.zone_model import build_city_model
+from quantum.feature_engineering import engineer_context_features
+from quantum.impact_scoring import compute_impact_scores
+from quantum.synthetic import generate_road_data, generate_zone_data
+
+ROAD_WEIGHTS = {"damage": 0.35, "population": 0.35, "hospital": 0.20, "aid": 0.10}
+LAMBDA = 12
+
+
+# =========================================================
+# Inputs
+# =========================================================
+def scored_roads(n, seed):
+    df = generate_road_data(n, zones=max(1, n // 50), seed=seed)
+    df = engineer_context_features(df)
+    return compute_impact_scores(df, ROAD_WEIGHTS)
+
+
+def road_budget(df):
+    """About 30 % of the inventory's total cost."""
+    return float(0.3 * df["final_cost"].sum())
+
+
+def city_model(n_zones, seed):
+    return build_city_model(generate_zone_data(n_zones, seed=seed))
+
+
+# =========================================================
+# Stage setups: setup(size, seed) -> (fn, quality)
+# =========================================================
+def setup_impact_scores_batch(n, seed):
+    from quantum.impact_scoring import ImpactScorer
+
+    df = engineer_context_features(generate_road_data(n, zones=max(1, n // 50), seed=seed))
+    scorer = ImpactScorer.from_dataframe(df)
+    W = np.random.default_rng(seed).dirichlet(np.ones(4), size=256)
+    return (lambda: scorer.scores(W)), None
+
+
+def setup_build_qubo(n, seed):
+    from quantum.qubo import build_qubo
+
+    df = scored_roads(n, seed)
+    budget = road_budget(df)
+    return (lambda: build_qubo(df, budget, LAMBDA)), None
+
+
+def setup_build_qaoa_circuit(n, seed):
+    from quantum.qaoa_solver import build_qaoa_circuit
+    from quantum.qubo import build_qubo
+
+    df = scored_roads(n, seed)
+    Q = build_qubo(df, road_budget(df), LAMBDA)
+    return (lambda: build_qaoa_circuit(Q)), None
+
+
+def setup_transpile(n, seed):
+    from qiskit import transpile
+
+    from quantum.qaoa_solver import build_qaoa_circuit, get_backend
+    from quantum.qubo import build_qubo
+
+    df = scored_roads(n, seed)
+    qc, _gamma, _beta = build_qaoa_circuit(build_qubo(df, road_budget(df), LAMBDA))
+    qc.measure_all()
+    backend = get_backend()
+    return (lambda: transpile(qc, backend)), None
+
+
+def setup_run_qaoa(n, seed):
+    from quantum.qaoa_solver import get_compiled_qaoa, run_qaoa_and_extract_solution
+    from quantum.qubo import KnapsackQubo
+    from quantum.solvers import optimality_gap, solve_exact
+
+    df = scored_roads(n, seed)
+    Q = KnapsackQubo.from_dataframe(df, road_budget(df), LAMBDA)
+    qc, gamma, beta = get_compiled_qaoa(Q)
+    exact = solve_exact(Q)["energy"]
+
+    def fn():
+        return run_qaoa_and_extract_solution(
+            qc, gamma, beta, {"gamma": 0.8, "beta": 0.7}, Q, compiled=True
+        )
+
+    def quality(result):
+        return {"energy": result[1], "optimality_gap": optimality_gap(result[1], exact)}
+
+    return fn, quality
+
+
+def setup_generate_recovery_plan(n, seed):
+    from quantum.plan_builder import generate_recovery_plan
+
+    df = scored_roads(n, seed)
+    bits = "".join(np.random.default_rng(seed).choice(["0", "1"], n))
+    return (lambda: generate_recovery_plan(df, bits)), (lambda r: {"total_impact": r[1]["total_impact"]})
+
+
+def setup_repair_and_refine(n, seed):
+    from quantum.decomposition import repair_and_refine
+
+    df = scored_roads(n, seed)
+    impacts = df["impact"].to_numpy(dtype=float)
+    costs = df["final_cost"].to_numpy(dtype=float)
+    budget = road_budget(df)
+    # About half the roads: a stitched selection well over budget
+    x = np.random.default_rng(seed).integers(0, 2, n)
+
+    def quality(result):
+        spent = float(costs @ result)
+        return {"total_impact": float(impacts @ result), "over_budget": max(0.0, spent - budget)}
+
+    return (lambda: repair_and_refine(x, impacts, costs, budget)), quality
+
+
+def setup_generate_plan(n_zones, seed):
+    df_city = city_model(n_zones, seed)
+    types = list(DEF_COL)
+    budget = int(450 * n_zones / 8)
+
+    def fn():
+        return generate_plan(
+            df_city, types, budget, 36, {"w_impact": 0.55, "w_speed": 0.15, "w_fair": 0.30}
+        )
+
+    def quality(result):
+        m = compute_metrics(result[1], budget)
+        return {"total_impact": m["TotalImpact"], "fairness": m["FairnessIndex"]}
+
+    return fn, quality
+
+
+def setup_generate_plan_exact(n_zones, seed):
+    from planning.exact_planner import plan_with_engine
+
+    df_city = city_model(n_zones, seed)
+    types = list(DEF_COL)
+    budget = int(450 * n_zones / 8)
+
+    def fn():
+        return plan_with_engine(
+            df_city, types, budget, 36, {"w_impact": 0.55, "w_speed": 0.15, "w_fair": 0.30}, engine="exact"
+        )
+
+    def quality(result):
+        info = result[2]
+        return {"objective": info["objective"], "greedy_gap": info.get("greedy_gap")}
+
+    return fn, quality
+
+
+def setup_monte_carlo(n_scenarios, seed):
+    from planning.uncertainty import run_monte_carlo, uncertainty_context
+
+    roads = engineer_context_features(generate_road_data(10, zones=8, seed=seed))
+    ctx = uncertainty_context(
+        generate_zone_data(8, seed=seed), list(DEF_COL), 450, 36,
+        {"w_impact": 0.55, "w_speed": 0.15, "w_fair": 0.30},
+        roads=roads, road_weights=ROAD_WEIGHTS, road_budget=road_budget(roads), road_lambda=LAMBDA
+    )
+
+    def fn():
+        return run_monte_carlo(ctx, n_scenarios, seed=seed)
+
+    def quality(result):
+        ci = result["metrics"].loc["TotalImpact"]
+        return {"impact_ci_width": float(ci["CI_High"] - ci["CI_Low"])}
+
+    return fn, quality
+
+
+def setup_visualize_gaza_dashboard(n, seed):
+    from visualization.map_view import visualize_gaza_dashboard
+
+    df = scored_roads(n, seed)
+    df["selected"] = np.random.default_rng(seed).integers(0, 2, n)
+    return (lambda: visualize_gaza_dashboard(df)), None
+
+
+# name -> (default size sweep, setup)
+STAGES = {
+    "impact_scores_batch": ([1000, 10000, 100000], setup_impact_scores_batch),
+    "build_qubo": ([100, 1000, 4000], setup_build_qubo),
+    "build_qaoa_circuit": ([4, 8, 12], setup_build_qaoa_circuit),
+    "transpile": ([4, 8, 12], setup_transpile),
+    "run_qaoa_and_extract_solution": ([4, 8, 12], setup_run_qaoa),
+    "generate_recovery_plan": ([100, 10000], setup_generate_recovery_plan),
+    "repair_and_refine": ([2000, 20000, 50000], setup_repair_and_refine),
+    "generate_plan": ([8, 100, 1000], setup_generate_plan),
+    "generate_plan_exact": ([8, 30, 100], setup_generate_plan_exact),
+    "monte_carlo": ([250, 1000, 10000], setup_monte_carlo),
+    "visualize_gaza_dashboard": ([10, 100, 1000], setup_visualize_gaza_dashboard),
+}
+
+# Smaller sweep for a fast smoke run
+QUICK_SIZES = {
+    "impact_scores_batch": [1000],
+    "build_qubo": [100, 1000],
+    "build_qaoa_circuit": [4, 8],
+    "transpile": [4, 8],
+    "run_qaoa_and_extract_solution": [4, 8],
+    "generate_recovery_plan": [100],
+    "repair_and_refine": [2000],
+    "generate_plan": [8, 100],
+    "generate_plan_exact": [8],
+    "monte_carlo": [250],
+    "visualize_gaza_dashboard": [10, 100],
+}
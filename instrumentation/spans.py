@@ -0,0 +1,167 @@
+# instrumentation/spans.py
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+logger = logging.getLogger("phoenix.perf")
+
+# Profile that module-level span() calls record into
+_active = ContextVar("phoenix_active_profile", default=None)
+
+# Open spans of the current thread / task, innermost last
+_open = ContextVar("phoenix_open_spans", default=())
+
+
+class RunProfile:
+    """
+    Per-run timing / memory breakdown built from context-manager spans.
+
+    Each span records wall time (perf_counter) and, with trace_memory
+    (opt-in: tracemalloc slows every allocation and so skews the wall
+    times), the tracemalloc peak reached inside it. Spans may nest; nested ones
+    record their parent stage and still count toward the parent's peak.
+    tracemalloc peaks are process-wide, so only spans on the thread that
+    entered the run record memory; spans in concurrent workers (e.g.
+    race_solvers backends) record wall time only, as their peaks would
+    include the other workers' allocations. profile=True additionally
+    captures one cProfile for the whole run. Every finished span is
+    emitted as a JSON log line (logger "phoenix.perf", optionally also
+    appended to log_path).
+    """
+
+    def __init__(self, name, trace_memory=False, profile=False, log_path=None):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.log_path = log_path
+        self.spans = []
+
+        self._profiler = cProfile.Profile() if profile else None
+        self._started_tracing = False
+        self._token = None
+        self._t0 = None
+        self._thread = None
+
+    # -------------------------------------------------
+    # Run lifecycle
+    # -------------------------------------------------
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self._profiler is not None:
+            self._profiler.enable()
+
+        self._token = _active.set(self)
+        self._thread = threading.get_ident()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        total = time.perf_counter() - self._t0
+        _active.reset(self._token)
+
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        self._emit({"run": self.name, "event": "run", "wall_s": round(total, 6)})
+        return False
+
+    @contextmanager
+    def span(self, stage):
+        tracing = (
+            self.trace_memory
+            and tracemalloc.is_tracing()
+            and threading.get_ident() == self._thread
+        )
+        parents = _open.get()
+        frame = {"stage": stage, "base": 0, "peak": 0}
+
+        if tracing:
+            # reset_peak is global: fold the peak so far into the open parents first
+            _, peak = tracemalloc.get_traced_memory()
+            for parent in parents:
+                parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["base"], frame["peak"] = tracemalloc.get_traced_memory()
+
+        token = _open.set(parents + (frame,))
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            _open.reset(token)
+
+            record = {
+                "run": self.name,
+                "event": "span",
+                "stage": stage,
+                "parent": parents[-1]["stage"] if parents else None,
+                "wall_s": round(wall, 6),
+            }
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                frame["peak"] = max(frame["peak"], peak)
+                for parent in parents:
+                    parent["peak"] = max(parent["peak"], frame["peak"])
+                record["peak_mem_mb"] = round(max(0, frame["peak"] - frame["base"]) / 2**20, 3)
+
+            self.spans.append(record)
+            self._emit(record)
+
+    # -------------------------------------------------
+    # Output
+    # -------------------------------------------------
+    def _emit(self, record):
+        line = json.dumps(record)
+        logger.info(line)
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(line + "\n")
+
+    def to_frame(self):
+        import pandas as pd
+
+        columns = ["stage", "parent", "wall_s"] + (["peak_mem_mb"] if self.trace_memory else [])
+        df = pd.DataFrame(self.spans, columns=columns)
+        if not df.empty:
+            # Share of the top-level stages only (nested spans are inside them)
+            total = df.loc[df["parent"].isna(), "wall_s"].sum()
+            df["share_pct"] = (100 * df["wall_s"] / max(1e-12, total)).round(1)
+        return df
+
+    def profile_stats(self, limit=25, sort="cumulative"):
+        """Top functions of the cProfile capture as text ('' if not profiled)."""
+        if self._profiler is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+@contextmanager
+def span(stage):
+    """
+    Record a span into the active RunProfile; a no-op when none is active.
+
+    Lets library code (e.g. transpile / simulate inside the QAOA solver)
+    report its stages without threading a profile object through calls.
+    """
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+
+    with profile.span(stage):
+        yield
@@ -0,0 +1,57 @@
+# phoenix/__main__.py
+
+import argparse
+import os
+import sys
+
+from phoenix.scenarios import collect_scenarios
+
+COMMANDS = {
+    "plan": "Top-K city recovery plans per scenario (zone model + generate_plan + compute_metrics).",
+    "roads": "Road selection per scenario (impact scoring + road QUBO + solvers + recovery plan).",
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m phoenix",
+        description="Run the Phoenix planning and road pipelines headless on scenario JSON files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in COMMANDS.items():
+        sub = commands.add_parser(command, help=help_text, description=help_text)
+        sub.add_argument("scenarios", nargs="+", help="scenario JSON files or directories of them")
+        sub.add_argument("--out", default="phoenix_out", help="output root (one directory per scenario)")
+        sub.add_argument("--format", choices=["json", "parquet"], default="json", help="table format")
+        sub.add_argument("--workers", type=int, default=None,
+                         help="scenario worker processes (default: one per CPU, 1 = serial)")
+    args = parser.parse_args(argv)
+
+    try:
+        scenarios = collect_scenarios(args.scenarios, args.command)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    # numpy / pandas and the pipeline modules load only after argument parsing
+    from phoenix.pipelines import run_scenarios, write_json
+
+    os.makedirs(args.out, exist_ok=True)
+    statuses = []
+    for status in run_scenarios(args.command, scenarios, args.out, args.format, args.workers):
+        statuses.append(status)
+        if status["status"] == "ok":
+            print(f"[{len(statuses)}/{len(scenarios)}] {status['scenario']}: ok ({status['time_s']:.2f}s) -> {status['dir']}")
+        else:
+            print(f"[{len(statuses)}/{len(scenarios)}] {status['scenario']}: FAILED {status['error']}", file=sys.stderr)
+
+    order = {name: i for i, (name, _settings) in enumerate(scenarios)}
+    statuses.sort(key=lambda s: order[s["scenario"]])
+    write_json({"pipeline": args.command, "scenarios": statuses}, os.path.join(args.out, "summary.json"))
+
+    failed = sum(s["status"] != "ok" for s in statuses)
+    print(f"{len(statuses) - failed}/{len(statuses)} scenarios succeeded; index at {os.path.join(args.out, 'summary.json')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+# phoenix/pipelines.py
+
+import json
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Planning / quantum modules are imported inside each pipeline, so a run
+# only loads what its stages need: qiskit is loaded by the QAOA backend
+# and folium by the map, never by `plan` or classical road solvers.
+
+SOLVER_COLUMNS = ["solver", "reference", "energy", "optimality_gap", "total_impact", "total_cost", "feasible", "time_s"]
+
+
+# =========================================================
+# Output helpers
+# =========================================================
+def _jsonable(obj):
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def write_json(obj, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False, default=_jsonable)
+    return path
+
+
+def write_table(df, out_dir, stem, fmt="json"):
+    """Write a DataFrame as <stem>.json (records) or <stem>.parquet; returns the file name."""
+    if fmt == "parquet":
+        name = stem + ".parquet"
+        df.to_parquet(os.path.join(out_dir, name), index=False)
+    elif fmt == "json":
+        name = stem + ".json"
+        df.to_json(os.path.join(out_dir, name), orient="records", indent=2, force_ascii=False)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'. Use 'json' or 'parquet'.")
+    return name
+
+
+def scenario_dir(out_root, name):
+    return os.path.join(out_root, re.sub(r"[^\w.-]+", "_", name).strip("_") or "scenario")
+
+
+# =========================================================
+# Plan pipeline (zone model -> Top-K plans -> metrics)
+# =========================================================
+def load_zone_table(settings):
+    """Raw zone table: a CSV / Parquet file, zones_data rows, or the built-in zones."""
+    from planning.zone_model import load_zone_data
+
+    zones = settings["zones"]
+    if zones is None or isinstance(zones, list):
+        return load_zone_data(zones, settings["base_counts"])
+
+    import pandas as pd
+
+    if zones.endswith(".parquet"):
+        return pd.read_parquet(zones)
+    return pd.read_csv(zones)
+
+
+def plan_strategies(settings):
+    """[(name, weights)] from built-in plan names and custom weight dicts."""
+    from planning.planner import plan_variant_weights
+
+    variants = []
+    for i, s in enumerate(settings["strategies"]):
+        if isinstance(s, str):
+            variants.append((s, plan_variant_weights(s)))
+        else:
+            weights = {k: float(s[k]) for k in ("w_impact", "w_speed", "w_fair")}
+            variants.append((s.get("name") or f"Custom {i + 1:03d}", weights))
+    return variants
+
+
+def run_plan(name, settings, out_dir, fmt="json", max_workers=None):
+    """
+    Build the city model and one plan per strategy (evaluate_variants,
+    any PLAN_ENGINES engine). Writes plans.<fmt>, metrics.<fmt> and
+    summary.json to out_dir.
+    Returns:
+        summary dict
+    """
+    import pandas as pd
+
+    from planning.variants import evaluate_variants, variants_table
+    from planning.zone_model import build_city_model
+
+    started = time.perf_counter()
+    df_city = build_city_model(load_zone_table(settings))
+
+    results = sorted(
+        evaluate_variants(
+            df_city,
+            settings["project_types"],
+            settings["total_budget"],
+            settings["horizon_months"],
+            plan_strategies(settings),
+            engine=settings["engine"],
+            max_workers=max_workers,
+        ),
+        key=lambda r: r["index"]
+    )
+
+    frames = [r["df"] for r in results if not r["df"].empty]
+    plans = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    os.makedirs(out_dir, exist_ok=True)
+    files = [
+        write_table(plans, out_dir, "plans", fmt),
+        write_table(variants_table(results), out_dir, "metrics", fmt),
+    ]
+
+    summary = {
+        "scenario": name,
+        "pipeline": "plan",
+        "settings": settings,
+        "zones": len(df_city),
+        "strategies": [
+            {"name": r["name"], "weights": r["weights"], "metrics": r["metrics"], "info": r["info"]}
+            for r in results
+        ],
+        "files": files + ["summary.json"],
+        "time_s": round(time.perf_counter() - started, 4),
+    }
+    write_json(summary, os.path.join(out_dir, "summary.json"))
+    return summary
+
+
+# =========================================================
+# Roads pipeline (features -> impact -> QUBO -> solve -> plan)
+# =========================================================
+def run_roads(name, settings, out_dir, fmt="json", max_workers=None):
+    """
+    The Quantum Roads pipeline of app.py without the UI: RoadSet load,
+    context features, ImpactScorer, KnapsackQubo, race_solvers (or
+    solve_decomposed), generate_recovery_plan and optionally the map.
+    Writes roads.<fmt>, summary.json (and map.html) to out_dir.
+    Returns:
+        summary dict
+    """
+    from quantum.data_loader import load_road_data
+    from quantum.feature_engineering import engineer_context_features
+    from quantum.impact_scoring import ImpactScorer
+    from quantum.plan_builder import generate_recovery_plan
+    from quantum.qubo import KnapsackQubo
+    from quantum.road_set import RoadSet
+    from quantum.solvers import MAX_EXACT_ROADS, optimality_gap, race_solvers
+
+    started = time.perf_counter()
+    budget, lambda_penalty = settings["budget"], settings["lambda"]
+    solvers = list(settings["solvers"])
+    options = settings["solver_options"]
+
+    roads = RoadSet.from_dataframe(load_road_data(settings["roads"], categorical=True))
+    roads = engineer_context_features(roads, inplace=False)
+    roads["impact"] = ImpactScorer.from_dataframe(roads).score(settings["weights"])
+    Q = KnapsackQubo.from_dataframe(roads, budget, lambda_penalty)
+
+    if settings["decompose"]:
+        from quantum.decomposition import solve_decomposed
+
+        results = [solve_decomposed(
+            roads, budget, lambda_penalty,
+            by="zone",
+            max_size=settings["part_size"],
+            solver=solvers[0],
+            solver_options=options.get(solvers[0], {}),
+            max_workers=max_workers,
+        )]
+        if settings["reference"] and len(Q) <= MAX_EXACT_ROADS:
+            exact = race_solvers(Q, ["exact"], reference=False)[0]
+            exact["reference"] = True
+            for r in results + [exact]:
+                r["optimality_gap"] = optimality_gap(r["energy"], exact["energy"])
+            results.append(exact)
+    else:
+        results = race_solvers(Q, solvers, options=options, reference=settings["reference"])
+
+    # The exact reference only supplies optimality_gap; the plan comes from a requested solver
+    best = next(r for r in results if not r.get("reference"))
+    roads, plan = generate_recovery_plan(roads, best["bitstring"])
+    plan["solver"] = best["solver"]
+
+    os.makedirs(out_dir, exist_ok=True)
+    files = [write_table(roads.to_dataframe(), out_dir, "roads", fmt)]
+
+    if settings["map"]:
+        from visualization.map_view import visualize_gaza_dashboard
+
+        visualize_gaza_dashboard(roads).save(os.path.join(out_dir, "map.html"))
+        files.append("map.html")
+
+    summary = {
+        "scenario": name,
+        "pipeline": "roads",
+        "settings": settings,
+        "roads": len(roads),
+        "plan": plan,
+        "energy": best["energy"],
+        "solvers": [{k: r.get(k) for k in SOLVER_COLUMNS} for r in results],
+        "files": files + ["summary.json"],
+        "time_s": round(time.perf_counter() - started, 4),
+    }
+    write_json(summary, os.path.join(out_dir, "summary.json"))
+    return summary
+
+
+PIPELINES = {
+    "plan": run_plan,
+    "roads": run_roads,
+}
+
+
+# =========================================================
+# Batch runner
+# =========================================================
+def _run_job(job):
+    pipeline, name, settings, out_root, fmt, inner_workers = job
+    out_dir = scenario_dir(out_root, name)
+    try:
+        summary = PIPELINES[pipeline](name, settings, out_dir, fmt, inner_workers)
+        return {"scenario": name, "status": "ok", "dir": out_dir, "time_s": summary["time_s"]}
+    except Exception as e:
+        return {
+            "scenario": name,
+            "status": "error",
+            "dir": out_dir,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+
+
+def run_scenarios(pipeline, scenarios, out_root, fmt="json", max_workers=None):
+    """
+    Run one pipeline over [(name, settings)] scenarios, each into its
+    own directory under out_root.
+
+    Several scenarios run in a process pool (one scenario per task);
+    inside pool workers the pipelines' own pools are limited to one
+    process so the machine is not oversubscribed. A failing scenario is
+    reported, not raised, so the rest of the batch still runs.
+    Yields:
+        status dicts (scenario, status, dir, time_s or error) in completion order
+    """
+    if pipeline not in PIPELINES:
+        raise ValueError(f"Unknown pipeline '{pipeline}'. Choose from {sorted(PIPELINES)}.")
+
+    parallel = max_workers != 1 and len(scenarios) > 1
+    jobs = [
+        (pipeline, name, settings, out_root, fmt, 1 if parallel else None)
+        for name, settings in scenarios
+    ]
+
+    if not parallel:
+        for job in jobs:
+            yield _run_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
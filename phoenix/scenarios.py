@@ -0,0 +1,102 @@
+# phoenix/scenarios.py
+
+import json
+import os
+
+# Stdlib only: imported at CLI startup, before any pipeline is chosen
+
+PLAN_DEFAULTS = {
+    "zones": None,            # zone table path (CSV / Parquet) or zones_data rows; None = built-in zones
+    "base_counts": None,      # BASE_COUNTS override when zones are rows
+    "total_budget": 450,
+    "horizon_months": 36,
+    "project_types": ["Housing", "Hospitals", "Schools", "Infrastructure", "Roads"],
+    # Built-in plan names or {"name", "w_impact", "w_speed", "w_fair"} dicts
+    "strategies": ["Plan A — Max Impact", "Plan B — Balanced", "Plan C — Fairness First"],
+    "engine": "greedy",
+}
+
+ROADS_DEFAULTS = {
+    "roads": None,            # road table path (see load_road_data); None = bundled roads
+    "budget": 6,
+    "lambda": 12,
+    "weights": {"damage": 0.35, "population": 0.35, "hospital": 0.20, "aid": 0.10},
+    "solvers": ["knapsack_dp"],
+    "solver_options": {},     # per-solver options, e.g. {"qaoa": {"p": 2, "autotune": true}}
+    "reference": True,        # optimality gap vs exact (small inventories)
+    "decompose": False,
+    "part_size": 20,
+    "map": False,             # also write the folium map as HTML
+}
+
+SECTIONS = {"plan": PLAN_DEFAULTS, "roads": ROADS_DEFAULTS}
+
+
+def _resolve(path, base_dir):
+    if path is None or os.path.isabs(path):
+        return path
+    return os.path.join(base_dir, path)
+
+
+def load_scenarios(path, section):
+    """
+    Scenarios of one pipeline section from a JSON file.
+
+    A file holds one scenario object or a list of them. Each scenario
+    has a "name" and optional "plan" / "roads" sections that override
+    PLAN_DEFAULTS / ROADS_DEFAULTS; relative data paths are resolved
+    against the file's directory.
+    Returns:
+        list of (name, settings) pairs
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    entries = data if isinstance(data, list) else [data]
+    base_dir = os.path.dirname(os.path.abspath(path))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    defaults = SECTIONS[section]
+
+    scenarios = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: scenario {i} is not a JSON object.")
+
+        overrides = entry.get(section) or {}
+        unknown = sorted(set(overrides) - set(defaults))
+        if unknown:
+            raise ValueError(f"{path}: unknown '{section}' settings {unknown}; choose from {sorted(defaults)}.")
+
+        settings = {**defaults, **overrides}
+        for key in ("zones", "roads"):
+            if isinstance(settings.get(key), str):
+                settings[key] = _resolve(settings[key], base_dir)
+
+        name = entry.get("name") or (stem if len(entries) == 1 else f"{stem}-{i + 1:03d}")
+        scenarios.append((str(name), settings))
+
+    return scenarios
+
+
+def collect_scenarios(paths, section):
+    """
+    Scenarios from files and directories (every *.json inside), in order.
+    Names must be unique, since they name the output directories.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                os.path.join(path, f) for f in os.listdir(path) if f.endswith(".json")
+            )
+        else:
+            files.append(path)
+
+    scenarios = [s for f in files for s in load_scenarios(f, section)]
+
+    names = [name for name, _settings in scenarios]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate scenario names {duplicates}.")
+
+    return scenarios
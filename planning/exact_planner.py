@@ -0,0 +1,292 @@
+# planning/exact_planner.py
+
+import numpy as np
+import pandas as pd
+
+from planning.planner import (
+    DIMINISHING_RETURNS,
+    MAX_ACTIONS_PER_ZONE_PER_PHASE,
+    MAX_REPEAT_SAME_TYPE_IN_ZONE_TOTAL,
+    MIN_ZONE_COVERAGE_RATIO,
+    PHASE_NAMES,
+    PHASE_SPLIT,
+    ZONE_REPEAT_PENALTY,
+    generate_plan,
+    phase_eligible,
+    plan_candidates,
+)
+
+# Objective cost of each zone missing from a phase's coverage target
+COVERAGE_PENALTY = 10.0
+
+PLAN_ENGINES = ["greedy", "exact"]
+
+
+# =========================================================
+# Scoring shared by both engines
+# =========================================================
+def zone_marginals(w_fair, max_actions):
+    """
+    Fairness boost minus repeat / diminishing penalties of the j-th action
+    in a zone (j = actions the zone already has), as used by generate_plan.
+    Strictly decreasing in j, so the MILP fills them in order.
+    """
+    j = np.arange(max_actions)
+    return w_fair / (1 + j) - ZONE_REPEAT_PENALTY * j - DIMINISHING_RETURNS * np.maximum(0, j - 1)
+
+
+def coverage_shortfall(plan_df, n_zones):
+    """Zones missing from the phases' MIN_ZONE_COVERAGE_RATIO targets, summed over phases."""
+    shortfall = 0
+    for p_idx, name in enumerate(PHASE_NAMES):
+        target = int(np.ceil(n_zones * MIN_ZONE_COVERAGE_RATIO[p_idx]))
+        covered = plan_df.loc[plan_df["Phase"] == name, "Zone"].nunique() if not plan_df.empty else 0
+        shortfall += max(0, target - covered)
+    return shortfall
+
+
+def plan_objective(plan_df, n_zones):
+    """
+    Objective both engines are compared on: the sum of FinalScore minus
+    COVERAGE_PENALTY per zone short of each phase's coverage target.
+    """
+    score = float(plan_df["FinalScore"].sum()) if not plan_df.empty else 0.0
+    return score - COVERAGE_PENALTY * coverage_shortfall(plan_df, n_zones)
+
+
+# =========================================================
+# Exact engine (MILP)
+# =========================================================
+def generate_plan_exact(df_in, types, total_budget_m, horizon_m, weights, time_limit=20.0, project_meta=None):
+    """
+    Optimal phase allocation as a MILP (scipy.optimize.milp / HiGHS).
+
+    Same scoring and rules as generate_plan, as constraints instead of
+    a greedy scan: phase budgets, PHASE_ALLOWED, the phase time window,
+    the Phase 1 deficit floor, MAX_ACTIONS_PER_ZONE_PER_PHASE, one action
+    per (zone, type) and MIN_ZONE_COVERAGE_RATIO (soft, COVERAGE_PENALTY
+    per missing zone). The concave per-zone fairness / repeat terms are
+    linearized with one binary per action slot. Unit costs / times come
+    from project_meta (default PROJECT_META), as in generate_plan.
+    Returns:
+        phases, plan_df (generate_plan format), info dict
+    """
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_matrix
+
+    wF = weights["w_fair"]
+
+    # -------------------------------------------------
+    # Candidate scores (zones x types), shared with generate_plan
+    # -------------------------------------------------
+    cand = plan_candidates(df_in, types, weights, project_meta)
+    zones, types = cand["zones"], cand["types"]
+    need, deficit, impact, speed = cand["need"], cand["deficit"], cand["impact"], cand["speed"]
+    base = cand["base_score"]
+    cost = cand["cost"].astype(float)
+    Z, T, P = len(zones), len(types), len(PHASE_SPLIT)
+
+    phase_budget = [int(total_budget_m * r) for r in PHASE_SPLIT]
+    phase_time = [int(horizon_m * r) for r in PHASE_SPLIT]
+    target = [int(np.ceil(Z * r)) for r in MIN_ZONE_COVERAGE_RATIO]
+
+    # -------------------------------------------------
+    # Variables: x[p, z, t] (eligible only), n[z, j], y[p, z], s[p]
+    # -------------------------------------------------
+    elig_p, elig_z, elig_t = [], [], []
+    for p in range(P):
+        z, t = np.nonzero(phase_eligible(cand, p, horizon_m))
+        elig_p.append(np.full(len(z), p))
+        elig_z.append(z)
+        elig_t.append(t)
+
+    xp = np.concatenate(elig_p).astype(int)
+    xz = np.concatenate(elig_z).astype(int)
+    xt = np.concatenate(elig_t).astype(int)
+    nx = len(xp)
+
+    J = sum(MAX_ACTIONS_PER_ZONE_PER_PHASE)
+    n0 = nx
+    y0 = n0 + Z * J
+    s0 = y0 + P * Z
+    nvar = s0 + P
+
+    c = np.zeros(nvar)
+    c[:nx] = -base[xz, xt]
+    c[n0:y0] = -np.tile(zone_marginals(wF, J), Z)
+    c[s0:] = COVERAGE_PENALTY
+
+    rows, cols, vals, lo, hi = [], [], [], [], []
+    r = 0
+
+    def add(idx, coef, lower, upper):
+        nonlocal r
+        idx = np.asarray(idx)
+        rows.append(np.full(len(idx), r))
+        cols.append(idx)
+        vals.append(np.broadcast_to(np.asarray(coef, dtype=float), idx.shape))
+        lo.append(lower)
+        hi.append(upper)
+        r += 1
+
+    xi = np.arange(nx)
+
+    # Phase budgets
+    for p in range(P):
+        m = xp == p
+        add(xi[m], cost[xt[m]], -np.inf, phase_budget[p])
+
+    # Per-zone actions per phase + coverage indicators
+    pz = xp * Z + xz
+    order = np.argsort(pz, kind="stable")
+    starts = np.searchsorted(pz[order], np.arange(P * Z + 1))
+    for p in range(P):
+        for z in range(Z):
+            k = p * Z + z
+            members = xi[order[starts[k]:starts[k + 1]]]
+            add(members, 1.0, -np.inf, MAX_ACTIONS_PER_ZONE_PER_PHASE[p])
+            # y[p, z] <= sum_t x[p, z, t]
+            add(np.append(members, y0 + k), np.append(-np.ones(len(members)), 1.0), -np.inf, 0.0)
+
+        # sum_z y[p, z] + s[p] >= target
+        add(np.append(y0 + p * Z + np.arange(Z), s0 + p), 1.0, target[p], np.inf)
+
+    # One action per (zone, type) across all phases
+    if MAX_REPEAT_SAME_TYPE_IN_ZONE_TOTAL <= 1:
+        zt = xz * T + xt
+        order = np.argsort(zt, kind="stable")
+        starts = np.searchsorted(zt[order], np.arange(Z * T + 1))
+        for k in range(Z * T):
+            members = xi[order[starts[k]:starts[k + 1]]]
+            if len(members) > 1:
+                add(members, 1.0, -np.inf, 1.0)
+
+    # Zone slots: sum_j n[z, j] == sum_{p,t} x[p, z, t]
+    order = np.argsort(xz, kind="stable")
+    starts = np.searchsorted(xz[order], np.arange(Z + 1))
+    for z in range(Z):
+        members = xi[order[starts[z]:starts[z + 1]]]
+        slots = n0 + z * J + np.arange(J)
+        add(np.concatenate([members, slots]), np.concatenate([np.ones(len(members)), -np.ones(J)]), 0.0, 0.0)
+
+    A = coo_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(r, nvar)
+    ).tocsr()
+
+    integrality = np.ones(nvar)
+    integrality[s0:] = 0
+    upper = np.ones(nvar)
+    upper[s0:] = np.inf
+
+    res = milp(
+        c,
+        constraints=LinearConstraint(A, lo, hi),
+        integrality=integrality,
+        bounds=Bounds(np.zeros(nvar), upper),
+        options={"time_limit": time_limit},
+    )
+
+    if res.x is None:
+        phases, plan_df = generate_plan(df_in, types, total_budget_m, horizon_m, weights, project_meta=project_meta)
+        return phases, plan_df, {"engine": "greedy", "fallback": True, "status": res.message}
+
+    x = res.x[:nx] > 0.5
+
+    # -------------------------------------------------
+    # Decode into generate_plan's phases / rows
+    # -------------------------------------------------
+    marg = zone_marginals(wF, J)
+    zone_total_count = np.zeros(Z, dtype=int)
+    phases = []
+    for p in range(P):
+        picked = np.flatnonzero(x & (xp == p))
+        picked = picked[np.argsort(-base[xz[picked], xt[picked]], kind="stable")]
+
+        picks = []
+        for i in picked:
+            z, k = xz[i], xt[i]
+            j = zone_total_count[z]
+            fairness_boost = wF * (1.0 / (1 + j))
+            penalty = ZONE_REPEAT_PENALTY * j + DIMINISHING_RETURNS * max(0, j - 1)
+
+            picks.append({
+                "Plan": "",
+                "Phase": PHASE_NAMES[p],
+                "Zone": zones[z],
+                "ProjectType": types[k],
+                "EstCost_M$": int(cand["cost"][k]),
+                "EstTime_wks": int(cand["ttime"][k]),
+                "NeedScore": round(float(need[z]), 3),
+                "Deficit": round(float(deficit[z, k]), 3),
+                "ImpactScore": round(float(impact[z, k]), 4),
+                "SpeedScore": round(float(speed[k]), 4),
+                "FairnessBoost": round(fairness_boost, 4),
+                "ZonePenalty": round(penalty, 4),
+                "FinalScore": round(float(base[z, k]) + marg[j], 4),
+            })
+            zone_total_count[z] += 1
+
+        spent = int(cost[xt[picked]].sum())
+        phases.append({
+            "name": PHASE_NAMES[p],
+            "budget": phase_budget[p],
+            "time": phase_time[p],
+            "actions": picks,
+            "remaining": phase_budget[p] - spent
+        })
+
+    plan_df = pd.DataFrame([a for ph in phases for a in ph["actions"]])
+    info = {
+        "engine": "exact",
+        "fallback": False,
+        "status": res.message,
+        "objective": plan_objective(plan_df, Z),
+        "coverage_shortfall": coverage_shortfall(plan_df, Z),
+        "mip_gap": getattr(res, "mip_gap", None),
+    }
+    return phases, plan_df, info
+
+
+# =========================================================
+# Engine selection
+# =========================================================
+def plan_with_engine(df_in, types, total_budget_m, horizon_m, weights, engine="greedy", time_limit=20.0,
+                     project_meta=None):
+    """
+    Run one planning engine on project_meta unit costs / times (default
+    PROJECT_META). With engine="exact" the greedy plan is also built (it
+    is cheap) and info reports greedy_gap, the amount by which the greedy
+    objective trails the exact one, relative to the larger of the two
+    magnitudes (objectives can be negative or near zero).
+    Returns:
+        phases, plan_df, info
+    """
+    if engine not in PLAN_ENGINES:
+        raise ValueError(f"Unknown plan engine '{engine}'. Choose from {PLAN_ENGINES}.")
+
+    greedy_phases, greedy_df = generate_plan(df_in, types, total_budget_m, horizon_m, weights, project_meta=project_meta)
+    greedy_obj = plan_objective(greedy_df, len(df_in))
+    greedy_info = {
+        "engine": "greedy",
+        "objective": greedy_obj,
+        "coverage_shortfall": coverage_shortfall(greedy_df, len(df_in)),
+    }
+
+    if engine == "greedy":
+        return greedy_phases, greedy_df, greedy_info
+
+    try:
+        phases, plan_df, info = generate_plan_exact(
+            df_in, types, total_budget_m, horizon_m, weights, time_limit, project_meta=project_meta
+        )
+    except ImportError:
+        # scipy.optimize.milp needs scipy >= 1.9
+        return greedy_phases, greedy_df, dict(greedy_info, fallback=True)
+
+    if info["fallback"]:
+        return phases, plan_df, dict(greedy_info, fallback=True, status=info["status"])
+
+    info["greedy_objective"] = greedy_obj
+    info["greedy_gap"] = (info["objective"] - greedy_obj) / max(1e-9, abs(info["objective"]), abs(greedy_obj))
+    return phases, plan_df, info
@@ -0,0 +1,166 @@
+# planning/pareto.py
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from planning.variants import PLAN_COLUMNS, evaluate_variants
+
+# compute_metrics columns and whether more ("max") or less ("min") is better
+PARETO_OBJECTIVES = {
+    "TotalImpact": "max",
+    "FairnessIndex": "max",
+    "AvgTime": "min",
+    "BudgetUsedPct": "min",
+}
+
+WEIGHT_KEYS = ["w_impact", "w_speed", "w_fair"]
+
+# (context, weights) -> metrics; plans are deterministic in their inputs
+_eval_cache = {}
+
+
+# =========================================================
+# Dominance
+# =========================================================
+def pareto_mask(values, senses):
+    """
+    Non-dominated rows of an (n x m) objective matrix.
+
+    senses is one "max" / "min" per column. A row is dominated when
+    another row is at least as good in every column and better in one.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+
+    sign = np.array([1.0 if s == "max" else -1.0 for s in senses])
+    V = values * sign
+
+    geq = (V[:, None, :] >= V[None, :, :]).all(axis=2)
+    gt = (V[:, None, :] > V[None, :, :]).any(axis=2)
+    dominated = (geq & gt).any(axis=0)
+    return ~dominated
+
+
+# =========================================================
+# Simplex sampling
+# =========================================================
+def simplex_lattice(divisions):
+    """All weight triples with coordinates in multiples of 1 / divisions."""
+    points = [
+        (i / divisions, j / divisions, (divisions - i - j) / divisions)
+        for i in range(divisions + 1)
+        for j in range(divisions + 1 - i)
+    ]
+    return np.array(points)
+
+
+def _key(w):
+    return tuple(np.round(w, 9))
+
+
+def _context_key(df_city, types, total_budget_m, horizon_m, engine):
+    digest = hashlib.sha1(
+        np.ascontiguousarray(df_city[PLAN_COLUMNS].to_numpy(dtype=float)).tobytes()
+        + "|".join(df_city["Zone"].astype(str)).encode()
+    ).hexdigest()
+    return (digest, tuple(types), total_budget_m, horizon_m, engine)
+
+
+def _evaluate(points, context, df_city, types, total_budget_m, horizon_m, engine, max_workers):
+    """Metrics for every weight point, running only the ones not cached yet."""
+    todo = [w for w in points if (context, _key(w)) not in _eval_cache]
+    variants = [
+        (f"w{i}", dict(zip(WEIGHT_KEYS, map(float, w))))
+        for i, w in enumerate(todo)
+    ]
+
+    for r in evaluate_variants(df_city, types, total_budget_m, horizon_m, variants,
+                               engine=engine, max_workers=max_workers):
+        _eval_cache[(context, _key(todo[r["index"]]))] = r["metrics"]
+
+    return len(todo)
+
+
+# =========================================================
+# Explorer
+# =========================================================
+def explore_pareto_front(df_city, types, total_budget_m, horizon_m, engine="greedy",
+                         initial_divisions=4, max_rounds=4, max_evals=200, gap_tol=0.05,
+                         objectives=None, max_workers=None):
+    """
+    Pareto front of plan metrics over the (impact, speed, fair) simplex.
+
+    Starts from a coarse simplex lattice, then refines adaptively: each
+    round evaluates the midpoints of neighbouring weight pairs that touch
+    the current front and whose (range-normalized) metrics differ by more
+    than gap_tol, halving the neighbour distance every round, until
+    max_evals new plan runs. Evaluations are cached across calls and run
+    through evaluate_variants (process pool for larger batches).
+    Returns:
+        DataFrame with the weights, compute_metrics columns, "pareto"
+        and "round" (0 = initial lattice)
+    """
+    objectives = objectives or PARETO_OBJECTIVES
+    cols, senses = list(objectives), list(objectives.values())
+    types = list(types)
+    context = _context_key(df_city, types, total_budget_m, horizon_m, engine)
+
+    points = simplex_lattice(initial_divisions)
+    found_round = {_key(w): 0 for w in points}
+    evals = _evaluate(points, context, df_city, types, total_budget_m, horizon_m, engine, max_workers)
+
+    step = 1.0 / initial_divisions
+    for round_idx in range(1, max_rounds + 1):
+        M = np.array([[_eval_cache[(context, _key(w))][c] for c in cols] for w in points], dtype=float)
+        span = M.max(axis=0) - M.min(axis=0)
+        M = M / np.where(span == 0, 1.0, span)
+        front = pareto_mask(M, senses)
+
+        # Neighbouring pairs (in weight space) with a gap on the front
+        dist = np.abs(points[:, None, :] - points[None, :, :]).max(axis=2)
+        near = (dist > 1e-12) & (dist <= step + 1e-9)
+        gap = np.abs(M[:, None, :] - M[None, :, :]).max(axis=2) > gap_tol
+        touches = front[:, None] | front[None, :]
+        i, j = np.nonzero(np.triu(near & gap & touches))
+
+        new = {}
+        for a, b in zip(i, j):
+            mid = (points[a] + points[b]) / 2
+            if _key(mid) not in found_round:
+                new.setdefault(_key(mid), mid)
+
+        new = list(new.values())[:max(0, max_evals - evals)]
+        if not new:
+            break
+        found_round.update((_key(w), round_idx) for w in new)
+
+        evals += _evaluate(new, context, df_city, types, total_budget_m, horizon_m, engine, max_workers)
+        points = np.vstack([points, new])
+        step /= 2
+
+    rows = []
+    for w in points:
+        rows.append({
+            **dict(zip(WEIGHT_KEYS, map(float, w))),
+            **_eval_cache[(context, _key(w))],
+            "round": found_round[_key(w)],
+        })
+
+    df = pd.DataFrame(rows)
+    df["pareto"] = pareto_mask(df[cols].to_numpy(), senses)
+    return df
+
+
+def pareto_front(df, objectives=None):
+    """Distinct non-dominated metric combinations (first weights for each)."""
+    objectives = objectives or PARETO_OBJECTIVES
+    front = df[df["pareto"]]
+    return front.drop_duplicates(subset=list(objectives)).reset_index(drop=True)
+
+
+def clear_pareto_cache():
+    _eval_cache.clear()
+
@@ -0,0 +1,255 @@
+# planning/planner.py
+
+import numpy as np
+import pandas as pd
+
+
+DEF_COL = {
+    "Housing": "HousingDef",
+    "Hospitals": "HospitalDef",
+    "Schools": "SchoolDef",
+    "Infrastructure": "InfraDef",
+    "Roads": "RoadDef",
+    "Water & Sanitation": "WaterSanDef",
+    "Power Grid": "PowerDef",
+    "Public Spaces": "PublicDef",
+}
+
+PROJECT_META = {
+    "Housing": {"unit_cost": 18, "unit_time": 10},
+    "Hospitals": {"unit_cost": 40, "unit_time": 16},
+    "Schools": {"unit_cost": 22, "unit_time": 12},
+    "Infrastructure": {"unit_cost": 30, "unit_time": 14},
+    "Roads": {"unit_cost": 16, "unit_time": 10},
+    "Water & Sanitation": {"unit_cost": 22, "unit_time": 12},
+    "Power Grid": {"unit_cost": 32, "unit_time": 14},
+    "Public Spaces": {"unit_cost": 10, "unit_time": 8},
+}
+
+# Phase structure and allocation rules (shared with planning.exact_planner)
+PHASE_ALLOWED = {
+    0: {"Housing", "Hospitals", "Water & Sanitation"},
+    1: {"Housing", "Hospitals", "Schools", "Roads", "Infrastructure", "Water & Sanitation"},
+    2: {"Schools", "Roads", "Infrastructure", "Power Grid", "Public Spaces", "Water & Sanitation"}
+}
+
+PHASE_SPLIT = [0.45, 0.35, 0.20]
+PHASE_NAMES = ["Phase 1 — Emergency Recovery", "Phase 2 — Core Services", "Phase 3 — Long-Term Urban Recovery"]
+
+MIN_ZONE_COVERAGE_RATIO = [0.65, 0.85, 1.00]
+MAX_ACTIONS_PER_ZONE_PER_PHASE = [2, 2, 2]
+MAX_REPEAT_SAME_TYPE_IN_ZONE_TOTAL = 1
+ZONE_REPEAT_PENALTY = 0.22
+DIMINISHING_RETURNS = 0.35
+
+# Projects may overrun the phase time window by this many weeks
+PHASE_TIME_SLACK = 8
+# Phase 1 only funds project types with at least this deficit
+EMERGENCY_MIN_DEFICIT = 0.35
+
+
+# =========================
+# Quantum-inspired planner (Top-K variants)
+# =========================
+def plan_variant_weights(name: str):
+    if name == "Plan A — Max Impact":
+        return {"w_impact": 0.70, "w_speed": 0.15, "w_fair": 0.15}
+    if name == "Plan C — Fairness First":
+        return {"w_impact": 0.45, "w_speed": 0.10, "w_fair": 0.45}
+    return {"w_impact": 0.55, "w_speed": 0.15, "w_fair": 0.30}
+
+def plan_candidates(df_in: pd.DataFrame, types: list, weights: dict, project_meta: dict = None):
+    """
+    Score every (zone, project type) pair as one (zones x types) grid.
+
+    Types not in DEF_COL are dropped; unit costs / times come from
+    project_meta (default PROJECT_META). Returns a dict of grids (impact,
+    deficit, base_score), per-zone / per-type vectors and "order": flat
+    indices into the grid by descending base_score, ties in zone-then-type
+    order (same ranking as a stable sort of the row-by-row candidate list).
+    """
+    types = [t for t in types if t in DEF_COL]
+    wI, wS = weights["w_impact"], weights["w_speed"]
+    project_meta = PROJECT_META if project_meta is None else project_meta
+
+    need = df_in["NeedScore"].to_numpy(dtype=float)
+    popw = df_in["PopW"].to_numpy(dtype=float)
+    if types:
+        deficit = np.column_stack([df_in[DEF_COL[t]].to_numpy(dtype=float) for t in types])
+    else:
+        deficit = np.zeros((len(df_in), 0))
+
+    cost = np.array([project_meta[t]["unit_cost"] for t in types], dtype=int)
+    ttime = np.array([project_meta[t]["unit_time"] for t in types], dtype=int)
+
+    impact = need[:, None] * deficit * (0.55 + 0.45 * popw)[:, None]
+    speed = 1.0 / np.maximum(1.0, ttime)
+    base_score = (wI * impact) + (wS * speed)
+
+    return {
+        "zones": df_in["Zone"].tolist(),
+        "types": types,
+        "need": need,
+        "deficit": deficit,
+        "impact": impact,
+        "speed": speed,
+        "base_score": base_score,
+        "cost": cost,
+        "ttime": ttime,
+        "order": np.argsort(-base_score, axis=None, kind="stable"),
+    }
+
+
+def phase_eligible(cand: dict, p_idx: int, horizon_m: int):
+    """
+    (zones x types) mask of candidates phase p_idx may fund at all:
+    PHASE_ALLOWED, the phase time window and the Phase 1 deficit floor.
+    """
+    phase_time = int(horizon_m * PHASE_SPLIT[p_idx])
+    type_ok = np.array(
+        [t in PHASE_ALLOWED[p_idx] for t in cand["types"]], dtype=bool
+    ) & (cand["ttime"] <= phase_time + PHASE_TIME_SLACK)
+
+    ok = np.broadcast_to(type_ok, cand["deficit"].shape)
+    if p_idx == 0:
+        ok = ok & (cand["deficit"] >= EMERGENCY_MIN_DEFICIT)
+    return ok
+
+
+def generate_plan(df_in: pd.DataFrame, types: list, total_budget_m: int, horizon_m: int, weights: dict,
+                  project_meta: dict = None):
+    dfp = df_in.copy()
+    wF = weights["w_fair"]
+    phase_split = PHASE_SPLIT
+    phase_names = PHASE_NAMES
+
+    zone_total_count = {z: 0 for z in dfp["Zone"].tolist()}
+    zone_phase_count = {z: 0 for z in dfp["Zone"].tolist()}
+    zone_type_used_total = set()
+
+    cand = plan_candidates(dfp, types, weights, project_meta)
+    n_types = len(cand["types"])
+
+    phases = []
+    for p_idx, p_ratio in enumerate(phase_split):
+        phase_budget = int(total_budget_m * p_ratio)
+        phase_time = int(horizon_m * p_ratio)
+        local_budget = phase_budget
+
+        for z in zone_phase_count:
+            zone_phase_count[z] = 0
+
+        picks = []
+        covered = set()
+        target_cover = int(np.ceil(len(dfp) * MIN_ZONE_COVERAGE_RATIO[p_idx]))
+
+        # Ranked candidates this phase may fund (allowed type, time window, deficit floor)
+        eligible = phase_eligible(cand, p_idx, horizon_m).ravel()[cand["order"]]
+        flat = cand["order"][eligible]
+        zi, ti = np.divmod(flat, n_types)
+        candidates = list(zip(
+            cand["base_score"].ravel()[flat].tolist(),
+            cand["impact"].ravel()[flat].tolist(),
+            cand["speed"][ti].tolist(),
+            [cand["zones"][z] for z in zi],
+            [cand["types"][t] for t in ti],
+            cand["cost"][ti].tolist(),
+            cand["ttime"][ti].tolist(),
+            cand["deficit"].ravel()[flat].tolist(),
+            cand["need"][zi].tolist(),
+        ))
+
+        def try_pick(pass_mode="coverage"):
+            nonlocal local_budget, picks, covered
+
+            for base_score, impact, speed, zone, t, cost, ttime, deficit, need in candidates:
+                if local_budget <= 0:
+                    break
+                if cost > local_budget:
+                    continue
+
+                if (zone, t) in zone_type_used_total and MAX_REPEAT_SAME_TYPE_IN_ZONE_TOTAL <= 1:
+                    continue
+
+                if zone_phase_count[zone] >= MAX_ACTIONS_PER_ZONE_PER_PHASE[p_idx]:
+                    continue
+
+                if pass_mode == "coverage" and zone in covered:
+                    continue
+
+                fairness_boost = wF * (1.0 / (1 + zone_total_count[zone]))
+                repeat_penalty = ZONE_REPEAT_PENALTY * zone_total_count[zone]
+                dim_penalty = DIMINISHING_RETURNS * max(0, zone_total_count[zone] - 1)
+
+                final_score = base_score + fairness_boost - repeat_penalty - dim_penalty
+
+                picks.append({
+                    "Plan": "",
+                    "Phase": phase_names[p_idx],
+                    "Zone": zone,
+                    "ProjectType": t,
+                    "EstCost_M$": cost,
+                    "EstTime_wks": ttime,
+                    "NeedScore": round(need, 3),
+                    "Deficit": round(deficit, 3),
+                    "ImpactScore": round(impact, 4),
+                    "SpeedScore": round(speed, 4),
+                    "FairnessBoost": round(fairness_boost, 4),
+                    "ZonePenalty": round(repeat_penalty + dim_penalty, 4),
+                    "FinalScore": round(final_score, 4),
+                })
+
+                covered.add(zone)
+                zone_total_count[zone] += 1
+                zone_phase_count[zone] += 1
+                zone_type_used_total.add((zone, t))
+                local_budget -= cost
+
+                if pass_mode == "coverage" and len(covered) >= target_cover:
+                    break
+
+        try_pick("coverage")
+        try_pick("fill")
+
+        phases.append({
+            "name": phase_names[p_idx],
+            "budget": phase_budget,
+            "time": phase_time,
+            "actions": picks,
+            "remaining": local_budget
+        })
+
+    plan_df = pd.DataFrame([a for ph in phases for a in ph["actions"]])
+    return phases, plan_df
+
+def compute_metrics(plan_df: pd.DataFrame, total_budget_m: int):
+    if plan_df.empty:
+        return {
+            "TotalImpact": 0.0,
+            "ZonesCovered": 0,
+            "TotalCost": 0,
+            "BudgetUsedPct": 0.0,
+            "FairnessIndex": 0.0,
+            "AvgTime": 0.0,
+        }
+    total_impact = float(plan_df["ImpactScore"].sum())
+    zones_covered = int(plan_df["Zone"].nunique())
+    total_cost = int(plan_df["EstCost_M$"].sum())
+    budget_used_pct = 100.0 * total_cost / max(1, total_budget_m)
+
+    counts = plan_df["Zone"].value_counts().values
+    if len(counts) <= 1:
+        fairness = 1.0
+    else:
+        fairness = float(1.0 - (np.std(counts) / max(1e-9, np.mean(counts))))
+        fairness = float(np.clip(fairness, 0, 1))
+
+    avg_time = float(plan_df["EstTime_wks"].mean())
+    return {
+        "TotalImpact": round(total_impact, 4),
+        "ZonesCovered": zones_covered,
+        "TotalCost": total_cost,
+        "BudgetUsedPct": round(budget_used_pct, 1),
+        "FairnessIndex": round(fairness, 3),
+        "AvgTime": round(avg_time, 2),
+    }
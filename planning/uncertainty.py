@@ -0,0 +1,369 @@
+# planning/uncertainty.py
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from planning.planner import DEF_COL, PHASE_NAMES, PROJECT_META, compute_metrics, generate_plan
+from planning.variants import PLAN_COLUMNS
+from planning.zone_model import build_city_model, build_city_panel
+from quantum.impact_scoring import IMPACT_FEATURES, ImpactScorer
+from quantum.qubo import KnapsackQubo
+from quantum.solvers import MAX_BATCH_EXACT_ROADS, SOLVERS, solve_anneal_batch, solve_exact_batch, solve_roads
+
+# Relative standard deviation of each input (mean-one log-normal factors)
+DEFAULT_UNCERTAINTY = {
+    # zones_data
+    "DamagePct": 0.10,
+    "Population": 0.10,
+    "DisplacedRatio": 0.15,
+    # PROJECT_META
+    "unit_cost": 0.20,
+    "unit_time": 0.15,
+    # road inventory
+    "damage": 0.10,
+    "final_cost": 0.20,
+}
+
+# Perturbed zone columns and their valid range
+ZONE_BOUNDS = {
+    "DamagePct": (0, 100),
+    "Population": (1, None),
+    "DisplacedRatio": (0, 1),
+}
+
+ROAD_METRICS = ["RoadImpact", "RoadCost", "RoadsSelected"]
+
+# QUBO backend of road_solver="auto" above MAX_BATCH_EXACT_ROADS roads
+# (knapsack_dp would switch the objective away from QUBO energy)
+AUTO_ROAD_SOLVER = "anneal_batch"
+# Road solvers that take a whole chunk of scenarios in one call
+BATCH_ROAD_SOLVERS = ("exact_batch", "anneal_batch")
+# Stochastic backends; they get one seed per scenario from the chunk seed
+SEEDED_ROAD_SOLVERS = ("anneal", "tabu")
+
+# Scenarios per task; chunk seeds are fixed, so results do not depend on max_workers
+SCENARIO_CHUNK = 250
+# Below this many chunks a process pool costs more than it saves
+MIN_PARALLEL_CHUNKS = 2
+
+# Context of a pool worker, sent once per process
+_worker = {}
+
+
+def _factors(rng, sigma, size):
+    return np.exp(sigma * rng.standard_normal(size) - sigma ** 2 / 2)
+
+
+def _phase_label(name):
+    return name.split(" — ")[0]
+
+
+# =========================================================
+# Context (nominal inputs, scored once)
+# =========================================================
+def _pick_matrix(phases, zone_index, type_index):
+    """(phases x zones x types) bool matrix of the actions in a plan."""
+    picked = np.zeros((len(PHASE_NAMES), len(zone_index), len(type_index)), dtype=bool)
+    for p, ph in enumerate(phases):
+        for a in ph["actions"]:
+            picked[p, zone_index[a["Zone"]], type_index[a["ProjectType"]]] = True
+    return picked
+
+
+def _solve_road_batch(road, impacts, costs, rng):
+    """Selection matrix (scenarios x roads) for stacked impacts / costs."""
+    if road["solver"] == "exact_batch":
+        X, _energies = solve_exact_batch(impacts, costs, road["budget"], road["lambda"])
+        return X
+    if road["solver"] == "anneal_batch":
+        X, _energies = solve_anneal_batch(
+            impacts, costs, road["budget"], road["lambda"],
+            **road["options"],
+            seed=int(rng.integers(2 ** 32))
+        )
+        return X
+
+    seeded = road["solver"] in SEEDED_ROAD_SOLVERS
+    seeds = rng.integers(2 ** 32, size=len(impacts)) if seeded else [None] * len(impacts)
+    return np.array([
+        solve_roads(
+            KnapsackQubo(i, c, road["budget"], road["lambda"]),
+            road["solver"],
+            **road["options"],
+            **({"seed": int(seed)} if seeded else {})
+        )["x"]
+        for i, c, seed in zip(impacts, costs, seeds)
+    ], dtype=np.uint8)
+
+
+def _road_metrics(impacts, costs, X):
+    return pd.DataFrame({
+        "RoadImpact": (impacts * X).sum(axis=1).round(4),
+        "RoadCost": (costs * X).sum(axis=1).round(2),
+        "RoadsSelected": X.sum(axis=1).astype(int),
+    })
+
+
+def uncertainty_context(df_zones, types, total_budget_m, horizon_m, weights,
+                        roads=None, road_weights=None, road_budget=6, road_lambda=12,
+                        road_solver="auto", road_options=None, uncertainty=None):
+    """
+    Nominal inputs of a Monte Carlo study, prepared once.
+
+    df_zones is the raw zone table (load_zone_data), roads an optional
+    feature-engineered road table or RoadSet; its impacts are scored
+    once with ImpactScorer and scenarios only shift the damage term.
+    road_solver is "auto" (batched exact enumeration up to
+    MAX_BATCH_EXACT_ROADS roads, AUTO_ROAD_SOLVER above, so scenarios
+    always minimize the QUBO energy), "exact_batch", "anneal_batch"
+    (one solve_anneal_batch call per chunk; road_options go to it) or
+    any SOLVERS backend run once per scenario with road_options. The
+    per-scenario backends are far slower on large studies. knapsack_dp
+    maximizes impact under a hard budget instead, so its frequencies are
+    not comparable to the QUBO backends'. The backend used is reported
+    as road_solver by summarize_scenarios.
+    Returns:
+        context dict for simulate_scenarios / summarize_scenarios
+    """
+    types = [t for t in types if t in DEF_COL]
+    zones = df_zones["Zone"].tolist()
+    uncertainty = {**DEFAULT_UNCERTAINTY, **(uncertainty or {})}
+
+    ctx = {
+        "df_zones": df_zones.reset_index(drop=True),
+        "zones": zones,
+        "types": types,
+        "total_budget_m": total_budget_m,
+        "horizon_m": horizon_m,
+        "weights": weights,
+        "uncertainty": uncertainty,
+        "zone_index": {z: i for i, z in enumerate(zones)},
+        "type_index": {t: k for k, t in enumerate(types)},
+    }
+
+    phases, plan_df = generate_plan(build_city_model(df_zones), types, total_budget_m, horizon_m, weights)
+    ctx["nominal_picks"] = _pick_matrix(phases, ctx["zone_index"], ctx["type_index"])
+    ctx["nominal_metrics"] = compute_metrics(plan_df, total_budget_m)
+
+    ctx["road"] = None
+    if roads is not None:
+        if road_solver == "auto":
+            road_solver = "exact_batch" if len(roads) <= MAX_BATCH_EXACT_ROADS else AUTO_ROAD_SOLVER
+        if road_solver not in BATCH_ROAD_SOLVERS and road_solver not in SOLVERS:
+            raise ValueError(f"Unknown road solver '{road_solver}'. Choose from {['auto', *BATCH_ROAD_SOLVERS] + sorted(SOLVERS)}.")
+
+        scorer = ImpactScorer.from_dataframe(roads)
+        d = IMPACT_FEATURES.index("damage")
+        span = scorer.stats["max"][d] - scorer.stats["min"][d]
+
+        road = {
+            "budget": road_budget,
+            "lambda": road_lambda,
+            "solver": road_solver,
+            "options": dict(road_options or {}),
+            "impact": scorer.score(road_weights),
+            "cost": np.asarray(roads["final_cost"], dtype=float),
+            "damage": np.asarray(roads["damage"], dtype=float),
+            # d impact / d damage with the nominal normalization held fixed
+            "damage_slope": road_weights["damage"] * scorer.land_use_factor / (span if span else 1.0),
+            "labels": {
+                c: np.asarray(roads[c]).tolist()
+                for c in ["id", "zone", "road_name"] if c in roads
+            },
+        }
+        # Fixed seed: the nominal selection does not depend on the study seed
+        road["nominal_x"] = _solve_road_batch(
+            road, road["impact"][None, :], road["cost"][None, :], np.random.default_rng(0)
+        )[0]
+        ctx["road"] = road
+        ctx["nominal_metrics"].update(
+            _road_metrics(road["impact"][None, :], road["cost"][None, :], road["nominal_x"][None, :]).iloc[0].to_dict()
+        )
+
+    return ctx
+
+
+# =========================================================
+# Scenarios
+# =========================================================
+def _simulate_chunk(ctx, index, seed, size):
+    rng = np.random.default_rng(seed)
+    unc = ctx["uncertainty"]
+    df_zones, zones, types = ctx["df_zones"], ctx["zones"], ctx["types"]
+    total_budget_m = ctx["total_budget_m"]
+
+    # -------------------------------------------------
+    # Zones: perturbed raw columns -> one batched city model
+    # -------------------------------------------------
+    scenarios = {}
+    for col, (lo, hi) in ZONE_BOUNDS.items():
+        values = df_zones[col].to_numpy(dtype=float) * _factors(rng, unc[col], (size, len(zones)))
+        values = np.clip(values, lo, hi)
+        scenarios[col] = np.rint(values).astype(int) if col == "Population" else values
+
+    panel = build_city_panel(df_zones, scenarios)
+    plan_values = {c: panel[c].to_numpy() for c in PLAN_COLUMNS}
+
+    # -------------------------------------------------
+    # Project unit costs / times (whole M$ and weeks)
+    # -------------------------------------------------
+    cost = np.array([PROJECT_META[t]["unit_cost"] for t in types], dtype=float)
+    ttime = np.array([PROJECT_META[t]["unit_time"] for t in types], dtype=float)
+    cost = np.maximum(1, np.rint(cost * _factors(rng, unc["unit_cost"], (size, len(types))))).astype(int)
+    ttime = np.maximum(1, np.rint(ttime * _factors(rng, unc["unit_time"], (size, len(types))))).astype(int)
+
+    phase_counts = np.zeros(ctx["nominal_picks"].shape, dtype=np.int64)
+    action_counts = np.zeros(ctx["nominal_picks"].shape[1:], dtype=np.int64)
+    metrics = []
+    for s in range(size):
+        df_s = pd.DataFrame({"Zone": zones, **{c: v[:, s] for c, v in plan_values.items()}})
+        meta = {t: {"unit_cost": int(cost[s, k]), "unit_time": int(ttime[s, k])} for k, t in enumerate(types)}
+
+        phases, plan_df = generate_plan(df_s, types, total_budget_m, ctx["horizon_m"], ctx["weights"], project_meta=meta)
+        picked = _pick_matrix(phases, ctx["zone_index"], ctx["type_index"])
+        phase_counts += picked
+        action_counts += picked.any(axis=0)
+        metrics.append(compute_metrics(plan_df, total_budget_m))
+
+    out = {
+        "index": index,
+        "size": size,
+        "phase_counts": phase_counts,
+        "action_counts": action_counts,
+        "metrics": pd.DataFrame(metrics),
+    }
+
+    # -------------------------------------------------
+    # Roads: perturbed damage / cost -> batched QUBO solve
+    # -------------------------------------------------
+    road = ctx["road"]
+    if road is not None:
+        n = len(road["impact"])
+        damage = np.clip(road["damage"] * _factors(rng, unc["damage"], (size, n)), 0, 1)
+        impacts = road["impact"] + (damage - road["damage"]) * road["damage_slope"]
+        costs = road["cost"] * _factors(rng, unc["final_cost"], (size, n))
+
+        X = _solve_road_batch(road, impacts, costs, rng)
+        out["road_counts"] = X.sum(axis=0, dtype=np.int64)
+        out["metrics"] = pd.concat([out["metrics"], _road_metrics(impacts, costs, X)], axis=1)
+
+    return out
+
+
+def _init_worker(ctx):
+    _worker["ctx"] = ctx
+
+
+def _simulate_chunk_in_worker(job):
+    return _simulate_chunk(_worker["ctx"], *job)
+
+
+def simulate_scenarios(ctx, n_scenarios, seed=0, max_workers=None):
+    """
+    Sample and plan n_scenarios perturbed scenarios in chunks of
+    SCENARIO_CHUNK (one city-model panel and one road batch per chunk).
+
+    Each chunk has its own seed from SeedSequence(seed), so the results
+    are the same for any max_workers. With at least MIN_PARALLEL_CHUNKS
+    chunks (and max_workers != 1) chunks run in a process pool.
+    Yields:
+        chunk dicts (index, size, counts, per-scenario metrics) in
+        completion order, so callers can report progress
+    """
+    sizes = [min(SCENARIO_CHUNK, n_scenarios - i) for i in range(0, n_scenarios, SCENARIO_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = list(zip(range(len(sizes)), seeds, sizes))
+
+    if max_workers == 1 or len(jobs) < MIN_PARALLEL_CHUNKS:
+        for job in jobs:
+            yield _simulate_chunk(ctx, *job)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(ctx,)) as pool:
+        futures = [pool.submit(_simulate_chunk_in_worker, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# =========================================================
+# Summary
+# =========================================================
+def summarize_scenarios(ctx, chunks, ci=0.90):
+    """
+    Stability report over simulated chunks.
+    Returns:
+        dict with n_scenarios, ci, road_solver (None without roads) and DataFrames:
+        actions   (zone, type) selection frequency, overall and per phase
+        metrics   nominal value, mean, std and central ci interval per metric
+        roads     per-road selection frequency (None without roads)
+        scenarios per-scenario metrics
+    """
+    chunks = sorted(chunks, key=lambda c: c["index"])
+    n = sum(c["size"] for c in chunks)
+    if n == 0:
+        raise ValueError("No scenarios to summarize.")
+
+    phase_counts = sum(c["phase_counts"] for c in chunks)
+    action_counts = sum(c["action_counts"] for c in chunks)
+    nominal = ctx["nominal_picks"]
+    nominal_any = nominal.any(axis=0)
+
+    rows = []
+    for z, zone in enumerate(ctx["zones"]):
+        for k, t in enumerate(ctx["types"]):
+            if action_counts[z, k] == 0 and not nominal_any[z, k]:
+                continue
+            freq = action_counts[z, k] / n
+            row = {
+                "Zone": zone,
+                "ProjectType": t,
+                "Frequency": round(freq, 4),
+                "StdErr": round(float(np.sqrt(freq * (1 - freq) / n)), 4),
+            }
+            for p, name in enumerate(PHASE_NAMES):
+                row[_phase_label(name)] = round(phase_counts[p, z, k] / n, 4)
+            row["InNominal"] = bool(nominal_any[z, k])
+            row["NominalPhase"] = _phase_label(PHASE_NAMES[int(np.argmax(nominal[:, z, k]))]) if nominal_any[z, k] else ""
+            rows.append(row)
+
+    actions = pd.DataFrame(rows)
+    if not actions.empty:
+        actions = actions.sort_values("Frequency", ascending=False, kind="stable").reset_index(drop=True)
+
+    scenarios = pd.concat([c["metrics"] for c in chunks], ignore_index=True)
+    lo, hi = (1 - ci) / 2, 1 - (1 - ci) / 2
+    metrics = pd.DataFrame({
+        "Nominal": pd.Series(ctx["nominal_metrics"]),
+        "Mean": scenarios.mean(),
+        "Std": scenarios.std(),
+        "CI_Low": scenarios.quantile(lo),
+        "CI_High": scenarios.quantile(hi),
+    }).loc[list(scenarios.columns)].astype(float).round(4)
+
+    roads = None
+    road = ctx["road"]
+    if road is not None:
+        freq = sum(c["road_counts"] for c in chunks) / n
+        roads = pd.DataFrame({
+            **road["labels"],
+            "Frequency": freq.round(4),
+            "StdErr": np.sqrt(freq * (1 - freq) / n).round(4),
+            "InNominal": road["nominal_x"].astype(bool),
+        }).sort_values("Frequency", ascending=False, kind="stable").reset_index(drop=True)
+
+    return {
+        "n_scenarios": n,
+        "ci": ci,
+        "road_solver": road["solver"] if road is not None else None,
+        "actions": actions,
+        "metrics": metrics,
+        "roads": roads,
+        "scenarios": scenarios,
+    }
+
+
+def run_monte_carlo(ctx, n_scenarios, seed=0, ci=0.90, max_workers=None):
+    """simulate_scenarios + summarize_scenarios in one call."""
+    return summarize_scenarios(ctx, simulate_scenarios(ctx, n_scenarios, seed, max_workers), ci)
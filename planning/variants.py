@@ -0,0 +1,155 @@
+# planning/variants.py
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from planning.exact_planner import plan_with_engine
+from planning.planner import DEF_COL, compute_metrics, plan_variant_weights
+
+# Below this many variants a process pool costs more than it saves
+MIN_PARALLEL_VARIANTS = 8
+
+# Zone columns generate_plan reads (besides Zone)
+PLAN_COLUMNS = ["NeedScore", "PopW"] + list(DEF_COL.values())
+
+# Zone table of a pool worker, attached from shared memory once per process
+_worker = {}
+
+
+# =========================================================
+# Variant weights
+# =========================================================
+def named_variants(names):
+    """[(name, weights)] for the built-in Plan A / B / C strategies."""
+    return [(name, plan_variant_weights(name)) for name in names]
+
+
+def sample_variants(k, seed=None, concentration=1.0, prefix="Sample"):
+    """
+    k random (w_impact, w_speed, w_fair) triples from a symmetric
+    Dirichlet; concentration > 1 pulls them toward equal weights.
+    """
+    W = np.random.default_rng(seed).dirichlet(np.full(3, concentration), size=k)
+    return [
+        (f"{prefix} {i + 1:03d}", {"w_impact": float(a), "w_speed": float(b), "w_fair": float(c)})
+        for i, (a, b, c) in enumerate(W)
+    ]
+
+
+def parse_variants(text, prefix="Custom"):
+    """
+    User-defined variants, one "impact, speed, fair" triple per line.
+    Triples are normalized to sum to 1; blank lines are skipped.
+    """
+    variants = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        values = [float(v) for v in line.replace(";", ",").split(",")]
+        if len(values) != 3 or min(values) < 0 or sum(values) <= 0:
+            raise ValueError(f"Expected three non-negative weights 'impact, speed, fair', got '{line}'.")
+        a, b, c = np.asarray(values) / sum(values)
+        variants.append((
+            f"{prefix} {len(variants) + 1:03d}",
+            {"w_impact": float(a), "w_speed": float(b), "w_fair": float(c)}
+        ))
+    return variants
+
+
+# =========================================================
+# Shared zone table
+# =========================================================
+def _init_worker(shm_name, shape, zones, columns):
+    # Pool workers share the parent's resource tracker; the parent unlinks the block
+    shm = shared_memory.SharedMemory(name=shm_name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    df = pd.DataFrame(values, columns=columns, copy=False)
+    df.insert(0, "Zone", zones)
+
+    _worker["shm"] = shm
+    _worker["df_city"] = df
+
+
+def _evaluate(df_city, job):
+    index, name, weights, types, total_budget_m, horizon_m, engine = job
+    phases, plan_df, info = plan_with_engine(df_city, types, total_budget_m, horizon_m, weights, engine=engine)
+    if not plan_df.empty:
+        plan_df["Plan"] = name
+    metrics = compute_metrics(plan_df, total_budget_m)
+    return {
+        "index": index,
+        "name": name,
+        "weights": weights,
+        "phases": phases,
+        "df": plan_df,
+        "metrics": metrics,
+        "info": info,
+    }
+
+
+def _evaluate_in_worker(job):
+    return _evaluate(_worker["df_city"], job)
+
+
+# =========================================================
+# Evaluation
+# =========================================================
+def evaluate_variants(df_city, types, total_budget_m, horizon_m, variants,
+                      engine="greedy", max_workers=None):
+    """
+    Generate and score one plan per (name, weights) variant.
+
+    With at least MIN_PARALLEL_VARIANTS variants (and max_workers != 1)
+    plans are built in a process pool; the numeric zone columns are put
+    in one shared-memory block that every worker maps instead of
+    receiving a pickled copy per task.
+    Yields:
+        result dicts (index, name, weights, phases, df, metrics, info)
+        in completion order, so callers can stream them into a table
+    """
+    jobs = [
+        (i, name, weights, list(types), total_budget_m, horizon_m, engine)
+        for i, (name, weights) in enumerate(variants)
+    ]
+
+    if max_workers == 1 or len(jobs) < MIN_PARALLEL_VARIANTS:
+        for job in jobs:
+            yield _evaluate(df_city, job)
+        return
+
+    values = np.ascontiguousarray(df_city[PLAN_COLUMNS].to_numpy(dtype=np.float64))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shm.name, values.shape, df_city["Zone"].tolist(), PLAN_COLUMNS),
+        ) as pool:
+            futures = [pool.submit(_evaluate_in_worker, job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def variants_table(results):
+    """Comparison table (one row per result), in variant order."""
+    rows = []
+    for r in sorted(results, key=lambda r: r["index"]):
+        w = r["weights"]
+        rows.append({
+            "Plan": r["name"],
+            "Weights": f"I:{w['w_impact']:.2f}  S:{w['w_speed']:.2f}  F:{w['w_fair']:.2f}",
+            **r["metrics"],
+            "Engine": r["info"]["engine"],
+            "Objective": round(r["info"]["objective"], 4),
+            "GreedyGapPct": round(100 * r["info"]["greedy_gap"], 2) if "greedy_gap" in r["info"] else None,
+        })
+    return pd.DataFrame(rows)
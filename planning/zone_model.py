@@ -0,0 +1,184 @@
+# planning/zone_model.py
+
+import numpy as np
+import pandas as pd
+
+
+# Gaza Zones (approx realistic)
+ZONES_DATA = [
+    ["Gaza City",      650000, 85, 5, 0.55],
+    ["North Gaza",     350000, 80, 4, 0.60],
+    ["Jabalia Camp",   120000, 90, 2, 0.70],
+    ["Deir al-Balah",  300000, 70, 3, 0.45],
+    ["Nuseirat Camp",   90000, 88, 2, 0.65],
+    ["Khan Younis",    430000, 75, 4, 0.50],
+    ["Rafah",          280000, 65, 3, 0.40],
+    ["Bureij Camp",     75000, 85, 2, 0.60],
+]
+
+ZONE_COLUMNS = ["Zone", "Population", "DamagePct", "ServiceAvail", "DisplacedRatio"]
+
+# Planning Assumptions (per-capita targets)
+TARGETS = {
+    "HospitalsPer100k": 1.0,
+    "SchoolsPer50k": 4.0,
+    "HousingUnitsPerPerson": 1/5
+}
+
+BASE_COUNTS = {
+    "Gaza City":     {"Hospitals": 6, "Schools": 55, "HousingUnits": 110000, "RoadIndex": 0.55},
+    "North Gaza":    {"Hospitals": 3, "Schools": 28, "HousingUnits": 55000,  "RoadIndex": 0.50},
+    "Jabalia Camp":  {"Hospitals": 1, "Schools": 12, "HousingUnits": 18000,  "RoadIndex": 0.40},
+    "Deir al-Balah": {"Hospitals": 2, "Schools": 24, "HousingUnits": 52000,  "RoadIndex": 0.52},
+    "Nuseirat Camp": {"Hospitals": 1, "Schools": 10, "HousingUnits": 15000,  "RoadIndex": 0.42},
+    "Khan Younis":   {"Hospitals": 4, "Schools": 36, "HousingUnits": 72000,  "RoadIndex": 0.54},
+    "Rafah":         {"Hospitals": 2, "Schools": 22, "HousingUnits": 47000,  "RoadIndex": 0.50},
+    "Bureij Camp":   {"Hospitals": 1, "Schools": 8,  "HousingUnits": 12000,  "RoadIndex": 0.40},
+}
+
+
+def load_zone_data(zones_data=None, base_counts=None):
+    """
+    Raw zone table: zones_data rows joined with their BASE_COUNTS.
+
+    Same columns as quantum.synthetic.generate_zone_data, so synthetic
+    zone tables can be passed to build_city_model directly.
+    """
+    zones_data = ZONES_DATA if zones_data is None else zones_data
+    base_counts = BASE_COUNTS if base_counts is None else base_counts
+
+    df_city = pd.DataFrame(zones_data, columns=ZONE_COLUMNS)
+
+    # One vectorized lookup instead of a Python lambda per zone and column
+    base = pd.DataFrame.from_dict(base_counts, orient="index").reindex(df_city["Zone"])
+    for col in ["Hospitals", "Schools", "HousingUnits", "RoadIndex"]:
+        if base[col].isna().any():
+            missing = df_city["Zone"][base[col].isna().to_numpy()].tolist()
+            raise KeyError(f"No base counts for zones {missing}.")
+        df_city[f"{col}_Base"] = base[col].to_numpy()
+
+    return df_city
+
+
+def norm_series(s):
+    # Column-wise on a (zones x scenarios) frame, see build_city_panel
+    mx = np.maximum(1.0, s.max())
+    return (s / mx).clip(0,1)
+
+
+# =========================================================
+# Derived columns (dependency graph, in build order)
+# =========================================================
+def _targets(df):
+    return {
+        "Hospitals_Target": np.ceil((df["Population"]/100000) * TARGETS["HospitalsPer100k"]).astype(int),
+        "Schools_Target": np.ceil((df["Population"]/50000) * TARGETS["SchoolsPer50k"]).astype(int),
+        "HousingUnits_Target": np.ceil(df["Population"] * TARGETS["HousingUnitsPerPerson"]).astype(int),
+    }
+
+
+def _shortages_pre(df):
+    return {
+        "Hospitals_Shortage_Pre": (df["Hospitals_Target"] - df["Hospitals_Base"]).clip(lower=0),
+        "Schools_Shortage_Pre": (df["Schools_Target"] - df["Schools_Base"]).clip(lower=0),
+        "Housing_Shortage_Pre": (df["HousingUnits_Target"] - df["HousingUnits_Base"]).clip(lower=0),
+    }
+
+
+def _shortages(df):
+    damage_factor = (df["DamagePct"]/100.0)
+    return {
+        "Hospitals_Shortage": (df["Hospitals_Shortage_Pre"] + np.ceil(df["Hospitals_Base"] * damage_factor * 0.6)).astype(int),
+        "Schools_Shortage": (df["Schools_Shortage_Pre"] + np.ceil(df["Schools_Base"] * damage_factor * 0.5)).astype(int),
+        "Housing_Shortage": (df["Housing_Shortage_Pre"] + np.ceil(df["HousingUnits_Base"] * damage_factor * 0.35)).astype(int),
+    }
+
+
+def _weights(df):
+    return {
+        "PopW": df["Population"] / df["Population"].max(),
+        "DamageW": df["DamagePct"] / 100.0,
+        "ServiceGap": 1.0 - (df["ServiceAvail"] / 5.0),
+    }
+
+
+def _need_score(df):
+    return {
+        "NeedScore": (0.40*df["DamageW"] + 0.28*df["PopW"] + 0.12*df["ServiceGap"] + 0.20*df["DisplacedRatio"]).clip(0,1),
+    }
+
+
+def _shortage_weights(df):
+    return {
+        "HospShortW": norm_series(df["Hospitals_Shortage"]),
+        "SchoolShortW": norm_series(df["Schools_Shortage"]),
+        "HouseShortW": norm_series(df["Housing_Shortage"]),
+    }
+
+
+def _deficits(df):
+    return {
+        "HousingDef":  (0.35*df["DamageW"] + 0.30*df["DisplacedRatio"] + 0.20*df["PopW"] + 0.15*df["HouseShortW"]).clip(0,1),
+        "HospitalDef": (0.40*df["DamageW"] + 0.25*df["ServiceGap"] + 0.15*df["PopW"] + 0.20*df["HospShortW"]).clip(0,1),
+        "SchoolDef":   (0.25*df["DamageW"] + 0.25*df["PopW"] + 0.25*df["DisplacedRatio"] + 0.25*df["SchoolShortW"]).clip(0,1),
+        "InfraDef":    (0.55*df["DamageW"] + 0.45*df["ServiceGap"]).clip(0,1),
+        "RoadDef":     (0.55*df["DamageW"] + 0.35*df["ServiceGap"] + 0.10*(1-df["RoadIndex_Base"])).clip(0,1),
+        "WaterSanDef": (0.55*df["DamageW"] + 0.45*df["ServiceGap"]).clip(0,1),
+        "PowerDef":    (0.65*df["DamageW"] + 0.35*df["ServiceGap"]).clip(0,1),
+        "PublicDef":   (0.20*df["DamageW"] + 0.40*df["PopW"] + 0.40*df["DisplacedRatio"]).clip(0,1),
+    }
+
+
+# (compute, input columns); every group only reads raw or earlier columns
+CITY_MODEL_GRAPH = [
+    (_targets, ["Population"]),
+    (_shortages_pre, ["Hospitals_Target", "Schools_Target", "HousingUnits_Target",
+                      "Hospitals_Base", "Schools_Base", "HousingUnits_Base"]),
+    (_shortages, ["Hospitals_Shortage_Pre", "Schools_Shortage_Pre", "Housing_Shortage_Pre",
+                  "Hospitals_Base", "Schools_Base", "HousingUnits_Base", "DamagePct"]),
+    (_weights, ["Population", "DamagePct", "ServiceAvail"]),
+    (_need_score, ["DamageW", "PopW", "ServiceGap", "DisplacedRatio"]),
+    (_shortage_weights, ["Hospitals_Shortage", "Schools_Shortage", "Housing_Shortage"]),
+    (_deficits, ["DamageW", "PopW", "ServiceGap", "DisplacedRatio",
+                 "HouseShortW", "HospShortW", "SchoolShortW", "RoadIndex_Base"]),
+]
+
+
+def build_city_model(df_zones):
+    """
+    Derive targets, shortages, NeedScore and per-project deficits for
+    every zone from the raw zone table (see load_zone_data).
+    """
+    df_city = df_zones.copy()
+    for compute, _inputs in CITY_MODEL_GRAPH:
+        for col, values in compute(df_city).items():
+            df_city[col] = values
+    return df_city
+
+
+def build_city_panel(df_zones, scenarios):
+    """
+    City model for many perturbed copies of one raw zone table at once.
+
+    scenarios maps raw columns to (n_scenarios x zones) arrays that
+    replace the df_zones values; the other raw columns are repeated.
+    Every column becomes a (zones x n_scenarios) DataFrame, so each
+    CITY_MODEL_GRAPH group runs once for all scenarios (reductions such
+    as PopW's max are taken per scenario column).
+    Returns:
+        {column: DataFrame (zones x n_scenarios)} for raw and derived columns
+    """
+    n = len(next(iter(scenarios.values())))
+    panel = {}
+    for col in df_zones.columns:
+        if col == "Zone":
+            continue
+        if col in scenarios:
+            values = np.asarray(scenarios[col]).T
+        else:
+            values = np.repeat(df_zones[col].to_numpy()[:, None], n, axis=1)
+        panel[col] = pd.DataFrame(values)
+
+    for compute, _inputs in CITY_MODEL_GRAPH:
+        panel.update(compute(panel))
+    return panel
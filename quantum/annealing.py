@@ -0,0 +1,238 @@
+# quantum/annealing.py
+
+import numpy as np
+
+from quantum.qubo import KnapsackQubo, qubo_energies
+
+
+def anneal_schedule(num_sweeps, beta_range, kind="geometric"):
+    """
+    Inverse-temperature schedule, one beta per sweep.
+
+    kind: "geometric", "linear", or an explicit sequence of betas.
+    """
+    if not isinstance(kind, str):
+        return np.asarray(kind, dtype=float)
+
+    lo, hi = beta_range
+    if kind == "geometric":
+        return np.geomspace(lo, hi, num_sweeps)
+    if kind == "linear":
+        return np.linspace(lo, hi, num_sweeps)
+
+    raise ValueError(f"Unknown schedule '{kind}'. Use 'geometric', 'linear' or a sequence.")
+
+
+def default_beta_range(Q):
+    """
+    Hot/cold inverse temperatures scaled to the size of Q's coefficients.
+    """
+    diag = Q.diagonal() if isinstance(Q, KnapsackQubo) else np.diag(Q)
+    scale = max(1e-9, float(np.abs(diag).max()))
+    return 0.1 / scale, 10.0 / scale
+
+
+def rank_one_terms(Q):
+    """
+    (d, u) with Q = diag(d) + u u^T if a dense Q has that structure (every
+    Q from build_qubo does), else None. u is read off one row of the
+    off-diagonal part (u_k^2 = Q_kj Q_kl / Q_jl) and checked against all of it.
+    """
+    Q = np.asarray(Q, dtype=float)
+    n = Q.shape[0]
+    if n < 3 or not np.allclose(Q, Q.T):
+        return None
+
+    off = Q - np.diag(np.diag(Q))
+    k = int(np.argmax(np.abs(off).sum(axis=1)))
+    j = int(np.argmax(np.abs(off[k])))
+    partners = np.abs(off[j])
+    partners[k] = 0
+    l = int(np.argmax(partners))
+
+    if off[j, l] == 0:
+        return None
+    uk2 = off[k, j] * off[k, l] / off[j, l]
+    if uk2 <= 0:
+        return None
+
+    u = off[k] / np.sqrt(uk2)
+    u[k] = np.sqrt(uk2)
+    coupling = np.outer(u, u)
+    coupling[np.diag_indices_from(coupling)] = 0
+    if not np.allclose(off, coupling):
+        return None
+
+    return np.diag(Q) - u ** 2, u
+
+
+def _sweep_lowrank(X, energy, qdiag, u, betas, rng):
+    """
+    Metropolis sweeps on E = d . x + (u . x)^2, in place.
+
+    qdiag / u are either 1-D (one QUBO for all replicas) or (replicas x n)
+    (one QUBO per replica); betas are scalars or one beta per replica.
+    Returns:
+        best_X, best_E per replica
+    """
+    num_replicas, n = X.shape
+    per_replica = u.ndim == 2
+    s = np.einsum("ij,ij->i", X, u) if per_replica else X @ u
+
+    best_X = X.copy()
+    best_E = energy.copy()
+
+    for beta in betas:
+        thresholds = rng.random((n, num_replicas))
+
+        for i in range(n):
+            xi = X[:, i]
+            qi, ui = (qdiag[:, i], u[:, i]) if per_replica else (qdiag[i], u[i])
+            dE = (1 - 2 * xi) * (qi + 2 * ui * (s - ui * xi))
+
+            accept = (dE <= 0) | (thresholds[i] < np.exp(-beta * np.maximum(dE, 0)))
+            if not accept.any():
+                continue
+
+            sign = np.where(accept, 1 - 2 * xi, 0.0)
+            X[:, i] = xi + sign
+            energy += np.where(accept, dE, 0.0)
+            s += sign * ui
+
+        improved = energy < best_E
+        best_X[improved] = X[improved]
+        best_E[improved] = energy[improved]
+
+    return best_X, best_E
+
+
+def anneal_replicas(Q, num_replicas=256, num_sweeps=200, schedule="geometric",
+                    beta_range=None, seed=None):
+    """
+    Run many simulated-annealing replicas at once.
+
+    State is a (replicas x n) bit matrix. Each sweep visits every site
+    once and updates all replicas in one vectorized step. A KnapsackQubo,
+    or a dense Q with the same diag + rank-1 structure (rank_one_terms),
+    needs O(1) bookkeeping per flip; any other dense Q updates the local
+    fields of the replicas that flipped, O(n) each.
+    Returns:
+        X (replicas x n uint8), the lowest-energy state seen by each
+        replica, and their energies
+    """
+    rng = np.random.default_rng(seed)
+    betas = anneal_schedule(num_sweeps, beta_range or default_beta_range(Q), schedule)
+
+    if isinstance(Q, KnapsackQubo):
+        terms = (Q.d, Q.u)
+    else:
+        Q = np.asarray(Q, dtype=float)
+        terms = rank_one_terms(Q)
+
+    n = len(terms[1]) if terms is not None else Q.shape[0]
+    X = rng.integers(0, 2, size=(num_replicas, n)).astype(float)
+
+    # -------------------------------------------------
+    # Low-rank (build_qubo / KnapsackQubo)
+    # -------------------------------------------------
+    if terms is not None:
+        d, u = terms
+        energy = X @ d + (X @ u) ** 2
+        best_X, best_E = _sweep_lowrank(X, energy, d + u ** 2, u, betas, rng)
+        return best_X.astype(np.uint8), best_E
+
+    # -------------------------------------------------
+    # General dense Q: local fields
+    # -------------------------------------------------
+    energy = qubo_energies(X, Q)
+    qdiag = np.diag(Q)
+    W = Q + Q.T
+    field = X @ W
+
+    best_X = X.copy()
+    best_E = energy.copy()
+
+    for beta in betas:
+        thresholds = rng.random((n, num_replicas))
+
+        for i in range(n):
+            xi = X[:, i]
+            dE = (1 - 2 * xi) * (qdiag[i] + field[:, i] - W[i, i] * xi)
+
+            accept = (dE <= 0) | (thresholds[i] < np.exp(-beta * np.maximum(dE, 0)))
+            flipped = np.flatnonzero(accept)
+            if not len(flipped):
+                continue
+
+            sign = 1 - 2 * xi[flipped]
+            X[flipped, i] = xi[flipped] + sign
+            energy[flipped] += dE[flipped]
+            # Only the rows that flipped change their fields
+            field[flipped] += sign[:, None] * W[i]
+
+        improved = energy < best_E
+        best_X[improved] = X[improved]
+        best_E[improved] = energy[improved]
+
+    return best_X.astype(np.uint8), best_E
+
+
+def anneal_knapsack_batch(d, u, num_replicas=32, num_sweeps=100, schedule="geometric",
+                          beta_range=None, seed=None):
+    """
+    Anneal many low-rank QUBOs (rows of d, u from qubo_terms) in one run.
+
+    Problem s owns replicas [s * num_replicas, (s + 1) * num_replicas) of a
+    single replica matrix, with its own d / u rows and (by default) its own
+    default_beta_range, so a whole batch costs one sweep loop.
+    Returns:
+        X (problems x n uint8), the best state of each problem, and their energies
+    """
+    d, u = np.atleast_2d(d), np.atleast_2d(u)
+    problems, n = d.shape
+    rng = np.random.default_rng(seed)
+
+    if beta_range is None and isinstance(schedule, str):
+        # default_beta_range per problem: the unit schedule divided by its scale
+        scale = np.maximum(1e-9, np.abs(d + u ** 2).max(axis=1))
+        betas = anneal_schedule(num_sweeps, (0.1, 10.0), schedule)[:, None] / np.repeat(scale, num_replicas)[None, :]
+    else:
+        betas = anneal_schedule(num_sweeps, beta_range, schedule)
+
+    d = np.repeat(d, num_replicas, axis=0)
+    u = np.repeat(u, num_replicas, axis=0)
+    X = rng.integers(0, 2, size=(problems * num_replicas, n)).astype(float)
+    energy = np.einsum("ij,ij->i", X, d) + np.einsum("ij,ij->i", X, u) ** 2
+
+    best_X, best_E = _sweep_lowrank(X, energy, d + u ** 2, u, betas, rng)
+
+    best_E = best_E.reshape(problems, num_replicas)
+    pick = np.arange(problems) * num_replicas + np.argmin(best_E, axis=1)
+    return best_X[pick].astype(np.uint8), best_E.min(axis=1)
+
+
+def sample_anneal(Q, num_replicas=256, num_sweeps=200, schedule="geometric",
+                  beta_range=None, seed=None):
+    """
+    Counts-style sampler: {bitstring: count} over the replicas.
+
+    Bitstrings use Qiskit order (reversed vs x), so the result drops into
+    the same downstream code as QAOA counts (score_counts,
+    generate_recovery_plan).
+    """
+    X, _energies = anneal_replicas(
+        Q,
+        num_replicas=num_replicas,
+        num_sweeps=num_sweeps,
+        schedule=schedule,
+        beta_range=beta_range,
+        seed=seed
+    )
+
+    states, counts = np.unique(X[:, ::-1], axis=0, return_counts=True)
+    chars = (states + ord("0")).astype(np.uint8)
+
+    return {
+        row.tobytes().decode("ascii"): int(c)
+        for row, c in zip(chars, counts)
+    }
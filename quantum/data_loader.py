@@ -1,11 +1,45 @@
 # quantum/data_loader.py
 
+import os
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 
-def load_road_data():
+from quantum.feature_engineering import to_categoricals
+
+
+# Columns every road inventory must provide (and their kind)
+ROAD_SCHEMA = {
+    "id": "numeric",
+    "zone": "string",
+    "damage": "numeric",
+    "population": "numeric",
+    "distance_to_hospital": "numeric",
+    "aid_route": "numeric",
+    "land_use": "string",
+    "soil": "string",
+    "base_cost": "numeric",
+    "lat": "numeric",
+    "lon": "numeric",
+}
+
+# Max number of decoded road frames kept in memory
+TABLE_CACHE_SIZE = 8
+
+# Decoded frames keyed by (path, columns, categorical), stored with their mtime (LRU)
+_table_cache = OrderedDict()
+
+
+def load_road_data(path=None, columns=None, categorical=False):
     """
     Load structured road-level data for Gaza Strip.
 
+    With path set, a columnar inventory (Parquet / Arrow / .npy column
+    directory) is read via load_road_table instead of the inline sample.
+    categorical=True stores land_use / soil as Categoricals (see
+    quantum.feature_engineering.to_categoricals).
+
     NOTE:
     - Locations and population figures are approximated
       using publicly available humanitarian reports
@@ -14,6 +48,9 @@ def load_road_data():
       not for exact operational deployment.
     """
 
+    if path is not None:
+        return load_road_table(path, columns=columns, categorical=categorical)
+
     roads = [
 
         # ---------------------------
@@ -104,4 +141,134 @@ def load_road_data():
         }
     ]
 
-    return pd.DataFrame(roads)
\ No newline at end of file
+    df = pd.DataFrame(roads)
+    return to_categoricals(df) if categorical else df
+
+
+# =========================================================
+# Columnar inventories
+# =========================================================
+def road_data_version(path=None):
+    """
+    Version key of a road source for caches keyed on the data: the
+    source mtime, or None for the inline sample.
+    """
+    if path is None:
+        return None
+    return _source_mtime(os.path.abspath(path))
+
+
+def _source_mtime(path):
+    if os.path.isdir(path):
+        mtimes = [
+            os.path.getmtime(os.path.join(path, f))
+            for f in os.listdir(path) if f.endswith(".npy")
+        ]
+        if not mtimes:
+            raise ValueError(f"Road inventory is missing required columns: {list(ROAD_SCHEMA)} (no .npy files in {path})")
+        return max(mtimes)
+    return os.path.getmtime(path)
+
+
+def _validate_schema(available, dtypes, columns, is_numeric=pd.api.types.is_numeric_dtype):
+    missing = [c for c in ROAD_SCHEMA if c not in available]
+    if missing:
+        raise ValueError(f"Road inventory is missing required columns: {missing}")
+
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(f"Requested columns not in road inventory: {unknown}")
+
+    for col in columns:
+        kind = ROAD_SCHEMA.get(col)
+        if kind == "numeric" and not is_numeric(dtypes[col]):
+            raise ValueError(f"Column '{col}' must be numeric, got {dtypes[col]}")
+
+
+def _read_npy_dir(path, columns):
+    files = {f[:-4]: os.path.join(path, f) for f in os.listdir(path) if f.endswith(".npy")}
+
+    # Memory-mapped: only the header is read until values are touched
+    arrays = {name: np.load(f, mmap_mode="r") for name, f in files.items()}
+    dtypes = {name: a.dtype for name, a in arrays.items()}
+
+    columns = columns or list(arrays)
+    _validate_schema(arrays, dtypes, columns)
+
+    return pd.DataFrame({c: arrays[c] for c in columns}, copy=False)
+
+
+def _arrow_is_numeric(t):
+    import pyarrow as pa
+
+    # Pandas writes Categoricals as dictionary columns; check their values
+    if pa.types.is_dictionary(t):
+        t = t.value_type
+    return pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t)
+
+
+def _read_arrow(path, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        schema = pq.read_schema(path)
+        reader = None
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+        schema = reader.schema
+
+    dtypes = {f.name: f.type for f in schema}
+    columns = columns or schema.names
+    _validate_schema(schema.names, dtypes, columns, is_numeric=_arrow_is_numeric)
+
+    if reader is None:
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        table = reader.read_all().select(columns)
+
+    return table.to_pandas()
+
+
+def load_road_table(path, columns=None, categorical=False):
+    """
+    Load a columnar road inventory via memory mapping.
+
+    Supported sources:
+    - .parquet
+    - .arrow / .feather (Arrow IPC file)
+    - a directory of <column>.npy files
+
+    The schema is validated against ROAD_SCHEMA, columns projects a
+    subset, and decoded frames are cached until the source mtime changes
+    (the TABLE_CACHE_SIZE most recently used frames are kept).
+    With categorical=True, land_use / soil are converted to Categoricals
+    once, before caching.
+    """
+    path = os.path.abspath(path)
+    columns = list(columns) if columns is not None else None
+
+    key = (path, tuple(columns) if columns else None, categorical)
+    mtime = _source_mtime(path)
+
+    cached = _table_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        _table_cache.move_to_end(key)
+        return cached[1].copy(deep=False)
+
+    if os.path.isdir(path):
+        df = _read_npy_dir(path, columns)
+    elif path.endswith((".parquet", ".arrow", ".feather")):
+        df = _read_arrow(path, columns)
+    else:
+        raise ValueError(f"Unsupported road inventory format: {path}")
+
+    if categorical:
+        df = to_categoricals(df)
+
+    _table_cache[key] = (mtime, df)
+    _table_cache.move_to_end(key)
+    if len(_table_cache) > TABLE_CACHE_SIZE:
+        _table_cache.popitem(last=False)
+
+    return df.copy(deep=False)
@@ -0,0 +1,224 @@
+# quantum/decomposition.py
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from quantum.qubo import KnapsackQubo
+from quantum.solvers import _result, solve_roads
+
+
+# =========================================================
+# Partitioning
+# =========================================================
+def _split(idx, max_size, order_key):
+    """Split an index group into chunks of at most max_size (by order_key)."""
+    if len(idx) <= max_size:
+        return [idx]
+    idx = idx[np.argsort(-order_key[idx], kind="stable")]
+    return [idx[k:k + max_size] for k in range(0, len(idx), max_size)]
+
+
+def _coordinate_bisect(idx, coords, max_size):
+    """Recursive median split along the wider coordinate axis (k-d tree leaves)."""
+    if len(idx) <= max_size:
+        return [idx]
+
+    pts = coords[idx]
+    axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+    order = np.argsort(pts[:, axis], kind="stable")
+    half = len(idx) // 2
+    return (
+        _coordinate_bisect(idx[order[:half]], coords, max_size)
+        + _coordinate_bisect(idx[order[half:]], coords, max_size)
+    )
+
+
+def partition_roads(df, by="zone", max_size=20):
+    """
+    Partition roads into sub-problems of at most max_size roads.
+
+    df may be a DataFrame or a RoadSet.
+
+    by="zone":     group on the zone column from load_road_data
+                   (oversized zones are chunked by impact / cost ratio)
+    by="location": recursive median bisection on lat / lon, so each
+                   part is a compact neighbourhood even across zones
+
+    The QUBO itself gives no useful split: its only coupling is the
+    rank-1 budget term 2 * lambda * c_i * c_j between every pair, so
+    all roads are coupled to all others.
+    Returns:
+        list of integer index arrays (positions into df)
+    """
+    if by == "zone":
+        ratio = np.asarray(df["impact"], dtype=float) / np.asarray(df["final_cost"], dtype=float)
+        zones = pd.Series(np.asarray(df["zone"]))
+        groups = zones.groupby(zones, sort=False).indices
+        parts = []
+        for idx in groups.values():
+            parts.extend(_split(np.asarray(idx), max_size, ratio))
+        return parts
+
+    if by == "location":
+        coords = np.column_stack([np.asarray(df["lat"], dtype=float), np.asarray(df["lon"], dtype=float)])
+        return _coordinate_bisect(np.arange(len(coords)), coords, max_size)
+
+    raise ValueError(f"Unknown partitioning '{by}'. Use 'zone' or 'location'.")
+
+
+def allocate_budget(impacts, costs, parts, budget):
+    """
+    Split the total budget across partitions in proportion to each
+    partition's total impact, capped at what the partition can spend.
+    """
+    impacts = np.asarray(impacts, dtype=float)
+    costs = np.asarray(costs, dtype=float)
+
+    weight = np.array([impacts[idx].sum() for idx in parts])
+    cap = np.array([costs[idx].sum() for idx in parts])
+
+    share = budget * weight / max(1e-9, weight.sum())
+    return np.minimum(share, cap)
+
+
+# =========================================================
+# Stitching
+# =========================================================
+def _top_k(idx, key, k):
+    """The k entries of idx with the largest key (all of idx when it is smaller)."""
+    if len(idx) <= k:
+        return idx
+    return idx[np.argpartition(-key[idx], k - 1)[:k]]
+
+
+def _fill(x, order, costs, spent, budget):
+    """
+    Greedy fill in ratio order, in place: the same picks as visiting every
+    road and adding it when it still fits, done as cumsum prefixes. A road
+    that does not fit now never fits later, so each pass drops them and
+    takes the longest affordable prefix of the rest.
+    """
+    cand = order[~x[order]]
+    while len(cand):
+        cand = cand[costs[cand] <= budget - spent]
+        take = int(np.searchsorted(np.cumsum(costs[cand]), budget - spent, side="right"))
+        if take == 0:
+            break
+        x[cand[:take]] = True
+        spent += costs[cand[:take]].sum()
+        cand = cand[take:]
+    return spent
+
+
+def repair_and_refine(x, impacts, costs, budget, max_swaps=1000, swap_candidates=256):
+    """
+    Enforce the global budget, then improve impact with greedy fill and
+    best-improving 1-for-1 swaps. Swaps are scored at once over the
+    swap_candidates lowest-impact selected and highest-impact affordable
+    unselected roads, so every pass is O(n) plus a fixed-size pair grid.
+    """
+    x = np.asarray(x, dtype=bool).copy()
+    ratio = impacts / np.maximum(costs, 1e-9)
+    spent = costs[x].sum()
+
+    # -------------------------
+    # 1. Repair: drop worst ratio until within budget
+    # -------------------------
+    if spent > budget:
+        drop = np.argsort(ratio, kind="stable")
+        drop = drop[x[drop]]
+        freed = np.cumsum(costs[drop])
+        k = min(len(drop), int(np.searchsorted(freed, spent - budget, side="left")) + 1)
+        x[drop[:k]] = False
+        spent -= freed[k - 1]
+
+    # -------------------------
+    # 2. Greedy fill by ratio + swap refinement
+    # -------------------------
+    order = np.argsort(-ratio, kind="stable")
+
+    for _ in range(max_swaps):
+        spent = _fill(x, order, costs, spent, budget)
+
+        sel = np.flatnonzero(x)
+        uns = np.flatnonzero(~x)
+        if len(sel) == 0 or len(uns) == 0:
+            break
+
+        sel = _top_k(sel, -impacts, swap_candidates)
+        # Only roads the most expensive drop could pay for
+        uns = uns[costs[uns] <= budget - spent + costs[sel].max()]
+        uns = _top_k(uns, impacts, swap_candidates)
+        if len(uns) == 0:
+            break
+
+        # Best 1-for-1 swap; freed budget is refilled on the next pass
+        gain = impacts[uns][None, :] - impacts[sel][:, None]
+        new_cost = spent - costs[sel][:, None] + costs[uns][None, :]
+        gain = np.where(new_cost <= budget, gain, -np.inf)
+
+        a, b = np.unravel_index(np.argmax(gain), gain.shape)
+        if gain[a, b] <= 1e-12:
+            break
+
+        x[sel[a]], x[uns[b]] = False, True
+        spent = new_cost[a, b]
+
+    return x.astype(np.uint8)
+
+
+# =========================================================
+# Decomposed solve
+# =========================================================
+def _solve_part(args):
+    impacts, costs, budget, lambda_penalty, solver, options = args
+    sub = KnapsackQubo(impacts, costs, budget, lambda_penalty)
+    return solve_roads(sub, solver, **options)["x"]
+
+
+def solve_decomposed(df, budget, lambda_penalty, by="zone", max_size=20,
+                     solver="exact", solver_options=None, max_workers=None):
+    """
+    Solve the road QUBO beyond simulator qubit limits.
+
+    Roads are partitioned (by zone or by location), the budget is
+    allocated across partitions, every sub-QUBO is solved independently
+    in a process pool with any SOLVERS backend, and the stitched
+    selection is repaired / refined against the total budget.
+    Returns:
+        result dict in the quantum.solvers format (solver="decomposed")
+    """
+    started = time.perf_counter()
+
+    Q = KnapsackQubo.from_dataframe(df, budget, lambda_penalty)
+    parts = partition_roads(df, by=by, max_size=max_size)
+    budgets = allocate_budget(Q.impacts, Q.costs, parts, budget)
+
+    jobs = [
+        (Q.impacts[idx], Q.costs[idx], b, lambda_penalty, solver, solver_options or {})
+        for idx, b in zip(parts, budgets)
+    ]
+
+    if max_workers == 1:
+        sub_x = [_solve_part(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            sub_x = list(pool.map(_solve_part, jobs))
+
+    x = np.zeros(len(Q), dtype=np.uint8)
+    for idx, xs in zip(parts, sub_x):
+        x[idx] = xs
+
+    x = repair_and_refine(x, Q.impacts, Q.costs, budget)
+
+    return _result(
+        "decomposed",
+        Q,
+        x,
+        started,
+        num_parts=len(parts),
+        sub_solver=solver,
+    )
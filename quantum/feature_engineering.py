@@ -1,6 +1,63 @@
 # quantum/feature_engineering.py
 
-def engineer_context_features(df):
+import numpy as np
+import pandas as pd
+
+
+# -------------------------------------------------
+# Factor tables
+# -------------------------------------------------
+# Policy-driven priorities
+LAND_USE_FACTOR = {
+    "residential": 1.2,   # civilians first
+    "mixed": 1.0,
+    "industrial": 0.8     # lower humanitarian priority
+}
+
+# Engineering reality:
+# Sandy soil is harder and more expensive to rebuild
+SOIL_FACTOR = {
+    "sandy": 1.4,
+    "compact": 1.0
+}
+
+# Fixed category order per column; codes index the lookup arrays below
+CATEGORIES = {
+    "land_use": list(LAND_USE_FACTOR),
+    "soil": list(SOIL_FACTOR),
+}
+
+
+def _lookup(table):
+    # Trailing NaN: code -1 (unknown category) gathers NaN, like Series.map
+    return np.append(np.array(list(table.values()), dtype=float), np.nan)
+
+
+LAND_USE_LOOKUP = _lookup(LAND_USE_FACTOR)
+SOIL_LOOKUP = _lookup(SOIL_FACTOR)
+
+
+def to_categoricals(df):
+    """
+    Convert land_use / soil to Categoricals with the fixed CATEGORIES
+    (in place), so factors become integer-code gathers. Meant to be
+    called once at load time (see load_road_data(categorical=True)).
+    """
+    for col, categories in CATEGORIES.items():
+        if col in df:
+            df[col] = pd.Categorical(df[col], categories=categories)
+    return df
+
+
+def _category_codes(values, col):
+    categories = CATEGORIES[col]
+    cat = values.array if isinstance(values, pd.Series) else values
+    if isinstance(cat, pd.Categorical) and list(cat.categories) == categories:
+        return cat.codes
+    return pd.Categorical(values, categories=categories).codes
+
+
+def engineer_context_features(df, inplace=True):
     """
     Add contextual and engineering-aware features to road data.
 
@@ -8,7 +65,13 @@ def engineer_context_features(df):
     - Roads closer to hospitals are higher priority.
     - Residential areas receive higher weight.
     - Soil type affects reconstruction cost.
+
+    With inplace=False the input is left untouched and a new frame is
+    returned, with land_use / soil stored as Categoricals. Factors are
+    gathered from LAND_USE_LOOKUP / SOIL_LOOKUP by category code.
     """
+    if not inplace:
+        df = to_categoricals(df.copy(deep=False))
 
     # -------------------------------------------------
     # 1. Hospital Proximity Score
@@ -21,27 +84,13 @@ def engineer_context_features(df):
     # -------------------------------------------------
     # 2. Land Use Priority Factor
     # -------------------------------------------------
-    # Policy-driven priorities
-    land_use_factor = {
-        "residential": 1.2,   # civilians first
-        "mixed": 1.0,
-        "industrial": 0.8     # lower humanitarian priority
-    }
-
-    df["land_use_factor"] = df["land_use"].map(land_use_factor)
+    df["land_use_factor"] = LAND_USE_LOOKUP[_category_codes(df["land_use"], "land_use")]
 
 
     # -------------------------------------------------
     # 3. Soil Difficulty Factor
     # -------------------------------------------------
-    # Engineering reality:
-    # Sandy soil is harder and more expensive to rebuild
-    soil_factor = {
-        "sandy": 1.4,
-        "compact": 1.0
-    }
-
-    df["soil_factor"] = df["soil"].map(soil_factor)
+    df["soil_factor"] = SOIL_LOOKUP[_category_codes(df["soil"], "soil")]
 
 
     # -------------------------------------------------
@@ -50,4 +99,4 @@ def engineer_context_features(df):
     df["final_cost"] = df["base_cost"] * df["soil_factor"]
 
 
-    return df
\ No newline at end of file
+    return df
@@ -1,29 +1,124 @@
 # quantum/impact_scoring.py
 
+import numpy as np
 from sklearn.preprocessing import MinMaxScaler
 
 
-def compute_impact_scores(df, weights):
+# Raw indicators and their normalized column names
+IMPACT_FEATURES = ["damage", "population", "hospital_score", "aid_route"]
+NORMALIZED_FEATURES = ["damage_n", "population_n", "hospital_n", "aid_n"]
+
+# Keys of the weights dict, in IMPACT_FEATURES order
+WEIGHT_KEYS = ["damage", "population", "hospital", "aid"]
+
+
+def impact_stats(df):
+    """
+    Per-indicator (min, max) used for normalization.
+
+    Stats from several chunks can be merged with merge_impact_stats, so
+    a whole inventory is normalized consistently chunk by chunk.
+    """
+    values = df[IMPACT_FEATURES].to_numpy(dtype=float)
+    return {"min": values.min(axis=0), "max": values.max(axis=0)}
+
+
+def merge_impact_stats(a, b):
+    if a is None:
+        return b
+    return {
+        "min": np.minimum(a["min"], b["min"]),
+        "max": np.maximum(a["max"], b["max"]),
+    }
+
+
+def _normalize(values, stats):
+    span = stats["max"] - stats["min"]
+    span = np.where(span == 0, 1.0, span)
+    return (values - stats["min"]) / span
+
+
+def weight_matrix(weights):
+    """
+    (k x 4) weight matrix from a weights dict, a list of weights dicts or
+    an array-like of rows in WEIGHT_KEYS order.
+    """
+    if isinstance(weights, dict):
+        weights = [weights]
+    rows = [
+        [w[key] for key in WEIGHT_KEYS] if isinstance(w, dict) else w
+        for w in weights
+    ]
+    W = np.asarray(rows, dtype=float)
+    if W.ndim != 2 or W.shape[1] != len(WEIGHT_KEYS):
+        raise ValueError(f"Weights must have {len(WEIGHT_KEYS)} columns {WEIGHT_KEYS}, got shape {W.shape}.")
+    return W
+
+
+class ImpactScorer:
+    """
+    Batch impact scoring for many weight vectors at once.
+
+    The four indicators are normalized once (at construction) and kept
+    as an (n x 4) matrix, so scoring k weight vectors is one matmul plus
+    a land_use_factor broadcast. The source DataFrame is never modified.
+    """
+
+    def __init__(self, features, land_use_factor, stats=None):
+        features = np.asarray(features, dtype=float)
+        if stats is None:
+            stats = {"min": features.min(axis=0), "max": features.max(axis=0)}
+
+        self.stats = stats
+        self.normalized = _normalize(features, stats)
+        self.land_use_factor = np.asarray(land_use_factor, dtype=float)
+
+    @classmethod
+    def from_dataframe(cls, df, stats=None):
+        """Scorer for a feature-engineered road table or RoadSet."""
+        return cls(
+            np.column_stack([np.asarray(df[c], dtype=float) for c in IMPACT_FEATURES]),
+            np.asarray(df["land_use_factor"], dtype=float),
+            stats=stats
+        )
+
+    def __len__(self):
+        return self.normalized.shape[0]
+
+    def scores(self, weights):
+        """
+        Impact of every road under every weight vector.
+        Returns:
+            (n_roads x k) array, column j scored with row j of weight_matrix(weights)
+        """
+        W = weight_matrix(weights)
+        return (self.normalized @ W.T) * self.land_use_factor[:, None]
+
+    def score(self, weights):
+        """Impact vector for a single weights dict (same values as compute_impact_scores)."""
+        return self.scores(weights)[:, 0]
+
+
+def compute_impact_scores(df, weights, stats=None):
     """
     Compute a humanitarian impact score for each road.
 
     This score represents how critical it is to reconstruct the road,
     based on normalized and weighted humanitarian indicators.
+
+    With stats (from impact_stats / merge_impact_stats) the min/max are
+    fixed instead of fitted on df, e.g. when scoring in chunks.
     """
 
     # -------------------------------------------------
     # 1. Normalize Features
     # -------------------------------------------------
     # We normalize to avoid scale dominance
-    scaler = MinMaxScaler()
-
-    df[
-        ["damage_n", "population_n", "hospital_n", "aid_n"]
-    ] = scaler.fit_transform(
-        df[
-            ["damage", "population", "hospital_score", "aid_route"]
-        ]
-    )
+    if stats is None:
+        scaler = MinMaxScaler()
+        df[NORMALIZED_FEATURES] = scaler.fit_transform(df[IMPACT_FEATURES])
+    else:
+        df[NORMALIZED_FEATURES] = _normalize(df[IMPACT_FEATURES].to_numpy(dtype=float), stats)
 
     # -------------------------------------------------
     # 2. Weighted Impact Score
@@ -41,4 +136,4 @@ def compute_impact_scores(df, weights):
     # Residential areas get higher priority
     df["impact"] *= df["land_use_factor"]
 
-    return df
\ No newline at end of file
+    return df
@@ -1,10 +1,16 @@
 # quantum/plan_builder.py
 
+import numpy as np
+
+
 def generate_recovery_plan(df, bitstring):
     """
     Convert QAOA bitstring solution into a structured recovery plan.
 
     bitstring example: "1010"
+
+    df may be a DataFrame or a RoadSet; the summary is built from the
+    column arrays, so no selected / deferred sub-frames are copied.
     """
 
     # -------------------------------------------------
@@ -16,20 +22,20 @@ def generate_recovery_plan(df, bitstring):
     # -------------------------------------------------
     # 2. Separate selected vs deferred
     # -------------------------------------------------
-    selected_df = df[df["selected"] == 1]
-    deferred_df = df[df["selected"] == 0]
+    selected = np.asarray(df["selected"]) == 1
+    ids = np.asarray(df["id"])
 
     # -------------------------------------------------
     # 3. Build summary report
     # -------------------------------------------------
     summary = {
-        "selected_roads": selected_df["id"].tolist(),
-        "deferred_roads": deferred_df["id"].tolist(),
-        "total_cost": round(selected_df["final_cost"].sum(), 2),
-        "total_impact": round(selected_df["impact"].sum(), 3),
-        "population_served": int(selected_df["population"].sum()),
-        "num_selected": int(selected_df.shape[0]),
-        "num_deferred": int(deferred_df.shape[0])
+        "selected_roads": ids[selected].tolist(),
+        "deferred_roads": ids[~selected].tolist(),
+        "total_cost": round(np.asarray(df["final_cost"], dtype=float)[selected].sum(), 2),
+        "total_impact": round(np.asarray(df["impact"], dtype=float)[selected].sum(), 3),
+        "population_served": int(np.asarray(df["population"])[selected].sum()),
+        "num_selected": int(selected.sum()),
+        "num_deferred": int((~selected).sum())
     }
 
-    return df, summary
\ No newline at end of file
+    return df, summary
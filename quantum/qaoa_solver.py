@@ -1,85 +1,379 @@
 # quantum/qaoa_solver.py
 
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
 from qiskit import QuantumCircuit, transpile
-from qiskit.circuit import Parameter
+from qiskit.circuit import ParameterVector
+from qiskit.quantum_info import Statevector
 from qiskit_aer import Aer
 
+from instrumentation.spans import span
+from quantum.qubo import (
+    KnapsackQubo,
+    bitstrings_to_matrix,
+    qubo_energies,
+    qubo_energy_diagonal,
+    score_counts,
+)
+
+
+# Max number of transpiled parametric circuits kept in memory
+COMPILED_CACHE_SIZE = 16
+
+_compiled_cache = OrderedDict()
+
+# Exact statevector mode stores 2^n amplitudes
+MAX_STATEVECTOR_QUBITS = 24
+
 
-def build_qaoa_circuit(Q):
+def build_qaoa_circuit(Q, p=1):
     """
-    Build a single-layer QAOA circuit for a given QUBO matrix Q.
+    Build a p-layer QAOA circuit for a given QUBO matrix Q.
 
-    Q is assumed symmetric (upper triangle used).
+    Q is assumed symmetric (upper triangle used). A KnapsackQubo is
+    exported to its dense matrix first.
+    gamma and beta are ParameterVectors with one entry per layer.
     Returns:
         qc, gamma, beta
     """
+    if isinstance(Q, KnapsackQubo):
+        Q = Q.to_dense()
+
     n = Q.shape[0]
 
-    gamma = Parameter("gamma")
-    beta = Parameter("beta")
+    gamma = ParameterVector("gamma", p)
+    beta = ParameterVector("beta", p)
 
     qc = QuantumCircuit(n)
 
     # Start in equal superposition
     qc.h(range(n))
 
-    # --- Cost Hamiltonian (Problem unitary) ---
-    # Diagonal terms
-    for i in range(n):
-        if Q[i, i] != 0:
-            qc.rz(2 * gamma * Q[i, i], i)
+    for layer in range(p):
+        # --- Cost Hamiltonian (Problem unitary) ---
+        # Diagonal terms
+        for i in range(n):
+            if Q[i, i] != 0:
+                qc.rz(2 * gamma[layer] * Q[i, i], i)
 
-    # Off-diagonal terms
-    for i in range(n):
-        for j in range(i + 1, n):
-            if Q[i, j] != 0:
-                qc.cx(i, j)
-                qc.rz(2 * gamma * Q[i, j], j)
-                qc.cx(i, j)
+        # Off-diagonal terms
+        for i in range(n):
+            for j in range(i + 1, n):
+                if Q[i, j] != 0:
+                    qc.cx(i, j)
+                    qc.rz(2 * gamma[layer] * Q[i, j], j)
+                    qc.cx(i, j)
 
-    # --- Mixer Hamiltonian ---
-    for i in range(n):
-        qc.rx(2 * beta, i)
+        # --- Mixer Hamiltonian ---
+        for i in range(n):
+            qc.rx(2 * beta[layer], i)
 
     return qc, gamma, beta
 
 
+def _layer_values(values, p):
+    """
+    Broadcast a scalar or per-layer sequence of angles to length p.
+    """
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    if values.shape[0] == 1:
+        values = np.repeat(values, p)
+    if values.shape[0] != p:
+        raise ValueError(f"Expected {p} per-layer angles, got {values.shape[0]}.")
+    return values
+
+
+def bind_qaoa_parameters(gamma, beta, params):
+    """
+    Parameter mapping for assign_parameters.
+
+    params["gamma"] / params["beta"] may be scalars (same angle in every
+    layer) or one value per layer.
+    """
+    p = len(gamma)
+    return {
+        gamma: _layer_values(params["gamma"], p).tolist(),
+        beta: _layer_values(params["beta"], p).tolist(),
+    }
+
+
 def compute_energy(bitstring, Q):
     """
     Compute QUBO energy E = x^T Q x for a given bitstring.
     bitstring is like "0101" (Qiskit order is reversed vs our x vector).
+    Q may be a dense matrix or a KnapsackQubo (O(n) evaluation).
     """
     x = np.array([int(b) for b in bitstring[::-1]])
+    if isinstance(Q, KnapsackQubo):
+        return Q.energy(x)
     return float(x @ Q @ x)
 
 
-def run_qaoa_and_extract_solution(qc, gamma, beta, params, Q, shots=1024):
+@lru_cache(maxsize=None)
+def get_backend(name="aer_simulator"):
+    """
+    Fetch an Aer backend once and reuse it across runs.
+    """
+    return Aer.get_backend(name)
+
+
+def qubo_cache_key(Q):
+    """
+    Hash of Q's shape, sparsity pattern and values.
+    """
+    if isinstance(Q, KnapsackQubo):
+        Q = Q.to_dense()
+
+    Q = np.ascontiguousarray(Q, dtype=float)
+
+    h = hashlib.sha1()
+    h.update(repr(Q.shape).encode())
+    h.update(np.packbits(Q != 0).tobytes())
+    h.update(Q.tobytes())
+    return h.hexdigest()
+
+
+def get_compiled_qaoa(Q, p=1):
+    """
+    Return a transpiled, measured, still-parametric QAOA circuit for Q.
+
+    Transpilation happens once per QUBO structure; later calls with the
+    same Q are served from a bounded LRU cache so only the parameter
+    binding is left to do.
+    Returns:
+        compiled, gamma, beta
+    """
+    key = (qubo_cache_key(Q), p)
+
+    if key in _compiled_cache:
+        _compiled_cache.move_to_end(key)
+        return _compiled_cache[key]
+
+    qc, gamma, beta = build_qaoa_circuit(Q, p)
+    qc.measure_all()
+
+    with span("transpile"):
+        compiled = transpile(qc, get_backend())
+
+    _compiled_cache[key] = (compiled, gamma, beta)
+    if len(_compiled_cache) > COMPILED_CACHE_SIZE:
+        _compiled_cache.popitem(last=False)
+
+    return compiled, gamma, beta
+
+
+def run_qaoa_and_extract_solution(qc, gamma, beta, params, Q, shots=1024,
+                                  return_energies=False, compiled=False):
     """
     Run QAOA on Aer simulator and extract best solution by minimum energy.
+
+    With compiled=True, qc is a circuit from get_compiled_qaoa and only
+    the parameters are bound (no measure_all / transpile).
+
+    All distinct bitstrings are scored in one vectorized pass. With
+    return_energies=True the energies (aligned with counts) are returned
+    as a fourth value.
     """
-    backend = Aer.get_backend("aer_simulator")
+    backend = get_backend()
 
-    qc_bound = qc.assign_parameters({
-        gamma: params["gamma"],
-        beta: params["beta"]
-    })
+    qc_bound = qc.assign_parameters(bind_qaoa_parameters(gamma, beta, params))
 
-    qc_bound.measure_all()
+    if not compiled:
+        qc_bound.measure_all()
+        with span("transpile"):
+            qc_bound = transpile(qc_bound, backend)
 
-    compiled = transpile(qc_bound, backend)
-    result = backend.run(compiled, shots=shots).result()
+    with span("simulate"):
+        result = backend.run(qc_bound, shots=shots).result()
 
     counts = result.get_counts()
 
     # Choose best by minimum energy (not just max counts)
-    best_bit = None
-    best_energy = float("inf")
+    energies = score_counts(counts, Q)
+    best_idx = int(np.argmin(energies))
+
+    best_bit = list(counts)[best_idx]
+    best_energy = float(energies[best_idx])
+
+    if return_energies:
+        return best_bit, best_energy, counts, energies
+    return best_bit, best_energy, counts
+
+def sweep_qaoa_parameters(Q, points, shots=1024, costs=None, budget=None):
+    """
+    Evaluate many (gamma, beta) points in ONE batched Aer job.
+
+    The parametric circuit is transpiled once (get_compiled_qaoa) and all
+    points are submitted together as parameter binds.
+    Feasibility (sum(cost_i * x_i) <= budget) is reported when costs and
+    budget are given, or taken from a KnapsackQubo.
+
+    Returns:
+        DataFrame with one row per point:
+        gamma, beta, best_energy, expected_energy, feasible_rate, best_bitstring
+    """
+    import pandas as pd
+
+    if isinstance(Q, KnapsackQubo):
+        costs = Q.costs if costs is None else costs
+        budget = Q.budget if budget is None else budget
+
+    points = [(float(g), float(b)) for g, b in points]
+
+    compiled, gamma, beta = get_compiled_qaoa(Q)
+    result = get_backend().run(
+        compiled,
+        shots=shots,
+        parameter_binds=[{
+            gamma[0]: [g for g, _ in points],
+            beta[0]: [b for _, b in points],
+        }]
+    ).result()
+
+    rows = []
+    for k, (g, b) in enumerate(points):
+        counts = result.get_counts(k)
+        bits = list(counts)
+        weights = np.fromiter(counts.values(), dtype=float, count=len(bits))
+
+        X = bitstrings_to_matrix(bits)
+        energies = qubo_energies(X, Q)
+        best_idx = int(np.argmin(energies))
+
+        if costs is not None and budget is not None:
+            feasible = (X @ np.asarray(costs, dtype=float)) <= budget
+            feasible_rate = float(weights[feasible].sum() / weights.sum())
+        else:
+            feasible_rate = float("nan")
+
+        rows.append({
+            "gamma": g,
+            "beta": b,
+            "best_energy": float(energies[best_idx]),
+            "expected_energy": float(weights @ energies / weights.sum()),
+            "feasible_rate": feasible_rate,
+            "best_bitstring": bits[best_idx],
+        })
+
+    return pd.DataFrame(rows)
+
+
+def qaoa_grid(gammas, betas):
+    """
+    Cartesian (gamma, beta) grid for sweep_qaoa_parameters.
+    """
+    return [(g, b) for g in gammas for b in betas]
+
+
+
+def expected_energy_statevector(qc, gamma, beta, params, diag):
+    """
+    Exact <psi(gamma, beta)| H_C |psi(gamma, beta)> from the statevector.
+
+    qc is the unmeasured circuit from build_qaoa_circuit and diag the
+    cost vector from qubo_energy_diagonal (computed once per QUBO).
+    """
+    qc_bound = qc.assign_parameters(bind_qaoa_parameters(gamma, beta, params))
+
+    probs = Statevector(qc_bound).probabilities()
+    return float(probs @ diag)
+
+
+def optimize_qaoa_angles(Q, p=1, init=None, method="COBYLA", maxiter=100):
+    """
+    Tune QAOA angles by minimizing the exact statevector expectation.
+
+    Uses scipy.optimize.minimize (COBYLA / Nelder-Mead / ...) on the
+    noise-free objective, so no shots are spent during the search.
+    init may hold scalars or per-layer lists for gamma and beta.
+    Returns:
+        dict with gamma, beta (floats for p=1, per-layer lists otherwise),
+        expected_energy, nfev
+    """
+    from scipy.optimize import minimize
+
+    n = Q.shape[0]
+    if n > MAX_STATEVECTOR_QUBITS:
+        raise ValueError(
+            f"Statevector mode supports up to {MAX_STATEVECTOR_QUBITS} qubits, got {n}."
+        )
+
+    qc, gamma, beta = build_qaoa_circuit(Q, p)
+    diag = qubo_energy_diagonal(Q)
+
+    if init is None:
+        init = {"gamma": 0.8, "beta": 0.7}
+
+    def objective(theta):
+        return expected_energy_statevector(
+            qc, gamma, beta, {"gamma": theta[:p], "beta": theta[p:]}, diag
+        )
+
+    x0 = np.concatenate([
+        _layer_values(init["gamma"], p),
+        _layer_values(init["beta"], p),
+    ])
+
+    res = minimize(objective, x0=x0, method=method, options={"maxiter": maxiter})
+
+    gammas, betas = res.x[:p], res.x[p:]
+    return {
+        "gamma": float(gammas[0]) if p == 1 else gammas.tolist(),
+        "beta": float(betas[0]) if p == 1 else betas.tolist(),
+        "expected_energy": float(res.fun),
+        "nfev": int(res.nfev),
+    }
+
+
+def interp_qaoa_params(gammas, betas):
+    """
+    INTERP warm start: depth p+1 angles from optimized depth-p angles.
+
+        x_i^(p+1) = (i / p) * x_{i-1}^(p) + ((p - i) / p) * x_i^(p),
+        i = 0..p, with x_{-1} = x_p = 0
+    """
+    def interp(x):
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        p = x.shape[0]
+        padded = np.concatenate([[0.0], x, [0.0]])
+        i = np.arange(p + 1)
+        return (i / p) * padded[i] + ((p - i) / p) * padded[i + 1]
+
+    return interp(gammas).tolist(), interp(betas).tolist()
+
+
+def optimize_qaoa_layers(Q, p_max, init=None, method="COBYLA", maxiter=100):
+    """
+    Optimize depth 1..p_max layer by layer, warm-starting each depth
+    from the INTERP of the previous optimum.
+    Returns:
+        dict as optimize_qaoa_angles for the depth with the lowest
+        expected energy (a deeper local optimum can be worse), plus p
+        (that depth), p_max, the total nfev and a per-depth history of
+        expected energies
+    """
+    result = optimize_qaoa_angles(Q, p=1, init=init, method=method, maxiter=maxiter)
+    result["p"] = 1
+    best = result
+    history = [result["expected_energy"]]
+    nfev = result["nfev"]
 
-    for bit, _cnt in counts.items():
-        E = compute_energy(bit, Q)
-        if E < best_energy:
-            best_energy = E
-            best_bit = bit
+    for p in range(2, p_max + 1):
+        gammas, betas = interp_qaoa_params(result["gamma"], result["beta"])
+        result = optimize_qaoa_angles(
+            Q, p=p, init={"gamma": gammas, "beta": betas}, method=method, maxiter=maxiter
+        )
+        result["p"] = p
+        history.append(result["expected_energy"])
+        nfev += result["nfev"]
+        if result["expected_energy"] < best["expected_energy"]:
+            best = result
 
-    return best_bit, best_energy, counts
\ No newline at end of file
+    best = dict(best)
+    best["p_max"] = p_max
+    best["nfev"] = nfev
+    best["history"] = history
+    return best
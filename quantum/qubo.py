@@ -3,7 +3,45 @@
 import numpy as np
 
 
-def build_qubo(df, budget, lambda_penalty):
+def qubo_terms(df, budget, lambda_penalty):
+    """
+    Structured form of the road QUBO: a diagonal plus a rank-1 outer product.
+
+        Q = diag(d) + u u^T
+
+    with u = sqrt(2 * lambda) * cost. The budget penalty couples every pair
+    of roads, so this is the compact representation of Q (O(n) memory);
+    a sparse matrix would still hold n^2 non-zeros.
+
+    Returns:
+        d, u (1-D float64 arrays of length n)
+    """
+
+    impacts = np.asarray(df["impact"], dtype=float)
+    costs = np.asarray(df["final_cost"], dtype=float)
+
+    # -------------------------
+    # Rank-1 budget coupling
+    # -------------------------
+    # 2 * lambda * c_i * c_j for every i != j
+    u = np.sqrt(2 * lambda_penalty) * costs
+
+    # -------------------------
+    # Diagonal terms
+    # -------------------------
+    # -impact_i + lambda * c_i^2 - 2 * lambda * B * c_i,
+    # minus the u_i^2 that the outer product adds on the diagonal
+    d = (
+        -impacts
+        + lambda_penalty * costs ** 2
+        - 2 * lambda_penalty * budget * costs
+        - u ** 2
+    )
+
+    return d, u
+
+
+def build_qubo(df, budget, lambda_penalty, structured=False):
     """
     Build a strong QUBO for road reconstruction using
     quadratic budget constraint (knapsack-style).
@@ -15,33 +53,172 @@ def build_qubo(df, budget, lambda_penalty):
     Converted to minimization:
         - sum(impact_i * x_i)
         + lambda * (sum(cost_i * x_i) - budget)^2
+
+    With structured=True the dense matrix is never materialized and the
+    (d, u) pair from qubo_terms is returned instead (Q = diag(d) + u u^T).
     """
 
-    n = len(df)
-    Q = np.zeros((n, n))
+    d, u = qubo_terms(df, budget, lambda_penalty)
 
-    impacts = df["impact"].values
-    costs = df["final_cost"].values
+    if structured:
+        return d, u
 
     # -------------------------
-    # Diagonal terms
+    # Dense assembly (whole-array)
     # -------------------------
-    for i in range(n):
-        # Impact term (maximize impact → minimize -impact)
-        Q[i, i] += -impacts[i]
+    Q = np.outer(u, u)
+    Q[np.diag_indices_from(Q)] += d
 
-        # Budget quadratic expansion:
-        # c_i^2 * x_i  - 2 * B * c_i * x_i
-        Q[i, i] += lambda_penalty * (costs[i] ** 2)
-        Q[i, i] += -2 * lambda_penalty * budget * costs[i]
+    return Q
 
-    # -------------------------
-    # Off-diagonal terms
-    # -------------------------
-    for i in range(n):
-        for j in range(i + 1, n):
-            # 2 * c_i * c_j * x_i * x_j
-            Q[i, j] += 2 * lambda_penalty * costs[i] * costs[j]
-            Q[j, i] = Q[i, j]  # symmetric
 
-    return Q
\ No newline at end of file
+def bitstrings_to_matrix(bitstrings):
+    """
+    Pack Qiskit bitstrings into one (samples x n) uint8 matrix in a single pass.
+
+    Qiskit order is reversed vs our x vector, so column i is road i.
+    """
+    bitstrings = [b.replace(" ", "") for b in bitstrings]
+    if not bitstrings:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    n = len(bitstrings[0])
+    raw = np.frombuffer("".join(bitstrings).encode("ascii"), dtype=np.uint8)
+    X = raw.reshape(len(bitstrings), n) - ord("0")
+
+    return np.ascontiguousarray(X[:, ::-1])
+
+
+def qubo_energies(X, Q):
+    """
+    Energies x^T Q x for every row of a (samples x n) 0/1 matrix at once.
+    """
+    if isinstance(Q, KnapsackQubo):
+        return Q.energies(X)
+
+    X = np.asarray(X, dtype=float)
+    return np.einsum("ij,ij->i", X @ Q, X)
+
+
+def score_counts(counts, Q):
+    """
+    Energies of all distinct bitstrings in a counts dict, as an array
+    aligned with the iteration order of counts.
+    """
+    X = bitstrings_to_matrix(list(counts))
+    return qubo_energies(X, Q)
+
+
+def qubo_energy_diagonal(Q):
+    """
+    Energies of all 2^n basis states as one vector (the diagonal of H_C).
+
+    Index k encodes x_i = (k >> i) & 1, matching the Qiskit statevector
+    ordering. Built by doubling: adding bit k appends a shifted copy of
+    the energies over the first k bits, so the cost is O(2^n).
+    """
+    if isinstance(Q, KnapsackQubo):
+        d, u = Q.d, Q.u
+        lin = np.zeros(1)
+        quad = np.zeros(1)
+        for i in range(len(Q)):
+            lin = np.concatenate([lin, lin + d[i]])
+            quad = np.concatenate([quad, quad + u[i]])
+        return lin + quad ** 2
+
+    Q = np.asarray(Q, dtype=float)
+    n = Q.shape[0]
+    W = Q + Q.T
+
+    E = np.zeros(1)
+    for k in range(n):
+        # sum_{j<k} (Q_kj + Q_jk) x_j over all states of the first k bits
+        field = np.zeros(1)
+        for j in range(k):
+            field = np.concatenate([field, field + W[k, j]])
+
+        E = np.concatenate([E, E + Q[k, k] + field])
+
+    return E
+
+
+class KnapsackQubo:
+    """
+    Low-rank road QUBO that never materializes the n x n matrix.
+
+    Stores only impacts, costs, budget and lambda_penalty. Energies match
+    x^T Q x for the Q returned by build_qubo, but are evaluated in O(n):
+
+        E(x) = d . x + (u . x)^2
+    """
+
+    def __init__(self, impacts, costs, budget, lambda_penalty):
+        self.impacts = np.asarray(impacts, dtype=float)
+        self.costs = np.asarray(costs, dtype=float)
+        self.budget = budget
+        self.lambda_penalty = lambda_penalty
+
+        self.d, self.u = qubo_terms(
+            {"impact": self.impacts, "final_cost": self.costs},
+            budget,
+            lambda_penalty
+        )
+
+    @classmethod
+    def from_dataframe(cls, df, budget, lambda_penalty):
+        return cls(df["impact"], df["final_cost"], budget, lambda_penalty)
+
+    def __len__(self):
+        return self.d.shape[0]
+
+    @property
+    def shape(self):
+        return (len(self), len(self))
+
+    def diagonal(self):
+        """Diagonal of Q (Q_ii = d_i + u_i^2)."""
+        return self.d + self.u ** 2
+
+    def to_dense(self):
+        """Export the dense Q (e.g. for the Qiskit circuit builder)."""
+        Q = np.outer(self.u, self.u)
+        Q[np.diag_indices_from(Q)] += self.d
+        return Q
+
+    # -------------------------------------------------
+    # Energies
+    # -------------------------------------------------
+    def energy(self, x):
+        x = np.asarray(x, dtype=float)
+        return float(self.d @ x + (self.u @ x) ** 2)
+
+    def energies(self, X):
+        """Batched energies for a (samples x n) 0/1 matrix."""
+        X = np.asarray(X, dtype=float)
+        return X @ self.d + (X @ self.u) ** 2
+
+    # -------------------------------------------------
+    # Single-bit flips
+    # -------------------------------------------------
+    def flip_deltas(self, x):
+        """
+        Energy change of flipping each bit of x, for all n bits at once.
+
+        dE_i = (1 - 2 x_i) * (Q_ii + 2 * sum_{j != i} Q_ij x_j)
+        """
+        x = np.asarray(x, dtype=float)
+        s = self.u @ x
+        field = self.diagonal() + 2 * self.u * (s - self.u * x)
+        return (1 - 2 * x) * field
+
+    def flip_delta(self, x, i):
+        x = np.asarray(x, dtype=float)
+        s = self.u @ x
+        field = self.d[i] + self.u[i] ** 2 + 2 * self.u[i] * (s - self.u[i] * x[i])
+        return float((1 - 2 * x[i]) * field)
+
+    def total_cost(self, x):
+        return float(self.costs @ np.asarray(x, dtype=float))
+
+    def is_feasible(self, x):
+        return self.total_cost(x) <= self.budget
@@ -0,0 +1,153 @@
+# quantum/road_set.py
+
+import numpy as np
+import pandas as pd
+
+
+# Storage dtype per known column; other numeric columns default by kind.
+# Only ids, counts and coordinates are narrowed: money and score columns
+# stay float64 so budget sums are exact to the decimal (float32 sums of
+# one-decimal costs can exceed the budget they exactly meet).
+ROAD_DTYPES = {
+    "id": np.int32,
+    "damage": np.float64,
+    "population": np.int32,
+    "distance_to_hospital": np.float64,
+    "aid_route": np.float64,
+    "base_cost": np.float64,
+    "lat": np.float32,
+    "lon": np.float32,
+    "hospital_score": np.float64,
+    "land_use_factor": np.float64,
+    "soil_factor": np.float64,
+    "final_cost": np.float64,
+    "impact": np.float64,
+    "selected": np.int8,
+}
+
+
+def _storage_dtype(name, values):
+    if name in ROAD_DTYPES:
+        return ROAD_DTYPES[name]
+    if values.dtype.kind == "b":
+        return np.int8
+    if values.dtype.kind in "iu":
+        return np.int32
+    return np.float64
+
+
+class RoadView:
+    """
+    Lightweight view of one road in a RoadSet (attribute or key access).
+    """
+
+    __slots__ = ("_roads", "_i")
+
+    def __init__(self, roads, i):
+        self._roads = roads
+        self._i = i
+
+    def __getitem__(self, name):
+        return self._roads.value(name, self._i)
+
+    def __getattr__(self, name):
+        try:
+            return self._roads.value(name, self._i)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        fields = ", ".join(f"{c}={self[c]!r}" for c in self._roads.columns)
+        return f"RoadView({fields})"
+
+
+class RoadSet:
+    """
+    Struct-of-arrays road store for the hot path.
+
+    Numeric columns are NumPy arrays (float64 money / scores, int32 ids
+    and counts, float32 coordinates), string columns (zone, land_use,
+    soil, ...) are int32 codes plus their categories.
+    roads[col] / roads[col] = values mirror the DataFrame column API, so
+    feature engineering, KnapsackQubo.from_dataframe, ImpactScorer, the
+    plan builder and the map accept a RoadSet directly; convert with
+    to_dataframe only at the UI boundary.
+    """
+
+    def __init__(self, columns=None, categories=None):
+        self._columns = dict(columns or {})
+        self._categories = dict(categories or {})
+
+    @classmethod
+    def from_dataframe(cls, df):
+        roads = cls()
+        for col in df.columns:
+            roads[col] = df[col]
+        return roads
+
+    def to_dataframe(self, columns=None):
+        return pd.DataFrame({c: self[c] for c in (columns or self.columns)})
+
+    # -------------------------------------------------
+    # Column access
+    # -------------------------------------------------
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __len__(self):
+        if not self._columns:
+            return 0
+        return len(next(iter(self._columns.values())))
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, name):
+        values = self._columns[name]
+        if name in self._categories:
+            return pd.Categorical.from_codes(values, self._categories[name], validate=False)
+        return values
+
+    def __setitem__(self, name, values):
+        if self._columns and len(values) != len(self):
+            raise ValueError(f"Column '{name}' has {len(values)} rows, RoadSet has {len(self)}.")
+
+        if isinstance(values, pd.Series):
+            values = values.array
+
+        if not isinstance(values, pd.Categorical):
+            arr = np.asarray(values)
+            if arr.dtype.kind in "biuf":
+                self._columns[name] = arr.astype(_storage_dtype(name, arr), copy=False)
+                self._categories.pop(name, None)
+                return
+            values = pd.Categorical(arr)
+
+        self._columns[name] = values.codes.astype(np.int32, copy=False)
+        self._categories[name] = values.categories
+
+    def value(self, name, i):
+        """Scalar value of column name at row i."""
+        v = self._columns[name][i]
+        if name in self._categories:
+            return self._categories[name][v] if v >= 0 else None
+        return v.item()
+
+    # -------------------------------------------------
+    # Rows / copies
+    # -------------------------------------------------
+    def __iter__(self):
+        for i in range(len(self)):
+            yield RoadView(self, i)
+
+    def row(self, i):
+        return RoadView(self, i)
+
+    def copy(self, deep=True):
+        columns = {c: a.copy() for c, a in self._columns.items()} if deep else self._columns
+        return RoadSet(columns, self._categories)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self._columns.values())
@@ -0,0 +1,459 @@
+# quantum/solvers.py
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from quantum.annealing import anneal_knapsack_batch, sample_anneal
+from quantum.qubo import KnapsackQubo, qubo_energies, qubo_energy_diagonal, qubo_terms, score_counts
+
+
+# Exact enumeration is O(2^n)
+MAX_EXACT_ROADS = 30
+# solve_exact_batch scores all 2^n states of every problem in one matmul
+MAX_BATCH_EXACT_ROADS = 12
+# solve_anneal_batch keeps at most this many replica x road cells per sweep loop
+BATCH_ANNEAL_CELLS = 2_000_000
+
+
+# =========================================================
+# Helpers
+# =========================================================
+def _dense(Q):
+    if isinstance(Q, KnapsackQubo):
+        return Q.to_dense()
+    return np.asarray(Q, dtype=float)
+
+
+def _to_bitstring(x):
+    """x vector -> Qiskit-order bitstring (reversed), as used by the plan builder."""
+    return "".join(str(int(b)) for b in np.asarray(x)[::-1])
+
+
+def _result(solver, Q, x, started, **extra):
+    x = np.asarray(x, dtype=np.uint8)
+    bitstring = _to_bitstring(x)
+    result = {
+        "solver": solver,
+        "bitstring": bitstring,
+        "x": x,
+        "energy": float(qubo_energies(x[None, :], Q)[0]),
+        "counts": {bitstring: 1},
+        "time_s": time.perf_counter() - started,
+    }
+    if isinstance(Q, KnapsackQubo):
+        result["total_cost"] = Q.total_cost(x)
+        result["total_impact"] = float(Q.impacts @ x)
+        result["feasible"] = Q.is_feasible(x)
+    result.update(extra)
+    return result
+
+
+def _linear_states(v):
+    """sum_i v_i x_i for all 2^k states of len(v) bits (Qiskit index order)."""
+    out = np.zeros(1)
+    for vi in v:
+        out = np.concatenate([out, out + vi])
+    return out
+
+
+class _FlipState:
+    """
+    Incremental single-bit-flip bookkeeping for local search.
+
+    Keeps the local fields so that all n flip deltas cost O(n) and a flip
+    costs O(n) (dense Q) or O(1) (KnapsackQubo).
+    """
+
+    def __init__(self, Q, x):
+        self.x = np.asarray(x, dtype=float).copy()
+        self.lowrank = isinstance(Q, KnapsackQubo)
+
+        if self.lowrank:
+            self.qdiag = Q.diagonal()
+            self.u = Q.u
+            self.s = float(self.u @ self.x)
+        else:
+            Q = np.asarray(Q, dtype=float)
+            self.qdiag = np.diag(Q).copy()
+            self.W = Q + Q.T
+            self.field = self.W @ self.x
+
+    def deltas(self):
+        x = self.x
+        if self.lowrank:
+            field = self.qdiag + 2 * self.u * (self.s - self.u * x)
+        else:
+            field = self.qdiag + self.field - np.diag(self.W) * x
+        return (1 - 2 * x) * field
+
+    def couplings(self, I, J):
+        """W_ij = Q_ij + Q_ji for rows I x columns J (disjoint index sets)."""
+        if self.lowrank:
+            return 2 * np.outer(self.u[I], self.u[J])
+        return self.W[np.ix_(I, J)]
+
+    def flip(self, j):
+        sign = 1 - 2 * self.x[j]
+        self.x[j] = 1 - self.x[j]
+        if self.lowrank:
+            self.s += sign * self.u[j]
+        else:
+            self.field += sign * self.W[:, j]
+
+
+# =========================================================
+# Backends
+# =========================================================
+def solve_exact(Q, block_bits=16):
+    """
+    Exact minimum by Gray-code enumeration (n <= MAX_EXACT_ROADS).
+
+    The lowest block_bits bits are enumerated as one vector of energies;
+    the remaining high bits are walked in Gray-code order, so every step
+    flips one bit and updates the whole block incrementally.
+    """
+    started = time.perf_counter()
+
+    D = _dense(Q)
+    n = D.shape[0]
+    if n > MAX_EXACT_ROADS:
+        raise ValueError(f"Exact enumeration supports up to {MAX_EXACT_ROADS} roads, got {n}.")
+
+    k = min(n, block_bits)
+    h = n - k
+    W = D + D.T
+
+    E = qubo_energy_diagonal(D[:k, :k])
+    couple = [_linear_states(W[k + j, :k]) for j in range(h)]
+
+    Dh = D[k:, k:]
+    Wh = W[k:, k:]
+    xh = np.zeros(h)
+
+    best_idx = int(np.argmin(E))
+    best_E = E[best_idx]
+    best_xh = xh.copy()
+
+    for step in range(1, 2 ** h):
+        # Gray code: flip the lowest set bit of the step counter
+        j = (step & -step).bit_length() - 1
+        sign = 1 - 2 * xh[j]
+
+        E += sign * (Dh[j, j] + Wh[j] @ xh - Wh[j, j] * xh[j])
+        E += sign * couple[j]
+        xh[j] = 1 - xh[j]
+
+        i = int(np.argmin(E))
+        if E[i] < best_E:
+            best_E, best_idx, best_xh = E[i], i, xh.copy()
+
+    x_low = (best_idx >> np.arange(k)) & 1
+    x = np.concatenate([x_low, best_xh]).astype(np.uint8)
+
+    return _result("exact", Q, x, started)
+
+
+def solve_knapsack_dp(Q, resolution=0.1):
+    """
+    Exact 0/1 knapsack DP on impact / final_cost (maximize impact s.t. budget).
+
+    Costs are rounded UP to multiples of resolution, so the result is
+    always within budget. Needs a KnapsackQubo (impacts, costs, budget).
+    """
+    started = time.perf_counter()
+
+    if not isinstance(Q, KnapsackQubo):
+        raise TypeError("knapsack_dp needs a KnapsackQubo (impacts, costs, budget).")
+
+    n = len(Q)
+    w = np.ceil(Q.costs / resolution - 1e-9).astype(int)
+    cap = int(np.floor(Q.budget / resolution + 1e-9))
+
+    dp = np.zeros(cap + 1)
+    take = np.zeros((n, cap + 1), dtype=bool)
+
+    for i in range(n):
+        if w[i] > cap:
+            continue
+        cand = np.full(cap + 1, -np.inf)
+        cand[w[i]:] = dp[:cap + 1 - w[i]] + Q.impacts[i]
+        take[i] = cand > dp
+        dp = np.maximum(dp, cand)
+
+    x = np.zeros(n, dtype=np.uint8)
+    c = cap
+    for i in range(n - 1, -1, -1):
+        if take[i, c]:
+            x[i] = 1
+            c -= w[i]
+
+    return _result("knapsack_dp", Q, x, started)
+
+
+def solve_anneal(Q, sweeps=200, replicas=256, schedule="geometric", beta_range=None, seed=None):
+    """
+    Vectorized simulated annealing over many parallel replicas
+    (see quantum.annealing). The replica distribution is kept as counts.
+    """
+    started = time.perf_counter()
+
+    counts = sample_anneal(
+        Q,
+        num_replicas=replicas,
+        num_sweeps=sweeps,
+        schedule=schedule,
+        beta_range=beta_range,
+        seed=seed
+    )
+
+    energies = score_counts(counts, Q)
+    best_bit = list(counts)[int(np.argmin(energies))]
+
+    x = np.array([int(b) for b in best_bit[::-1]])
+    result = _result("anneal", Q, x, started)
+    result["counts"] = counts
+    return result
+
+
+def solve_tabu(Q, max_iter=None, tenure=None, patience=None, seed=None, swap_candidates=256):
+    """
+    Tabu search over single-bit flips and 1-for-1 swaps, with aspiration
+    on the best energy.
+
+    A swap drops one selected road and adds one unselected road in a
+    single move, so the search can trade roads along the budget without
+    climbing the lambda penalty that every single flip crosses. All
+    drop x add pairs are scored at once (a random swap_candidates per
+    side when there are more):
+
+        dE(i, j) = dE_i + dE_j - W_ij    (x_i = 1, x_j = 0)
+
+    Tenure is randomized per move, and the search restarts from a
+    perturbed copy of the best solution after `patience` moves without
+    improvement (penalty landscapes cycle otherwise).
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+
+    n = len(Q) if isinstance(Q, KnapsackQubo) else Q.shape[0]
+    max_iter = max_iter or 100 * n
+    # Short tenure: a swap makes two bits tabu at once
+    tenure = tenure or max(3, n // 10)
+    patience = patience or 10 * n
+
+    state = _FlipState(Q, rng.integers(0, 2, n))
+    energy = float(qubo_energies(state.x[None, :], Q)[0])
+    best_E, best_x = energy, state.x.copy()
+    tabu_until = np.zeros(n, dtype=int)
+    last_improved = 0
+
+    for it in range(max_iter):
+        if it - last_improved > patience:
+            x = best_x.copy()
+            kick = rng.choice(n, size=max(1, n // 5), replace=False)
+            x[kick] = 1 - x[kick]
+            state = _FlipState(Q, x)
+            energy = float(qubo_energies(state.x[None, :], Q)[0])
+            tabu_until[:] = 0
+            last_improved = it
+
+        deltas = state.deltas()
+        free = tabu_until <= it
+
+        # Best single flip
+        flip_delta = np.where(free | (energy + deltas < best_E), deltas, np.inf)
+        j = int(np.argmin(flip_delta))
+        move, move_delta = (j,), flip_delta[j]
+
+        # Best swap (drop i, add j)
+        I = np.flatnonzero(state.x == 1)
+        J = np.flatnonzero(state.x == 0)
+        if len(I) and len(J):
+            if len(I) > swap_candidates:
+                I = rng.choice(I, swap_candidates, replace=False)
+            if len(J) > swap_candidates:
+                J = rng.choice(J, swap_candidates, replace=False)
+            pair = deltas[I][:, None] + deltas[J][None, :] - state.couplings(I, J)
+            pair = np.where((free[I][:, None] & free[J][None, :]) | (energy + pair < best_E), pair, np.inf)
+            a, b = np.unravel_index(int(np.argmin(pair)), pair.shape)
+            if pair[a, b] < move_delta:
+                move, move_delta = (I[a], J[b]), pair[a, b]
+
+        if not np.isfinite(move_delta):
+            continue
+
+        for j in move:
+            state.flip(j)
+            tabu_until[j] = it + tenure + int(rng.integers(0, tenure + 1))
+        energy += move_delta
+
+        if energy < best_E:
+            best_E, best_x = energy, state.x.copy()
+            last_improved = it
+
+    return _result("tabu", Q, best_x, started)
+
+
+def solve_qaoa(Q, params=None, p=1, shots=1024, autotune=False):
+    """
+    QAOA on the Aer simulator (qiskit is only imported for this backend).
+    """
+    from quantum.qaoa_solver import (
+        get_compiled_qaoa,
+        optimize_qaoa_layers,
+        run_qaoa_and_extract_solution,
+    )
+
+    started = time.perf_counter()
+
+    params = params or {"gamma": 0.8, "beta": 0.7}
+    if autotune:
+        params = optimize_qaoa_layers(Q, p, init=params)
+        # The best depth may be shallower than requested
+        p = params["p"]
+
+    qc, gamma, beta = get_compiled_qaoa(Q, p=p)
+    best_bit, _energy, counts = run_qaoa_and_extract_solution(
+        qc=qc,
+        gamma=gamma,
+        beta=beta,
+        params=params,
+        Q=Q,
+        shots=shots,
+        compiled=True
+    )
+
+    x = np.array([int(b) for b in best_bit[::-1]])
+    result = _result("qaoa", Q, x, started, params=params)
+    result["counts"] = counts
+    return result
+
+
+SOLVERS = {
+    "qaoa": solve_qaoa,
+    "exact": solve_exact,
+    "knapsack_dp": solve_knapsack_dp,
+    "anneal": solve_anneal,
+    "tabu": solve_tabu,
+}
+
+
+# =========================================================
+# Common interface
+# =========================================================
+def solve_roads(Q, solver="qaoa", **options):
+    """
+    Solve the road QUBO with one backend from SOLVERS.
+
+    Every backend returns a dict with solver, bitstring (Qiskit order),
+    x, energy, counts and time_s (plus cost / impact / feasibility for a
+    KnapsackQubo), so generate_recovery_plan works with any of them.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}'. Choose from {sorted(SOLVERS)}.")
+    return SOLVERS[solver](Q, **options)
+
+
+def optimality_gap(energy, reference_energy):
+    """
+    Relative gap (E - E*) / |E*| to the exact minimum energy.
+    """
+    return float((energy - reference_energy) / max(1e-9, abs(reference_energy)))
+
+
+def race_solvers(Q, solvers, options=None, max_workers=None, reference=True):
+    """
+    Run several backends concurrently on the same QUBO.
+
+    With reference=True (and n <= MAX_EXACT_ROADS) every result also gets
+    an optimality_gap against the exact minimum. An exact run added only
+    for that is tagged reference=True and sorted last, so it never wins.
+    Returns:
+        list of result dicts, best (lowest energy) requested solver first
+    """
+    options = options or {}
+    solvers = list(solvers)
+
+    n = len(Q) if isinstance(Q, KnapsackQubo) else Q.shape[0]
+    add_reference = reference and n <= MAX_EXACT_ROADS and "exact" not in solvers
+    if add_reference:
+        solvers.append("exact")
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(solvers)) as pool:
+        # copy_context so instrumentation spans inside backends reach the active run
+        futures = [
+            pool.submit(contextvars.copy_context().run, solve_roads, Q, name, **options.get(name, {}))
+            for name in solvers
+        ]
+        results = [f.result() for f in futures]
+
+    if add_reference:
+        results[-1]["reference"] = True
+
+    exact = next((r for r in results if r["solver"] == "exact"), None)
+    if exact is not None:
+        for r in results:
+            r["optimality_gap"] = optimality_gap(r["energy"], exact["energy"])
+
+    return sorted(results, key=lambda r: (r.get("reference", False), r["energy"]))
+
+
+# =========================================================
+# Batched (many problems, one inventory)
+# =========================================================
+def solve_exact_batch(impacts, costs, budget, lambda_penalty):
+    """
+    Exact minima of many small road QUBOs at once (e.g. Monte Carlo
+    scenarios of one inventory). Row s of impacts / costs is problem s.
+
+    Energies of all 2^n states (index k -> x_i = (k >> i) & 1) are
+    E = D X^T + (U X^T)^2 for the stacked qubo_terms (D, U), so the
+    whole batch is two matmuls; n <= MAX_BATCH_EXACT_ROADS.
+    Returns:
+        X (problems x n, uint8), energies (problems,)
+    """
+    d, u = qubo_terms({"impact": np.atleast_2d(impacts), "final_cost": np.atleast_2d(costs)}, budget, lambda_penalty)
+
+    n = d.shape[1]
+    if n > MAX_BATCH_EXACT_ROADS:
+        raise ValueError(f"Batched enumeration supports up to {MAX_BATCH_EXACT_ROADS} roads, got {n}.")
+
+    states = ((np.arange(2 ** n)[:, None] >> np.arange(n)) & 1).astype(float)
+    E = d @ states.T + (u @ states.T) ** 2
+
+    best = np.argmin(E, axis=1)
+    return states[best].astype(np.uint8), E[np.arange(len(E)), best]
+
+
+def solve_anneal_batch(impacts, costs, budget, lambda_penalty, sweeps=100, replicas=32,
+                       schedule="geometric", beta_range=None, seed=None):
+    """
+    Simulated annealing of many road QUBOs at once (any n). Each problem
+    gets a block of replicas in one anneal_knapsack_batch run; problems
+    are split into runs of at most BATCH_ANNEAL_CELLS replica x road cells.
+    Returns:
+        X (problems x n, uint8), energies (problems,)
+    """
+    d, u = qubo_terms({"impact": np.atleast_2d(impacts), "final_cost": np.atleast_2d(costs)}, budget, lambda_penalty)
+
+    rng = np.random.default_rng(seed)
+    step = max(1, BATCH_ANNEAL_CELLS // (replicas * max(1, d.shape[1])))
+
+    X, energies = [], []
+    for start in range(0, len(d), step):
+        X_b, E_b = anneal_knapsack_batch(
+            d[start:start + step],
+            u[start:start + step],
+            num_replicas=replicas,
+            num_sweeps=sweeps,
+            schedule=schedule,
+            beta_range=beta_range,
+            seed=rng.integers(2 ** 32)
+        )
+        X.append(X_b)
+        energies.append(E_b)
+
+    return np.concatenate(X), np.concatenate(energies)
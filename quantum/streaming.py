@@ -0,0 +1,125 @@
+# quantum/streaming.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from quantum.data_loader import ROAD_SCHEMA
+from quantum.feature_engineering import engineer_context_features
+from quantum.impact_scoring import compute_impact_scores, impact_stats, merge_impact_stats
+
+
+def iter_road_chunks(source, chunk_size=100_000, columns=None):
+    """
+    Yield the road inventory as DataFrames of at most chunk_size rows.
+
+    source may be a DataFrame, a .parquet file (row batches), an Arrow
+    IPC / Feather file (memory-mapped record batches) or a directory of
+    <column>.npy files (memory-mapped slices). Only one chunk is decoded
+    at a time.
+    """
+    columns = list(columns) if columns is not None else list(ROAD_SCHEMA)
+
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            yield source.iloc[start:start + chunk_size][columns].copy()
+        return
+
+    if os.path.isdir(source):
+        arrays = {c: np.load(os.path.join(source, c + ".npy"), mmap_mode="r") for c in columns}
+        n = len(arrays[columns[0]])
+        for start in range(0, n, chunk_size):
+            yield pd.DataFrame({c: np.asarray(a[start:start + chunk_size]) for c, a in arrays.items()})
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if source.endswith(".parquet"):
+        batches = pq.ParquetFile(source, memory_map=True).iter_batches(
+            batch_size=chunk_size, columns=columns
+        )
+    else:
+        table = pa.ipc.open_file(pa.memory_map(source, "r")).read_all().select(columns)
+        batches = table.to_batches(max_chunksize=chunk_size)
+
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+def collect_impact_stats(source, chunk_size=100_000):
+    """
+    Pass 1: global min/max of the impact indicators, chunk by chunk.
+    """
+    stats = None
+    for chunk in iter_road_chunks(source, chunk_size):
+        chunk = engineer_context_features(chunk)
+        stats = merge_impact_stats(stats, impact_stats(chunk))
+    return stats
+
+
+def iter_scored_chunks(source, weights, stats, chunk_size=100_000):
+    """
+    Pass 2: feature engineering + impact scoring with fixed global stats.
+    """
+    for chunk in iter_road_chunks(source, chunk_size):
+        chunk = engineer_context_features(chunk)
+        yield compute_impact_scores(chunk, weights, stats=stats)
+
+
+def _top_candidates(current, chunk, top_k, rank_by):
+    """Keep the top_k rows by rank_by across the current pool and a new chunk."""
+    pool = chunk if current is None else pd.concat([current, chunk], ignore_index=True)
+    if len(pool) <= top_k:
+        return pool
+
+    if rank_by == "ratio":
+        key = pool["impact"].to_numpy() / pool["final_cost"].to_numpy()
+    else:
+        key = pool[rank_by].to_numpy()
+
+    keep = np.argpartition(-key, top_k - 1)[:top_k]
+    return pool.iloc[np.sort(keep)].reset_index(drop=True)
+
+
+def run_streaming_pipeline(source, weights, out_dir, chunk_size=100_000,
+                           top_k=20, rank_by="ratio"):
+    """
+    Score a road inventory larger than RAM with bounded memory.
+
+    1. Collect global normalization stats (first pass).
+    2. Engineer + score every chunk with those stats (second pass),
+       writing each scored chunk to out_dir/part-XXXXX.parquet.
+    3. Keep the top_k candidates (by impact / cost ratio or a column)
+       for the QUBO, so build_qubo only ever sees a small road set.
+    Returns:
+        dict with parts, rows, stats and the candidates DataFrame
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Parts from an earlier run would otherwise be mixed into this one
+    for f in os.listdir(out_dir):
+        if f.startswith("part-") and f.endswith(".parquet"):
+            os.remove(os.path.join(out_dir, f))
+
+    stats = collect_impact_stats(source, chunk_size)
+
+    parts = []
+    rows = 0
+    candidates = None
+
+    for k, chunk in enumerate(iter_scored_chunks(source, weights, stats, chunk_size)):
+        part = os.path.join(out_dir, f"part-{k:05d}.parquet")
+        chunk.to_parquet(part, index=False)
+        parts.append(part)
+
+        rows += len(chunk)
+        candidates = _top_candidates(candidates, chunk, top_k, rank_by)
+
+    return {
+        "parts": parts,
+        "rows": rows,
+        "stats": stats,
+        "candidates": candidates,
+    }
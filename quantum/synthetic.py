@@ -0,0 +1,151 @@
+# quantum/synthetic.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from quantum.data_loader import ROAD_SCHEMA
+
+
+# Gaza Strip bounding box (approx.)
+GAZA_BBOX = {"lat": (31.22, 31.60), "lon": (34.20, 34.57)}
+
+# Real zone names are used first, then "Zone 0009", "Zone 0010", ...
+GAZA_ZONES = [
+    "Gaza City", "North Gaza", "Jabalia Camp", "Deir al-Balah",
+    "Nuseirat Camp", "Khan Younis", "Rafah", "Bureij Camp",
+]
+
+LAND_USE_P = {"residential": 0.55, "mixed": 0.30, "industrial": 0.15}
+SOIL_P = {"sandy": 0.55, "compact": 0.45}
+
+
+def generate_zone_data(n_zones=8, seed=0):
+    """
+    Seeded zone table with the same columns as zones_data + BASE_COUNTS
+    in app.py (plus a centroid), with distributions matched to them.
+    """
+    rng = np.random.default_rng(seed)
+
+    names = GAZA_ZONES[:n_zones] + [f"Zone {i:04d}" for i in range(len(GAZA_ZONES), n_zones)]
+
+    # -------------------------------------------------
+    # Demographics + damage (75k – 650k people, 65 – 90 % damage)
+    # -------------------------------------------------
+    population = np.clip(rng.lognormal(np.log(250_000), 0.65, n_zones), 50_000, 800_000)
+    population = (np.round(population / 5000) * 5000).astype(int)
+
+    damage_pct = np.clip(np.round(rng.normal(80, 8, n_zones)), 50, 98).astype(int)
+    service = rng.integers(2, 6, n_zones)
+    displaced = np.round(np.clip(rng.normal(0.55, 0.09, n_zones), 0.3, 0.8), 2)
+
+    # -------------------------------------------------
+    # Baseline capacity (per-capita rates of the real zones)
+    # -------------------------------------------------
+    hospitals = np.maximum(1, np.round(population / 100_000 * rng.uniform(0.7, 1.0, n_zones))).astype(int)
+    schools = np.maximum(4, np.round(population / 11_500 * rng.uniform(0.85, 1.15, n_zones))).astype(int)
+    housing = np.round(population / 5.9 * rng.uniform(0.9, 1.1, n_zones), -3).astype(int)
+    road_index = np.round(rng.uniform(0.40, 0.55, n_zones), 2)
+
+    lat = rng.uniform(*GAZA_BBOX["lat"], n_zones)
+    lon = rng.uniform(*GAZA_BBOX["lon"], n_zones)
+
+    return pd.DataFrame({
+        "Zone": names,
+        "Population": population,
+        "DamagePct": damage_pct,
+        "ServiceAvail": service,
+        "DisplacedRatio": displaced,
+        "Hospitals_Base": hospitals,
+        "Schools_Base": schools,
+        "HousingUnits_Base": housing,
+        "RoadIndex_Base": road_index,
+        "lat": lat,
+        "lon": lon,
+    })
+
+
+def generate_road_data(n_roads=1000, zones=8, seed=0):
+    """
+    Seeded road inventory with the load_road_data schema.
+
+    zones is a zone table from generate_zone_data or a zone count. Roads
+    are assigned to zones in proportion to population and scattered
+    around the zone centroid inside the Strip's bounding box.
+    """
+    rng = np.random.default_rng(seed)
+
+    if not isinstance(zones, pd.DataFrame):
+        zones = generate_zone_data(zones, seed=seed)
+
+    share = zones["Population"].to_numpy(dtype=float)
+    z = rng.choice(len(zones), size=n_roads, p=share / share.sum())
+
+    zone_damage = zones["DamagePct"].to_numpy() / 100.0
+
+    # -------------------------------------------------
+    # Indicators (ranges of the inline sample roads)
+    # -------------------------------------------------
+    damage = np.round(np.clip(rng.normal(zone_damage[z], 0.12), 0.2, 1.0), 2)
+    population = (np.round(rng.lognormal(np.log(14_000), 0.35, n_roads) / 500) * 500).astype(int)
+    distance = np.round(np.clip(rng.gamma(2.0, 0.8, n_roads), 0.1, 8.0), 1)
+    aid_route = np.round(rng.uniform(0.4, 1.0, n_roads), 1)
+
+    land_use = rng.choice(list(LAND_USE_P), size=n_roads, p=list(LAND_USE_P.values()))
+    soil = rng.choice(list(SOIL_P), size=n_roads, p=list(SOIL_P.values()))
+    base_cost = rng.integers(3, 10, n_roads)
+
+    lat = np.clip(zones["lat"].to_numpy()[z] + rng.normal(0, 0.01, n_roads), *GAZA_BBOX["lat"])
+    lon = np.clip(zones["lon"].to_numpy()[z] + rng.normal(0, 0.01, n_roads), *GAZA_BBOX["lon"])
+
+    ids = np.arange(n_roads)
+
+    return pd.DataFrame({
+        "id": ids,
+        "zone": zones["Zone"].to_numpy()[z],
+        "road_name": np.char.add("Road ", ids.astype(str)),
+        "damage": damage,
+        "population": population,
+        "distance_to_hospital": distance,
+        "aid_route": aid_route,
+        "land_use": land_use,
+        "soil": soil,
+        "base_cost": base_cost,
+        "lat": np.round(lat, 4),
+        "lon": np.round(lon, 4),
+    })
+
+
+def write_road_data(df, path, fmt="parquet"):
+    """
+    Write a road table in a format load_road_table reads:
+    "parquet", "arrow" (Arrow IPC / Feather) or "npy" (column directory).
+    """
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "arrow":
+        df.reset_index(drop=True).to_feather(path)
+    elif fmt == "npy":
+        os.makedirs(path, exist_ok=True)
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if ROAD_SCHEMA.get(col) == "string" or values.dtype == object:
+                # fixed-width unicode so the column stays memory-mappable
+                values = values.astype(str)
+            np.save(os.path.join(path, col + ".npy"), values)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'. Use 'parquet', 'arrow' or 'npy'.")
+
+    return path
+
+
+def write_zone_data(df, path):
+    """
+    Write a zone table as Parquet (.parquet) or CSV (anything else).
+    """
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
@@ -1,12 +1,15 @@
 # visualization/map_view.py
 
 import folium
+import numpy as np
 from folium.plugins import HeatMap
 
 
 def visualize_gaza_dashboard(df):
     """
     Create an interactive Gaza reconstruction map using Folium.
+
+    df may be a DataFrame or a RoadSet (rows are read column-wise).
     """
 
     # -------------------------------------------------
@@ -32,20 +35,26 @@ def visualize_gaza_dashboard(df):
     # -------------------------------------------------
     # Roads (Selected vs Deferred)
     # -------------------------------------------------
-    for _, r in df.iterrows():
+    cols = ["id", "selected", "impact", "final_cost", "population", "lat", "lon", "damage"]
+    rows = zip(*(np.asarray(df[c]).tolist() for c in cols))
+
+    heat_data = []
+    for road_id, selected, impact, cost, population, lat, lon, damage in rows:
 
-        color = "green" if r["selected"] == 1 else "red"
+        color = "green" if selected == 1 else "red"
 
         popup_text = f"""
-        <b>Road ID:</b> {r['id']}<br>
-        <b>Status:</b> {"Rebuild" if r['selected'] == 1 else "Deferred"}<br>
-        <b>Impact:</b> {r['impact']:.3f}<br>
-        <b>Cost:</b> {r['final_cost']:.2f}<br>
-        <b>Population:</b> {r['population']}
+        <b>Road ID:</b> {road_id}<br>
+        <b>Status:</b> {"Rebuild" if selected == 1 else "Deferred"}<br>
+        <b>Impact:</b> {impact:.3f}<br>
+        <b>Cost:</b> {cost:.2f}<br>
+        <b>Population:</b> {population}
         """
 
+        heat_data.append([lat, lon, damage])
+
         folium.CircleMarker(
-            location=[r["lat"], r["lon"]],
+            location=[lat, lon],
             radius=9,
             color=color,
             fill=True,
@@ -56,11 +65,6 @@ def visualize_gaza_dashboard(df):
     # -------------------------------------------------
     # Damage Heatmap
     # -------------------------------------------------
-    heat_data = [
-        [r["lat"], r["lon"], r["damage"]]
-        for _, r in df.iterrows()
-    ]
-
     HeatMap(
         heat_data,
         radius=25,